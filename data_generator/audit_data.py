@@ -12,6 +12,9 @@ import numpy as np
 from pathlib import Path
 import sys
 
+from config import PLAN_AGE_BANDS, PLAN_BY_AGE_BAND
+from generators.text_dictionary import text_dtypes
+
 # Paths
 DATA_DIR = Path("../data")
 INTERNAL_DIR = DATA_DIR / "internal"
@@ -167,6 +170,19 @@ def audit_customers():
     else:
         print_warn(f"Avalanche plan avg lines: {avalanche_lines:.1f} (expected >= 3)")
     
+    # Plan mix by age band should follow the conditional table in config.py
+    band_labels = np.array(list(PLAN_AGE_BANDS.keys()))
+    age_band = band_labels[np.searchsorted(list(PLAN_AGE_BANDS.values()), df['age'], side='right') - 1]
+    expected = pd.DataFrame(PLAN_BY_AGE_BAND).T.fillna(0)
+    expected = expected.div(expected.sum(axis=1), axis=0)
+    observed = pd.crosstab(age_band, df['plan_name'], normalize='index')
+    observed = observed.reindex(index=expected.index, columns=expected.columns).fillna(0)
+    drift = (observed - expected).abs().max().max()
+    if drift <= 0.05:
+        print_pass(f"Plan mix by age band matches PLAN_BY_AGE_BAND (max drift {drift:.3f})")
+    else:
+        print_warn(f"Plan mix by age band drifts from PLAN_BY_AGE_BAND (max drift {drift:.3f})")
+    
     # Check ARPU by plan makes sense
     arpu_by_plan = df.groupby('plan_name')['monthly_arpu'].mean()
     print_info(f"\n  ARPU by Plan:")
@@ -214,7 +230,7 @@ def audit_support_interactions():
     """Audit support_interactions.csv"""
     print_header("AUDITING: support_interactions.csv")
     
-    df = pd.read_csv(INTERNAL_DIR / "support_interactions.csv")
+    df = pd.read_csv(INTERNAL_DIR / "support_interactions.csv", dtype=text_dtypes("support_interactions"))
     print_info(f"Records: {len(df):,}")
     
     critical_cols = ['interaction_id', 'customer_id', 'channel', 'category']
@@ -243,7 +259,7 @@ def audit_campaign_responses():
     """Audit campaign_responses.csv"""
     print_header("AUDITING: campaign_responses.csv")
     
-    df = pd.read_csv(INTERNAL_DIR / "campaign_responses.csv")
+    df = pd.read_csv(INTERNAL_DIR / "campaign_responses.csv", dtype=text_dtypes("campaign_responses"))
     print_info(f"Records: {len(df):,}")
     
     critical_cols = ['response_id', 'customer_id', 'campaign_type', 'channel']
@@ -21,6 +21,11 @@ CUSTOMER_CONFIG = {
     "months_of_usage": 12,
     "avg_interactions_per_customer": 2.0,
     "avg_campaigns_per_customer": 5.0,
+    "chunk_size": 250_000,  # Rows per chunk in streaming mode (--chunk-size)
+    "stage_workers": 4,  # Processes running independent generation stages at once (--stage-workers)
+    "write_behind_frames": 4,  # Finished tables/chunks queued for the background CSV writer
+    "surrogate_keys": False,  # Also emit int64 <record>_key columns derived from the UUID keys
+    "usage_cube": True,  # Also write usage as a dense customers × months × metrics float32 .npy
 }
 
 EXTERNAL_CONFIG = {
@@ -240,6 +245,12 @@ DATA_USAGE_BY_PLAN = {
     "Summit": {"mean": 40, "std": 20, "max": 120},
 }
 
+# Seasonal usage factors by calendar month (higher usage in summer, holidays)
+SEASONAL_USAGE_FACTORS = {
+    1: 1.0, 2: 0.95, 3: 1.0, 4: 1.0, 5: 1.05, 6: 1.10,
+    7: 1.15, 8: 1.12, 9: 1.0, 10: 1.0, 11: 1.05, 12: 1.10,
+}
+
 # Voice usage (minutes/month)
 VOICE_USAGE_BY_PLAN = {
     "Glacier": {"mean": 100, "std": 50},
@@ -250,6 +261,31 @@ VOICE_USAGE_BY_PLAN = {
     "Summit": {"mean": 180, "std": 100},
 }
 
+# Call-detail records (generate_cdrs.py), exploded from monthly usage rows
+CDR_CONFIG = {
+    "usage_rows_per_block": 16_384,  # Usage rows per CDR RNG block and output part file
+    "data_sessions_base": 20,  # Data sessions per month before usage scaling
+    "data_sessions_per_gb": 2.0,
+    "data_session_mean_sec": 900,
+}
+
+# =============================================================================
+# BILLING
+# =============================================================================
+
+# Monthly bill rules applied on top of PLAN_CONFIG prices and data allowances
+BILLING_CONFIG = {
+    "overage_plans": ["Glacier", "Flurry", "Powder"],  # Limited plans billed per GB over data_gb
+    "overage_rate_per_gb": 10,
+    "roaming_rate_per_day": 10,
+    "roaming_rate_per_gb": 15,
+    "device_protection_fee": 15,
+    "streaming_bundle_fee": 10,
+    "autopay_discount": 5,
+    "loyalty_discount_pct": 0.05,  # Of the base charge
+    "loyalty_min_tenure_months": 24,  # Loyalty discount applies above this tenure
+}
+
 # =============================================================================
 # SUPPORT INTERACTIONS
 # =============================================================================
@@ -435,6 +471,115 @@ TECH_ADOPTION_BY_LIFESTYLE = {
     "Premium Professionals": {"mean": 75, "std": 10},
 }
 
+# =============================================================================
+# CONDITIONAL PROBABILITY TABLES
+# =============================================================================
+# Child-column weights keyed by the group of the conditioning column. The
+# generators compile each table once and sample every row of a group at once;
+# the audits compare generated mixes against the same tables.
+
+# Plan groups used as the conditioning variable for device, payment and credit
+PLAN_GROUPS = {
+    "Glacier": "Prepaid",
+    "Flurry": "Standard",
+    "Powder": "Standard",
+    "Blizzard": "Premium",
+    "Avalanche": "Standard",
+    "Summit": "Premium",
+}
+
+# Age bands as {label: lowest age in band}, in ascending order
+PLAN_AGE_BANDS = {"18-28": 0, "29-54": 29, "55+": 55}
+SUPPORT_AGE_BANDS = {"Under 35": 0, "35-55": 35, "Over 55": 56}
+
+# Churn-risk / ARPU cut-offs that select the segment tables below
+SEGMENT_THRESHOLDS = {
+    "support_at_risk_churn": 0.6,  # Churn risk above which support mix shifts
+    "campaign_at_risk_churn": 0.5,  # Churn risk above which retention offers dominate
+    "campaign_high_arpu": 80,  # ARPU above which upsell/loyalty offers dominate
+}
+
+PLAN_BY_AGE_BAND = {
+    "18-28": {"Glacier": 0.15, "Flurry": 0.10, "Powder": 0.30,
+              "Blizzard": 0.30, "Avalanche": 0.05, "Summit": 0.10},
+    "29-54": {name: plan["weight"] for name, plan in PLAN_CONFIG.items()},
+    "55+": {"Glacier": 0.10, "Flurry": 0.25, "Powder": 0.35,
+            "Blizzard": 0.15, "Avalanche": 0.08, "Summit": 0.07},
+}
+
+DEVICE_BRAND_BY_PLAN_GROUP = {
+    "Premium": {"Apple": 0.60, "Samsung": 0.25, "Google": 0.08,
+                "Motorola": 0.04, "OnePlus": 0.02, "Other": 0.01},
+    "Standard": {brand: info["weight"] for brand, info in DEVICE_BRANDS.items()},
+    "Prepaid": {"Apple": 0.30, "Samsung": 0.35, "Google": 0.05,
+                "Motorola": 0.15, "OnePlus": 0.02, "Other": 0.13},
+}
+
+PAYMENT_METHOD_BY_PLAN_GROUP = {
+    "Premium": {"AutoPay": 0.55, "Card": 0.25, "Manual": 0.15, "Cash": 0.05},
+    "Standard": {"AutoPay": 0.55, "Card": 0.25, "Manual": 0.15, "Cash": 0.05},
+    "Prepaid": {"AutoPay": 0.30, "Card": 0.30, "Manual": 0.25, "Cash": 0.15},
+}
+
+CREDIT_CLASS_BY_PLAN_GROUP = {
+    "Premium": {"A": 0.55, "B": 0.30, "C": 0.12, "D": 0.03},
+    "Standard": {"A": 0.40, "B": 0.30, "C": 0.20, "D": 0.10},
+    "Prepaid": {"A": 0.20, "B": 0.30, "C": 0.30, "D": 0.20},
+}
+
+# Monthly payment behaviour by credit class ("Standard" covers B, C and unknown)
+PAYMENT_STATUS_BY_CREDIT_CLASS = {
+    "A": {"Paid": 0.99, "Late": 0.01},
+    "Standard": {"Paid": 0.85, "Late": 0.12, "Partial": 0.03},
+    "D": {"Paid": 0.60, "Late": 0.25, "Partial": 0.10, "Unpaid": 0.05},
+}
+DAYS_TO_PAYMENT_BY_CREDIT_CLASS = {  # [low, high) days after the bill
+    "A": (1, 15),
+    "Standard": (5, 25),
+    "D": (10, 45),
+}
+
+SUPPORT_CHANNEL_BY_AGE_BAND = {
+    "Under 35": {"App": 0.35, "Chat": 0.30, "Call": 0.15,
+                 "Email": 0.10, "Store": 0.05, "Social": 0.05},
+    "35-55": SUPPORT_CHANNELS,
+    "Over 55": {"Call": 0.45, "Store": 0.25, "Email": 0.15,
+                "App": 0.08, "Chat": 0.05, "Social": 0.02},
+}
+
+SUPPORT_CATEGORY_BY_SEGMENT = {
+    "At Risk": {"Billing": 0.35, "Complaint": 0.25, "Technical": 0.20,
+                "Sales": 0.10, "General": 0.05, "Account": 0.05},
+    "Standard": SUPPORT_CATEGORIES,
+}
+
+# Interaction outcomes. Complaints have their own sentiment mix, resolve
+# less often and take longer; CSAT follows the sentiment band.
+COMPLAINT_SENTIMENT = {-0.8: 0.5, -0.6: 0.3, -0.4: 0.2}
+
+CSAT_BY_SENTIMENT_BAND = {
+    "Negative": {1: 0.4, 2: 0.4, 3: 0.2},  # sentiment < -0.3
+    "Neutral": {2: 0.2, 3: 0.5, 4: 0.3},
+    "Positive": {3: 0.1, 4: 0.3, 5: 0.6},  # sentiment > 0.3
+}
+
+RESOLUTION_BY_CATEGORY_GROUP = {
+    "Complaint": {"Resolved": 0.45, "Escalated": 0.30, "Pending": 0.15, "Unresolved": 0.10},
+    "Standard": {"Resolved": 0.75, "Escalated": 0.15, "Pending": 0.10},
+}
+
+# Resolution time in hours [low, high) and first-contact resolution rate
+RESOLUTION_HOURS_BY_CATEGORY_GROUP = {"Complaint": (2, 48), "Standard": (0.1, 8)}
+FCR_RATE_BY_CATEGORY_GROUP = {"Complaint": 0.30, "Standard": 0.65}
+
+CAMPAIGN_TYPE_BY_SEGMENT = {
+    "At Risk": {"Retention": 0.40, "Upsell": 0.15, "Cross-sell": 0.10,
+                "Win-back": 0.05, "Loyalty": 0.20, "Seasonal": 0.10},
+    "High ARPU": {"Retention": 0.15, "Upsell": 0.30, "Cross-sell": 0.20,
+                  "Win-back": 0.02, "Loyalty": 0.25, "Seasonal": 0.08},
+    "Standard": {name: info["weight"] for name, info in CAMPAIGN_TYPES.items()},
+}
+
 # =============================================================================
 # CHURN RISK FACTORS
 # =============================================================================
@@ -445,7 +590,11 @@ CHURN_RISK_WEIGHTS = {
     "payment_issue_factor": 0.10,  # Per late payment
     "competitor_intensity_factor": 0.05,  # For high competition markets
     "price_sensitivity_factor": 0.003,  # Per price sensitivity point
+    "prepaid_plan_factor": 0.10,  # For prepaid plans (see PLAN_GROUPS)
     "base_risk": 0.15,  # Base churn probability
+    "noise_std": 0.05,  # Std dev of the per-customer noise added at generation
+    "min_risk": 0.01,  # Scores are clipped to [min_risk, max_risk]
+    "max_risk": 0.99,
 }
 
 # =============================================================================
@@ -457,6 +606,12 @@ OUTPUT_FILES = {
     "monthly_usage": "internal/monthly_usage.csv",
     "support_interactions": "internal/support_interactions.csv",
     "campaign_responses": "internal/campaign_responses.csv",
+    "campaign_catalog": "internal/campaign_catalog.csv",
+    "cdr_events": "internal/cdr",  # Directory of billing_month=YYYY-MM partitions
+    "usage_cube": "internal/usage_cube.npy",
+    "usage_cube_index": "internal/usage_cube_index.npz",  # Customer IDs, months and metric names
+    "run_state": "internal/run_state.json",  # Seed and as-of date for --append-months
+    "stage_cache": "stage_cache",  # Per-stage cache keys and results for resuming runs
     "zip_demographics": "external/zip_demographics.csv",
     "economic_indicators": "external/economic_indicators.csv",
     "competitive_landscape": "external/competitive_landscape.csv",
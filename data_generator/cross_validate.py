@@ -7,6 +7,11 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 
+from config import CHURN_RISK_WEIGHTS
+from generators.churn_model import score_churn_risk
+from generators.usage_cube import UsageCube
+from generators.text_dictionary import text_dtypes
+
 # Paths
 DATA_DIR = Path("../data")
 INTERNAL_DIR = DATA_DIR / "internal"
@@ -53,8 +58,8 @@ def main():
     print("\n  Loading data files...")
     customers = pd.read_csv(INTERNAL_DIR / "customers.csv")
     usage = pd.read_csv(INTERNAL_DIR / "monthly_usage.csv")
-    interactions = pd.read_csv(INTERNAL_DIR / "support_interactions.csv")
-    campaigns = pd.read_csv(INTERNAL_DIR / "campaign_responses.csv")
+    interactions = pd.read_csv(INTERNAL_DIR / "support_interactions.csv", dtype=text_dtypes("support_interactions"))
+    campaigns = pd.read_csv(INTERNAL_DIR / "campaign_responses.csv", dtype=text_dtypes("campaign_responses"))
     zip_demo = pd.read_csv(EXTERNAL_DIR / "zip_demographics.csv")
     economic = pd.read_csv(EXTERNAL_DIR / "economic_indicators.csv")
     competitive = pd.read_csv(EXTERNAL_DIR / "competitive_landscape.csv")
@@ -232,12 +237,21 @@ def main():
     
     print_subheader("Checking usage patterns match customer profiles")
     
-    # Aggregate usage by customer
-    usage_agg = usage.groupby('customer_id').agg({
-        'data_usage_gb': 'mean',
-        'total_bill': 'mean'
-    }).reset_index()
-    usage_agg.columns = ['customer_id', 'avg_data', 'avg_bill']
+    # Aggregate usage by customer (slices of the dense usage cube when it was written)
+    cube = None
+    if (INTERNAL_DIR / "usage_cube.npy").exists():
+        cube = UsageCube(INTERNAL_DIR / "usage_cube.npy", INTERNAL_DIR / "usage_cube_index.npz")
+        usage_agg = pd.DataFrame({
+            'customer_id': cube.customer_ids,
+            'avg_data': cube.mean('data_usage_gb'),
+            'avg_bill': cube.mean('total_bill'),
+        })
+    else:
+        usage_agg = usage.groupby('customer_id').agg({
+            'data_usage_gb': 'mean',
+            'total_bill': 'mean'
+        }).reset_index()
+        usage_agg.columns = ['customer_id', 'avg_data', 'avg_bill']
     
     # Merge with customers
     customer_usage = customers.merge(usage_agg, on='customer_id', how='left')
@@ -263,6 +277,22 @@ def main():
         if plan in usage_by_plan.index:
             print_info(f"    {plan:12s}: {usage_by_plan[plan]:,.1f} GB/month")
     
+    if cube is not None:
+        print_subheader("Checking usage cube against monthly usage")
+        
+        if cube.months_of_data().sum() == len(usage) and np.isclose(np.nansum(cube.metric('total_bill')),
+                                                                    usage['total_bill'].sum(), rtol=1e-4):
+            print_pass(f"Usage cube holds all {len(usage):,} usage rows "
+                       f"({len(cube):,} customers × {len(cube.months)} months)")
+        else:
+            print_fail("Usage cube does not match monthly_usage")
+            issues.append("usage cube out of sync with monthly_usage")
+        
+        trend = pd.Series(cube.data_trend_3m()).value_counts(normalize=True) * 100
+        print_info(f"\n  Usage time series (from the cube):")
+        print_info(f"    3-month data trend: " + ", ".join(f"{label} {pct:.1f}%" for label, pct in trend.items()))
+        print_info(f"    Avg overage frequency: {cube.overage_frequency().mean():.1f}% of months")
+    
     # =========================================================================
     # 6. INTERACTION PATTERNS
     # =========================================================================
@@ -323,7 +353,36 @@ def main():
             print_pass(f"Retention converts better ({ret_conv*100:.2f}%) than Win-back ({wb_conv*100:.2f}%)")
         else:
             print_info(f"Retention: {ret_conv*100:.2f}%, Win-back: {wb_conv*100:.2f}%")
-    
+
+    catalog_path = INTERNAL_DIR / "campaign_catalog.csv"
+    if catalog_path.exists() and 'campaign_key' in campaigns.columns:
+        print_subheader("Checking responses against the campaign catalog")
+        catalog = pd.read_csv(catalog_path, dtype=text_dtypes("campaign_catalog")).set_index('campaign_key')
+        known = campaigns['campaign_key'].isin(catalog.index)
+        if known.all():
+            print_pass(f"All responses reference one of {len(catalog):,} catalog campaigns")
+        else:
+            print_fail(f"{(~known).sum():,} responses reference unknown campaign keys")
+            issues.append("campaign responses reference unknown campaigns")
+
+        campaign = catalog.reindex(campaigns['campaign_key'])
+        sent_day = pd.to_datetime(campaigns['sent_at']).dt.normalize().to_numpy()
+        consistent = (
+            (campaign['campaign_id'].to_numpy() == campaigns['campaign_id'].to_numpy())
+            & (campaign['campaign_type'].to_numpy() == campaigns['campaign_type'].to_numpy())
+            & (campaign['channel'].to_numpy() == campaigns['channel'].to_numpy())
+            & (pd.to_datetime(campaign['send_start']).to_numpy() <= sent_day)
+            & (sent_day <= pd.to_datetime(campaign['send_end']).to_numpy())
+        )
+        audience = campaigns['campaign_key'].value_counts().reindex(catalog.index, fill_value=0)
+        if consistent.all() and (audience == catalog['audience_size']).all():
+            print_pass("Response campaign attributes, send windows and audience sizes match the catalog")
+        else:
+            print_fail(f"{(~consistent).sum():,} responses disagree with their catalog campaign "
+                       f"or audience sizes differ")
+            issues.append("campaign responses do not match the campaign catalog")
+        print_info(f"  Campaigns with responses: {(catalog['audience_size'] > 0).sum():,} of {len(catalog):,}")
+
     # =========================================================================
     # 8. EXTERNAL DATA RELEVANCE
     # =========================================================================
@@ -360,6 +419,22 @@ def main():
     else:
         print_info(f"Tech adoption vs 5G correlation: r={tech_5g_corr:.3f}")
     
+    print_subheader("Checking churn risk against the scoring model")
+    
+    # Re-score with the same kernel; the residual should be the generator noise
+    cust_enriched = cust_enriched.merge(competitive[['dma_code', 'price_war_intensity']], on='dma_code', how='left')
+    model_risk = score_churn_risk(
+        cust_enriched['tenure_months'], cust_enriched['complaint_count_12m'], cust_enriched['plan_name'],
+        cust_enriched['price_sensitivity_index'].fillna(50), cust_enriched['price_war_intensity'].fillna("Medium")
+    )
+    unclipped = (model_risk > 0.2) & (model_risk < 0.8)
+    residual_std = (cust_enriched['churn_risk_score'] - model_risk)[unclipped].std()
+    if residual_std <= 2 * CHURN_RISK_WEIGHTS["noise_std"]:
+        print_pass(f"Churn risk follows CHURN_RISK_WEIGHTS (residual std {residual_std:.3f})")
+    else:
+        print_warn(f"Churn risk residual std {residual_std:.3f} exceeds model noise "
+                   f"({CHURN_RISK_WEIGHTS['noise_std']:.2f}) - weights changed since generation?")
+    
     # =========================================================================
     # 9. COMPETITIVE DATA RELEVANCE
     # =========================================================================
@@ -8,33 +8,43 @@ This script generates all synthetic data for the Customer Digital Twin POC:
 - External: ZIP Demographics, Economic, Competitive, Lifestyle
 
 Usage:
-    python generate_all_data.py [--customers N] [--seed S]
+    python generate_all_data.py [--customers N] [--seed S] [--chunk-size ROWS] [--workers N]
+                                [--stage-workers N] [--as-of YYYY-MM-DD] [--no-cache]
+    python generate_all_data.py --append-months N
+
+numpy, pandas and the generator modules are imported by the functions
+that use them, so `--help` and argument errors return without loading them.
 """
 
+from __future__ import annotations
+
 import os
 import sys
+import json
 import argparse
 import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-
-import numpy as np
-import pandas as pd
-from tqdm import tqdm
+from functools import partial
+from typing import TYPE_CHECKING
 
 # Import configuration
+import config
 from config import (
     RANDOM_SEED, OUTPUT_DIR, CUSTOMER_CONFIG, EXTERNAL_CONFIG, OUTPUT_FILES
 )
 
-# Import generators
-from generators.customer_generator import generate_customers
-from generators.usage_generator import generate_monthly_usage
-from generators.interaction_generator import generate_support_interactions
-from generators.campaign_generator import generate_campaign_responses
-from generators.zip_demographics_generator import generate_zip_demographics
-from generators.economic_generator import generate_economic_indicators
-from generators.competitive_generator import generate_competitive_landscape
-from generators.lifestyle_generator import generate_lifestyle_segments
+# Annotation-only names; the functions import what they call
+if TYPE_CHECKING:
+    import pandas as pd
+    from generators.campaign_catalog import CampaignCatalog
+    from generators.customer_view import CustomerView
+    from generators.geo_sampler import GeoSampler
+    from generators.stage_graph import StageGraph
+    from generators.time_axis import TimeAxis
+    from generators.usage_cube import UsageCubeWriter
+    from generators.write_behind import WriteBehindWriter
 
 
 def setup_output_directories():
@@ -48,9 +58,16 @@ def setup_output_directories():
         print(f"  ✓ Created/verified: {directory}")
 
 
-def save_dataframe(df: pd.DataFrame, filename: str, description: str):
-    """Save DataFrame to CSV with progress reporting"""
+def save_dataframe(df: pd.DataFrame, filename: str, description: str, writer: WriteBehindWriter = None):
+    """Save DataFrame to CSV with progress reporting
+
+    With a `writer`, the CSV is written on its background thread and this
+    returns at once (see generators/write_behind.py).
+    """
     filepath = os.path.join(OUTPUT_DIR, filename)
+    if writer is not None:
+        writer.submit(save_dataframe, df, filename, description)
+        return filepath
     print(f"\n  Saving {description}...")
     print(f"    Records: {len(df):,}")
     
@@ -68,8 +85,505 @@ def save_dataframe(df: pd.DataFrame, filename: str, description: str):
     return filepath
 
 
-def main(num_customers: int = None, seed: int = None):
+def save_partition(df: pd.DataFrame, name: str, month, writer: WriteBehindWriter = None) -> str:
+    """Write one billing month of a table as <table>/billing_month=YYYY-MM/part-00000.csv"""
+    partition = os.path.join(OUTPUT_DIR, os.path.splitext(OUTPUT_FILES[name])[0], f"billing_month={month}")
+    filepath = os.path.join(partition, "part-00000.csv")
+    if writer is not None:
+        writer.submit(save_partition, df, name, month)
+        return filepath
+    os.makedirs(partition, exist_ok=True)
+    df.to_csv(filepath, index=False)
+    print(f"    {os.path.relpath(filepath, OUTPUT_DIR)}: {len(df):,} records")
+    return filepath
+
+
+def output_size_mb(path: str) -> float:
+    """Size of an output file, or of every file under an output directory, in MB"""
+    if os.path.isfile(path):
+        return os.path.getsize(path) / (1024 * 1024)
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(path) for name in names
+    ) / (1024 * 1024)
+
+
+def load_run_state() -> dict:
+    """Seed, as-of date and appended months of the run in OUTPUT_DIR"""
+    filepath = os.path.join(OUTPUT_DIR, OUTPUT_FILES["run_state"])
+    if not os.path.exists(filepath):
+        raise FileNotFoundError(f"{filepath} not found; run a full generation before appending months")
+    with open(filepath) as f:
+        return json.load(f)
+
+
+def save_run_state(state: dict):
+    """Record the run state next to the internal tables"""
+    with open(os.path.join(OUTPUT_DIR, OUTPUT_FILES["run_state"]), "w") as f:
+        json.dump(state, f, indent=2)
+
+
+def append_dataframe(df: pd.DataFrame, filename: str, header: bool, writer: WriteBehindWriter = None):
+    """Append one chunk to a CSV, writing the header only for the first chunk"""
+    filepath = os.path.join(OUTPUT_DIR, filename)
+    if writer is not None:
+        writer.submit(append_dataframe, df, filename, header)
+        return filepath
+    df.to_csv(filepath, index=False, mode='w' if header else 'a', header=header)
+    return filepath
+
+
+# Inputs shared by every shard, set once per process by _init_shard_worker
+_SHARD_INPUTS = {}
+
+
+def _init_shard_worker(zip_demographics: pd.DataFrame, lifestyle_segments: pd.DataFrame,
+                       competitive_landscape: pd.DataFrame, geo: GeoSampler, seed: int,
+                       time_axis: TimeAxis, cube: UsageCubeWriter = None, catalog: CampaignCatalog = None):
+    _SHARD_INPUTS.update(
+        zip_demographics=zip_demographics,
+        lifestyle_segments=lifestyle_segments,
+        competitive_landscape=competitive_landscape,
+        geo=geo,
+        seed=seed,
+        time_axis=time_axis,
+        cube=cube,
+        catalog=catalog,
+    )
+
+
+def generate_shard(bounds: tuple) -> dict:
+    """Generate customers [start, stop) and their usage, interactions and campaigns
+
+    Every table draws from per-block streams of the run seed, so a shard's
+    rows are the same whichever process generates it.
+    """
+    from generators.campaign_generator import generate_campaign_responses
+    from generators.customer_generator import generate_customer_range
+    from generators.customer_view import CustomerView
+    from generators.interaction_generator import generate_support_interactions
+    from generators.streams import BLOCK_SIZE
+    from generators.usage_generator import generate_monthly_usage
+
+    start, stop = bounds
+    seed = _SHARD_INPUTS["seed"]
+    time_axis = _SHARD_INPUTS["time_axis"]
+    first_block = start // BLOCK_SIZE
+
+    customers = generate_customer_range(
+        start, stop,
+        _SHARD_INPUTS["zip_demographics"],
+        _SHARD_INPUTS["lifestyle_segments"],
+        _SHARD_INPUTS["competitive_landscape"],
+        geo=_SHARD_INPUTS["geo"],
+        seed=seed,
+        time_axis=time_axis
+    )
+    customer_view = CustomerView.from_frame(customers)
+    return {
+        "customers": customers,
+        "monthly_usage": generate_monthly_usage(
+            customer_view, CUSTOMER_CONFIG["months_of_usage"],
+            seed=seed, first_block=first_block, time_axis=time_axis, cube=_SHARD_INPUTS["cube"]),
+        "support_interactions": generate_support_interactions(
+            customer_view, CUSTOMER_CONFIG["avg_interactions_per_customer"],
+            seed=seed, first_block=first_block, time_axis=time_axis),
+        "campaign_responses": generate_campaign_responses(
+            customer_view, CUSTOMER_CONFIG["avg_campaigns_per_customer"],
+            seed=seed, first_block=first_block, time_axis=time_axis, catalog=_SHARD_INPUTS["catalog"]),
+    }
+
+
+def iter_shard_outputs(shards: list, workers: int, init_args: tuple):
+    """Yield shard outputs in shard order, running up to `workers` shards at once
+
+    At most two shards per worker are in flight, which caps how many
+    finished shards wait in memory for the writer.
+    """
+    if workers <= 1:
+        _init_shard_worker(*init_args)
+        for bounds in shards:
+            yield generate_shard(bounds)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_shard_worker,
+                             initargs=init_args) as pool:
+        in_flight = deque()
+        for bounds in shards:
+            in_flight.append(pool.submit(generate_shard, bounds))
+            if len(in_flight) >= 2 * workers:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def generate_internal_chunked(zip_demographics: pd.DataFrame, lifestyle_segments: pd.DataFrame,
+                              competitive_landscape: pd.DataFrame, geo: GeoSampler,
+                              seed: int, chunk_size: int, workers: int = 1,
+                              time_axis: TimeAxis = None, cube: UsageCubeWriter = None,
+                              catalog: CampaignCatalog = None, writer: WriteBehindWriter = None) -> dict:
+    """Stream customers in shards, writing each shard and its activity tables as produced
+
+    Shards are `chunk_size` customers rounded up to whole RNG blocks and
+    are generated by `workers` processes; output is written in shard order
+    and is identical for any worker count or chunk size. Workers fill their
+    own rows of the usage `cube`; the campaign `catalog` is written last,
+    with audience sizes summed over the shards. With a `writer`, shards are
+    appended on its background thread while the next ones are generated.
+    Returns record counts per output table.
+    """
+    import numpy as np
+    from generators.campaign_catalog import CampaignCatalog
+    from generators.streams import BLOCK_SIZE
+    from generators.time_axis import TimeAxis
+
+    n_customers = CUSTOMER_CONFIG["total_records"]
+    chunk_size = -(-chunk_size // BLOCK_SIZE) * BLOCK_SIZE
+    shards = [(start, min(start + chunk_size, n_customers)) for start in range(0, n_customers, chunk_size)]
+    print(f"\n[3.1-3.4] Streaming {n_customers:,} customers in {len(shards):,} shards "
+          f"of {chunk_size:,} ({workers} worker{'s' if workers != 1 else ''})...")
+
+    counts = {name: 0 for name in ["customers", "monthly_usage", "support_interactions", "campaign_responses"]}
+    time_axis = time_axis or TimeAxis()
+    if catalog is None:
+        catalog = CampaignCatalog.covering(time_axis, seed=seed)
+    init_args = (zip_demographics, lifestyle_segments, competitive_landscape, geo, seed,
+                 time_axis, cube, catalog)
+    customer_ids = []
+    audience = np.zeros(len(catalog), dtype=np.int64)
+
+    start = time.time()
+    for outputs in iter_shard_outputs(shards, workers, init_args):
+        for name, df in outputs.items():
+            append_dataframe(df, OUTPUT_FILES[name], header=counts[name] == 0, writer=writer)
+            counts[name] += len(df)
+        customer_ids.append(outputs["customers"]["customer_id"].to_numpy())
+        audience += np.bincount(outputs["campaign_responses"]["campaign_key"], minlength=len(catalog))
+        print(f"  ✓ {counts['customers']:,} / {n_customers:,} customers generated "
+              f"({time.time() - start:.1f}s)")
+
+    if cube is not None:
+        cube.write_index(np.concatenate(customer_ids))
+    append_dataframe(catalog.frame(audience), OUTPUT_FILES["campaign_catalog"], header=True, writer=writer)
+    counts["campaign_catalog"] = len(catalog)
+
+    for name, count in counts.items():
+        print(f"    {OUTPUT_FILES[name]}: {count:,} records")
+    return counts
+
+
+# =============================================================================
+# GENERATION STAGES (run as a dependency graph, see generators/stage_graph.py)
+# =============================================================================
+
+def stage_zip_demographics(seed: int, writer: WriteBehindWriter = None) -> pd.DataFrame:
+    from generators.streams import block_rng
+    from generators.zip_demographics_generator import generate_zip_demographics
+
+    print("\n[2.1] Generating ZIP Demographics...")
+    zip_demographics = generate_zip_demographics(EXTERNAL_CONFIG["zip_codes"],
+                                                 rng=block_rng(seed, "zip_demographics", 0))
+    save_dataframe(zip_demographics, OUTPUT_FILES["zip_demographics"], "ZIP Demographics", writer)
+    return zip_demographics
+
+
+def stage_zip_derived(zip_demographics: pd.DataFrame, seed: int, time_axis: TimeAxis,
+                      writer: WriteBehindWriter = None) -> tuple:
+    """Economic indicators and lifestyle segments (one pass over the ZIP columns)"""
+    from generators.streams import block_rng
+    from generators.zip_derived_generator import generate_zip_derived_tables
+
+    print("\n[2.2] Generating Economic Indicators and Lifestyle Segments...")
+    economic_indicators, lifestyle_segments = generate_zip_derived_tables(
+        zip_demographics, time_axis, rng=block_rng(seed, "zip_derived", 0))
+    save_dataframe(economic_indicators, OUTPUT_FILES["economic_indicators"], "Economic Indicators", writer)
+    save_dataframe(lifestyle_segments, OUTPUT_FILES["lifestyle_segments"], "Lifestyle Segments", writer)
+    return economic_indicators, lifestyle_segments
+
+
+def stage_competitive_landscape(seed: int, time_axis: TimeAxis, writer: WriteBehindWriter = None) -> pd.DataFrame:
+    from generators.competitive_generator import generate_competitive_landscape
+    from generators.streams import block_rng
+
+    print("\n[2.3] Generating Competitive Landscape...")
+    competitive_landscape = generate_competitive_landscape(EXTERNAL_CONFIG["dmas"], time_axis,
+                                                           rng=block_rng(seed, "competitive", 0))
+    save_dataframe(competitive_landscape, OUTPUT_FILES["competitive_landscape"], "Competitive Landscape", writer)
+    return competitive_landscape
+
+
+def stage_customers(zip_demographics: pd.DataFrame, zip_derived: tuple, competitive_landscape: pd.DataFrame,
+                    n_customers: int, seed: int, time_axis: TimeAxis,
+                    writer: WriteBehindWriter = None) -> CustomerView:
+    """Customers, handed to the activity stages as a typed column view"""
+    from generators.customer_generator import generate_customers
+    from generators.customer_view import CustomerView
+    from generators.geo_sampler import GeoSampler
+
+    print("\n[3.1] Generating Customers...")
+    customers = generate_customers(
+        n_customers,
+        zip_demographics,
+        zip_derived[1],
+        competitive_landscape,
+        GeoSampler(zip_demographics),
+        seed=seed,
+        time_axis=time_axis
+    )
+    save_dataframe(customers, OUTPUT_FILES["customers"], "Customers", writer)
+    return CustomerView.from_frame(customers)
+
+
+def stage_monthly_usage(customers: CustomerView, months: int, seed: int, time_axis: TimeAxis,
+                        cube: UsageCubeWriter = None, writer: WriteBehindWriter = None) -> int:
+    from generators.usage_generator import generate_monthly_usage
+
+    print("\n[3.2] Generating Monthly Usage...")
+    if cube is not None:
+        cube.create()
+    monthly_usage = generate_monthly_usage(customers, months, seed=seed, time_axis=time_axis, cube=cube)
+    if cube is not None:
+        cube.write_index(customers['customer_id'])
+    save_dataframe(monthly_usage, OUTPUT_FILES["monthly_usage"], "Monthly Usage", writer)
+    return len(monthly_usage)
+
+
+def stage_support_interactions(customers: CustomerView, seed: int, time_axis: TimeAxis,
+                               writer: WriteBehindWriter = None) -> int:
+    from generators.interaction_generator import generate_support_interactions
+
+    print("\n[3.3] Generating Support Interactions...")
+    interactions = generate_support_interactions(
+        customers, CUSTOMER_CONFIG["avg_interactions_per_customer"], seed=seed, time_axis=time_axis)
+    save_dataframe(interactions, OUTPUT_FILES["support_interactions"], "Support Interactions", writer)
+    return len(interactions)
+
+
+def stage_campaign_responses(customers: CustomerView, seed: int, time_axis: TimeAxis,
+                             catalog: CampaignCatalog, writer: WriteBehindWriter = None) -> int:
+    """Campaign responses, then the campaign catalog with each campaign's audience"""
+    import numpy as np
+    from generators.campaign_generator import generate_campaign_responses
+
+    print("\n[3.4] Generating Campaign Responses...")
+    campaigns = generate_campaign_responses(
+        customers, CUSTOMER_CONFIG["avg_campaigns_per_customer"], seed=seed, time_axis=time_axis,
+        catalog=catalog)
+    save_dataframe(campaigns, OUTPUT_FILES["campaign_responses"], "Campaign Responses", writer)
+    audience = np.bincount(campaigns["campaign_key"], minlength=len(catalog))
+    save_dataframe(catalog.frame(audience), OUTPUT_FILES["campaign_catalog"], "Campaign Catalog", writer)
+    return len(campaigns)
+
+
+def stage_internal_chunked(zip_demographics: pd.DataFrame, zip_derived: tuple,
+                           competitive_landscape: pd.DataFrame, **kwargs) -> dict:
+    """All internal tables, streamed in customer shards (see generate_internal_chunked)"""
+    from generators.geo_sampler import GeoSampler
+
+    if kwargs.get("cube") is not None:
+        kwargs["cube"].create()
+    return generate_internal_chunked(zip_demographics, zip_derived[1], competitive_landscape,
+                                     GeoSampler(zip_demographics), **kwargs)
+
+
+# config.py sections each stage's output depends on (part of its cache key)
+STAGE_CONFIG = {
+    "zip_demographics": ["STATE_DISTRIBUTION", "REGION_MAPPING", "URBAN_RURAL_DISTRIBUTION",
+                         "INCOME_DISTRIBUTION", "EDUCATION_DISTRIBUTION"],
+    "zip_derived": ["COST_OF_LIVING_DISTRIBUTION", "UNEMPLOYMENT_DISTRIBUTION", "CREDIT_SCORE_DISTRIBUTION",
+                    "LIFESTYLE_BY_GEOGRAPHY", "TECH_ADOPTION_BY_LIFESTYLE"],
+    "competitive_landscape": ["CARRIER_MARKET_SHARE", "CARRIER_AVG_PRICE"],
+    "customers": ["STATE_DISTRIBUTION", "AGE_DISTRIBUTION", "GENDER_DISTRIBUTION",
+                  "ACQUISITION_CHANNEL_DISTRIBUTION", "PLAN_CONFIG", "DEVICE_BRANDS", "PLAN_GROUPS",
+                  "PLAN_AGE_BANDS", "PLAN_BY_AGE_BAND", "DEVICE_BRAND_BY_PLAN_GROUP",
+                  "PAYMENT_METHOD_BY_PLAN_GROUP", "CREDIT_CLASS_BY_PLAN_GROUP", "CHURN_RISK_WEIGHTS"],
+    "monthly_usage": ["PLAN_CONFIG", "DATA_USAGE_BY_PLAN", "VOICE_USAGE_BY_PLAN", "SEASONAL_USAGE_FACTORS",
+                      "BILLING_CONFIG", "PAYMENT_STATUS_BY_CREDIT_CLASS", "DAYS_TO_PAYMENT_BY_CREDIT_CLASS"],
+    "support_interactions": ["SUPPORT_CHANNELS", "SUPPORT_CATEGORIES", "SUPPORT_SUBCATEGORIES",
+                             "SUPPORT_AGE_BANDS", "SEGMENT_THRESHOLDS", "SUPPORT_CHANNEL_BY_AGE_BAND",
+                             "SUPPORT_CATEGORY_BY_SEGMENT", "COMPLAINT_SENTIMENT", "CSAT_BY_SENTIMENT_BAND",
+                             "RESOLUTION_BY_CATEGORY_GROUP", "RESOLUTION_HOURS_BY_CATEGORY_GROUP",
+                             "FCR_RATE_BY_CATEGORY_GROUP"],
+    "campaign_responses": ["CAMPAIGN_TYPES", "CAMPAIGN_CHANNELS", "CAMPAIGN_TYPE_BY_SEGMENT",
+                           "SEGMENT_THRESHOLDS"],
+}
+STAGE_CONFIG["internal"] = sorted(set(
+    STAGE_CONFIG["customers"] + STAGE_CONFIG["monthly_usage"]
+    + STAGE_CONFIG["support_interactions"] + STAGE_CONFIG["campaign_responses"]
+))
+
+
+def _stage_config(stage: str) -> dict:
+    return {name: getattr(config, name) for name in STAGE_CONFIG[stage]}
+
+
+def build_stage_graph(run_seed: int, time_axis: TimeAxis, cube: UsageCubeWriter, catalog: CampaignCatalog,
+                      chunk_size: int = None, workers: int = 1, writer: WriteBehindWriter = None,
+                      stage_workers: int = 1) -> StageGraph:
+    """The generation stages, their dependencies and cache inputs
+
+    External tables only need the ZIP demographics (competitive needs
+    nothing), customers need the external tables, and usage, interactions
+    and campaigns only need the customers. When streaming in shards, the
+    internal tables are one inline stage running its own shard pool (its
+    output does not depend on the shard size or worker count).
+
+    Stages running in this process queue their CSVs on `writer`; stages
+    in the stage pool write their own (the pool already overlaps them).
+    """
+    from generators.stage_graph import StageGraph
+
+    local = writer if stage_workers <= 1 else None
+    dated = {"seed": run_seed, "as_of": str(time_axis.as_of)}
+    internal = {**dated, "surrogate_keys": CUSTOMER_CONFIG["surrogate_keys"]}
+    cube_files = [OUTPUT_FILES["usage_cube"], OUTPUT_FILES["usage_cube_index"]] if cube is not None else []
+
+    graph = StageGraph()
+    graph.add("zip_demographics", partial(stage_zip_demographics, seed=run_seed, writer=local),
+              config=_stage_config("zip_demographics"),
+              params={"seed": run_seed, "zip_codes": EXTERNAL_CONFIG["zip_codes"]},
+              outputs=[OUTPUT_FILES["zip_demographics"]])
+    graph.add("zip_derived", partial(stage_zip_derived, seed=run_seed, time_axis=time_axis, writer=local),
+              deps=("zip_demographics",), config=_stage_config("zip_derived"), params=dated,
+              outputs=[OUTPUT_FILES["economic_indicators"], OUTPUT_FILES["lifestyle_segments"]])
+    graph.add("competitive_landscape", partial(stage_competitive_landscape, seed=run_seed, time_axis=time_axis,
+                                               writer=local),
+              config=_stage_config("competitive_landscape"), params={**dated, "dmas": EXTERNAL_CONFIG["dmas"]},
+              outputs=[OUTPUT_FILES["competitive_landscape"]])
+    external = ("zip_demographics", "zip_derived", "competitive_landscape")
+
+    if chunk_size or workers > 1:
+        graph.add("internal", partial(
+            stage_internal_chunked, seed=run_seed, chunk_size=chunk_size or CUSTOMER_CONFIG["chunk_size"],
+            workers=workers, time_axis=time_axis, cube=cube, catalog=catalog, writer=writer
+        ), deps=external, inline=True, config=_stage_config("internal"), params={
+            **internal,
+            "customers": CUSTOMER_CONFIG["total_records"],
+            "months": CUSTOMER_CONFIG["months_of_usage"],
+            "interactions": CUSTOMER_CONFIG["avg_interactions_per_customer"],
+            "campaigns": CUSTOMER_CONFIG["avg_campaigns_per_customer"],
+        }, outputs=[OUTPUT_FILES[name] for name in ["customers", "monthly_usage", "support_interactions",
+                                                     "campaign_responses", "campaign_catalog"]] + cube_files)
+        return graph
+
+    graph.add("customers", partial(stage_customers, n_customers=CUSTOMER_CONFIG["total_records"],
+                                   seed=run_seed, time_axis=time_axis, writer=local),
+              deps=external, config=_stage_config("customers"),
+              params={**internal, "customers": CUSTOMER_CONFIG["total_records"]},
+              outputs=[OUTPUT_FILES["customers"]])
+    graph.add("monthly_usage", partial(stage_monthly_usage, months=CUSTOMER_CONFIG["months_of_usage"],
+                                       seed=run_seed, time_axis=time_axis, cube=cube, writer=local),
+              deps=("customers",), config=_stage_config("monthly_usage"),
+              params={**internal, "months": CUSTOMER_CONFIG["months_of_usage"]},
+              outputs=[OUTPUT_FILES["monthly_usage"]] + cube_files)
+    graph.add("support_interactions", partial(stage_support_interactions, seed=run_seed, time_axis=time_axis,
+                                              writer=local),
+              deps=("customers",), config=_stage_config("support_interactions"),
+              params={**internal, "interactions": CUSTOMER_CONFIG["avg_interactions_per_customer"]},
+              outputs=[OUTPUT_FILES["support_interactions"]])
+    graph.add("campaign_responses", partial(stage_campaign_responses, seed=run_seed, time_axis=time_axis,
+                                            catalog=catalog, writer=local),
+              deps=("customers",), config=_stage_config("campaign_responses"),
+              params={**internal, "campaigns": CUSTOMER_CONFIG["avg_campaigns_per_customer"]},
+              outputs=[OUTPUT_FILES["campaign_responses"], OUTPUT_FILES["campaign_catalog"]])
+    return graph
+
+
+def append_months(n_months: int):
+    """Generate the next `n_months` billing months of activity for the existing customers
+
+    Reads the customer table and run state of an earlier full run; each
+    month advances tenure, continues every customer's usage trend and is
+    written as new billing_month partitions of monthly_usage,
+    support_interactions, campaign_responses and campaign_catalog (whose
+    keys continue the base run's). Interactions and campaigns cover every
+    day since the previous as-of date, so the first appended month also
+    carries the events after the base as-of day in the base run's last
+    month. Cost per month is O(customers), independent of the history
+    already generated.
+    """
+    import numpy as np
+    import pandas as pd
+    from generators.campaign_catalog import CampaignCatalog
+    from generators.campaign_generator import generate_campaign_responses
+    from generators.customer_view import CustomerView, VIEW_COLUMNS
+    from generators.interaction_generator import generate_support_interactions
+    from generators.streams import month_period
+    from generators.time_axis import TimeAxis
+    from generators.usage_generator import generate_monthly_usage
+    from generators.write_behind import WriteBehindWriter
+
+    state = load_run_state()
+    seed = state["seed"]
+    base_month = np.datetime64(state["as_of"], 'M')
+    last_month = base_month + len(state["appended_months"])
+    # Last day with interactions and campaigns: the base as-of, or the end of the last appended month
+    covered_until = (np.datetime64(state["as_of"], 'D') if not state["appended_months"]
+                     else (last_month + 1).astype('datetime64[D]') - 1)
+
+    print("=" * 70)
+    print("SNOWMOBILE WIRELESS - APPEND BILLING MONTHS")
+    print("=" * 70)
+    print(f"  Base run: {state['customers']:,} customers, seed {seed}, as of {state['as_of']}")
+    print(f"  Last billing month: {last_month}")
+    print(f"  Appending: {n_months} month{'s' if n_months != 1 else ''}")
+
+    customers_path = os.path.join(OUTPUT_DIR, OUTPUT_FILES["customers"])
+    customers = CustomerView.from_frame(pd.read_csv(customers_path, usecols=lambda c: c in VIEW_COLUMNS))
+    catalog_start = state.get("campaign_catalog_start",
+                              str(CampaignCatalog.covering(TimeAxis(state["as_of"])).first_month))
+
+    start = time.time()
+    with WriteBehindWriter(CUSTOMER_CONFIG["write_behind_frames"]) as writer:
+        for month in last_month + 1 + np.arange(n_months):
+            months_since_base = int((month - base_month).astype(np.int64))
+            month_days = int(((month + 1).astype('datetime64[D]') - month.astype('datetime64[D]')).astype(np.int64))
+            month_axis = TimeAxis((month + 1).astype('datetime64[D]') - 1)
+            window_days = int((month_axis.as_of - covered_until).astype(np.int64))
+            covered_until = month_axis.as_of
+            period = month_period(month)
+            month_customers = customers.with_columns(tenure_months=customers['tenure_months'] + months_since_base)
+
+            print(f"\n[{month}] Generating activity...")
+            usage = generate_monthly_usage(
+                month_customers, 1, seed=seed, time_axis=month_axis,
+                trend_offset=state["usage_months"] - 1 + months_since_base
+            )
+            interactions = generate_support_interactions(
+                month_customers, CUSTOMER_CONFIG["avg_interactions_per_customer"] / 12 * window_days / month_days,
+                seed=seed, time_axis=month_axis, window_days=window_days, period=period
+            )
+            catalog = CampaignCatalog(catalog_start, month_axis.as_of, seed)
+            campaigns = generate_campaign_responses(
+                month_customers, CUSTOMER_CONFIG["avg_campaigns_per_customer"] / 12 * window_days / month_days,
+                seed=seed, time_axis=month_axis, window_days=window_days, min_per_customer=0, period=period,
+                catalog=catalog
+            )
+            audience = np.bincount(campaigns["campaign_key"], minlength=len(catalog))
+
+            # Written while the next month is generated; the run state follows its partitions.
+            # Sends dated in the base run's last month keep its catalog rows (already written)
+            save_partition(usage, "monthly_usage", month, writer)
+            save_partition(interactions, "support_interactions", month, writer)
+            save_partition(campaigns, "campaign_responses", month, writer)
+            save_partition(catalog.frame(audience, months=[month]), "campaign_catalog", month, writer)
+            state["appended_months"].append(str(month))
+            writer.submit(save_run_state, {**state, "appended_months": list(state["appended_months"])})
+            print(f"  ✓ {month} generated ({time.time() - start:.1f}s)")
+
+    print(f"  ✓ {n_months} month{'s' if n_months != 1 else ''} appended ({time.time() - start:.1f}s)")
+    return state
+
+
+def main(num_customers: int = None, seed: int = None, chunk_size: int = None, workers: int = 1,
+         as_of: str = None, usage_cube: bool = None, stage_workers: int = None, use_cache: bool = True):
     """Main data generation pipeline"""
+    import numpy as np
+    from generators.campaign_catalog import CampaignCatalog
+    from generators.stage_cache import StageCache
+    from generators.time_axis import TimeAxis
+    from generators.usage_cube import UsageCubeWriter
+    from generators.write_behind import WriteBehindWriter
     
     print("=" * 70)
     print("SNOWMOBILE WIRELESS - CUSTOMER DIGITAL TWIN DATA GENERATOR")
@@ -79,15 +593,26 @@ def main(num_customers: int = None, seed: int = None):
     # Set configuration
     if num_customers:
         CUSTOMER_CONFIG["total_records"] = num_customers
-    if seed:
-        np.random.seed(seed)
-    else:
-        np.random.seed(RANDOM_SEED)
+    if usage_cube is not None:
+        CUSTOMER_CONFIG["usage_cube"] = usage_cube
+    run_seed = seed or RANDOM_SEED
+    np.random.seed(run_seed)
+    if stage_workers is None:
+        stage_workers = min(CUSTOMER_CONFIG["stage_workers"], os.cpu_count() or 1)
+    time_axis = TimeAxis(as_of)
     
     print(f"\nConfiguration:")
     print(f"  Customers: {CUSTOMER_CONFIG['total_records']:,}")
     print(f"  Usage months: {CUSTOMER_CONFIG['months_of_usage']}")
-    print(f"  Random seed: {seed or RANDOM_SEED}")
+    print(f"  Random seed: {run_seed}")
+    print(f"  As-of date: {time_axis.as_of}")
+    if chunk_size:
+        print(f"  Streaming chunk size: {chunk_size:,}")
+    if workers > 1:
+        print(f"  Workers: {workers}")
+    print(f"  Stage workers: {stage_workers}")
+    if not use_cache:
+        print("  Stage cache: off (regenerating every stage)")
     
     # Setup directories
     print(f"\n{'=' * 70}")
@@ -95,75 +620,68 @@ def main(num_customers: int = None, seed: int = None):
     print("=" * 70)
     setup_output_directories()
     
-    # =========================================================================
-    # EXTERNAL DATA (generate first as customers reference ZIP codes)
-    # =========================================================================
+    # Dense customers × months × metrics copy of the usage (see generators/usage_cube.py)
+    cube = None
+    if CUSTOMER_CONFIG["usage_cube"]:
+        cube = UsageCubeWriter(
+            os.path.join(OUTPUT_DIR, OUTPUT_FILES["usage_cube"]),
+            os.path.join(OUTPUT_DIR, OUTPUT_FILES["usage_cube_index"]),
+            CUSTOMER_CONFIG["total_records"],
+            time_axis.billing_months(CUSTOMER_CONFIG["months_of_usage"])
+        )
     
-    print(f"\n{'=' * 70}")
-    print("STEP 2: Generating EXTERNAL data")
-    print("=" * 70)
-    
-    # ZIP Demographics
-    print("\n[2.1] Generating ZIP Demographics...")
-    zip_demographics = generate_zip_demographics(EXTERNAL_CONFIG["zip_codes"])
-    save_dataframe(zip_demographics, OUTPUT_FILES["zip_demographics"], "ZIP Demographics")
-    
-    # Economic Indicators
-    print("\n[2.2] Generating Economic Indicators...")
-    economic_indicators = generate_economic_indicators(zip_demographics)
-    save_dataframe(economic_indicators, OUTPUT_FILES["economic_indicators"], "Economic Indicators")
-    
-    # Competitive Landscape
-    print("\n[2.3] Generating Competitive Landscape...")
-    competitive_landscape = generate_competitive_landscape(EXTERNAL_CONFIG["dmas"])
-    save_dataframe(competitive_landscape, OUTPUT_FILES["competitive_landscape"], "Competitive Landscape")
-    
-    # Lifestyle Segments
-    print("\n[2.4] Generating Lifestyle Segments...")
-    lifestyle_segments = generate_lifestyle_segments(zip_demographics)
-    save_dataframe(lifestyle_segments, OUTPUT_FILES["lifestyle_segments"], "Lifestyle Segments")
+    # Every campaign sent in the activity window (see generators/campaign_catalog.py)
+    catalog = CampaignCatalog.covering(time_axis, seed=run_seed)
     
     # =========================================================================
-    # INTERNAL DATA
+    # EXTERNAL AND INTERNAL DATA (external first, as customers reference ZIP codes)
     # =========================================================================
     
-    print(f"\n{'=' * 70}")
-    print("STEP 3: Generating INTERNAL data")
-    print("=" * 70)
+    # CSVs are written on a background thread while the next table is generated;
+    # stages whose inputs are unchanged since an earlier run are skipped
+    with WriteBehindWriter(CUSTOMER_CONFIG["write_behind_frames"]) as writer:
+        graph = build_stage_graph(run_seed, time_axis, cube, catalog, chunk_size, workers, writer, stage_workers)
+        cache = None
+        if use_cache:
+            cache = StageCache(os.path.join(OUTPUT_DIR, OUTPUT_FILES["stage_cache"]), OUTPUT_DIR, writer)
+        print(f"\n{'=' * 70}")
+        print(f"STEP 2: Generating data ({len(graph.stages)} stages, up to {stage_workers} at once)")
+        print("=" * 70)
+        results = graph.run(stage_workers, cache, writer)
+        print("\n  Waiting for background writes...")
+    graph.print_timings()
+    print(f"  Background writer: {writer.wait_time:.1f}s blocked on a full queue during generation, "
+          f"{writer.drain_time:.1f}s draining after the last stage")
     
-    # Customers
-    print("\n[3.1] Generating Customers...")
-    customers = generate_customers(
-        CUSTOMER_CONFIG["total_records"],
-        zip_demographics,
-        lifestyle_segments,
-        competitive_landscape
-    )
-    save_dataframe(customers, OUTPUT_FILES["customers"], "Customers")
-    
-    # Monthly Usage
-    print("\n[3.2] Generating Monthly Usage...")
-    monthly_usage = generate_monthly_usage(
-        customers,
-        CUSTOMER_CONFIG["months_of_usage"]
-    )
-    save_dataframe(monthly_usage, OUTPUT_FILES["monthly_usage"], "Monthly Usage")
-    
-    # Support Interactions
-    print("\n[3.3] Generating Support Interactions...")
-    interactions = generate_support_interactions(
-        customers,
-        CUSTOMER_CONFIG["avg_interactions_per_customer"]
-    )
-    save_dataframe(interactions, OUTPUT_FILES["support_interactions"], "Support Interactions")
+    economic_indicators, lifestyle_segments = results["zip_derived"]
+    if "internal" in results:
+        internal_counts = results["internal"]
+    else:
+        internal_counts = {
+            "customers": len(results["customers"]),
+            "monthly_usage": results["monthly_usage"],
+            "support_interactions": results["support_interactions"],
+            "campaign_responses": results["campaign_responses"],
+            "campaign_catalog": len(catalog),
+        }
     
-    # Campaign Responses
-    print("\n[3.4] Generating Campaign Responses...")
-    campaigns = generate_campaign_responses(
-        customers,
-        CUSTOMER_CONFIG["avg_campaigns_per_customer"]
-    )
-    save_dataframe(campaigns, OUTPUT_FILES["campaign_responses"], "Campaign Responses")
+    # State needed to append later billing months (--append-months); months
+    # appended to an unchanged base (same stage keys) are still valid
+    base_key = StageCache.key("base", {}, {}, list(graph.keys().values()))
+    appended_months = []
+    if os.path.exists(os.path.join(OUTPUT_DIR, OUTPUT_FILES["run_state"])):
+        previous = load_run_state()
+        if previous.get("base_key") == base_key:
+            appended_months = previous["appended_months"]
+    save_run_state({
+        "seed": run_seed,
+        "as_of": str(time_axis.as_of),
+        "customers": internal_counts["customers"],
+        "usage_months": CUSTOMER_CONFIG["months_of_usage"],
+        "campaign_catalog_start": str(catalog.first_month),
+        "base_key": base_key,
+        "appended_months": appended_months,
+    })
     
     # =========================================================================
     # SUMMARY
@@ -175,31 +693,25 @@ def main(num_customers: int = None, seed: int = None):
     
     # Calculate total records and size
     total_records = (
-        len(customers) + 
-        len(monthly_usage) + 
-        len(interactions) + 
-        len(campaigns) +
-        len(zip_demographics) +
+        sum(internal_counts.values()) +
+        len(results["zip_demographics"]) +
         len(economic_indicators) +
-        len(competitive_landscape) +
+        len(results["competitive_landscape"]) +
         len(lifestyle_segments)
     )
     
-    total_size_mb = sum(
-        os.path.getsize(os.path.join(OUTPUT_DIR, f)) / (1024 * 1024)
-        for f in OUTPUT_FILES.values()
-        if os.path.exists(os.path.join(OUTPUT_DIR, f))
-    )
+    # The stage cache is bookkeeping for later runs, not output
+    outputs = {name: path for name, path in OUTPUT_FILES.items()
+               if name != "stage_cache" and os.path.exists(os.path.join(OUTPUT_DIR, path))}
+    total_size_mb = sum(output_size_mb(os.path.join(OUTPUT_DIR, path)) for path in outputs.values())
     
     print(f"\nSummary:")
     print(f"  Total records generated: {total_records:,}")
     print(f"  Total file size: {total_size_mb:.1f} MB")
     print(f"\nFiles created:")
-    for name, path in OUTPUT_FILES.items():
-        full_path = os.path.join(OUTPUT_DIR, path)
-        if os.path.exists(full_path):
-            size = os.path.getsize(full_path) / (1024 * 1024)
-            print(f"  ✓ {path} ({size:.1f} MB)")
+    for name, path in outputs.items():
+        size = output_size_mb(os.path.join(OUTPUT_DIR, path))
+        print(f"  ✓ {path} ({size:.1f} MB)")
     
     print(f"\nCompleted at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("\nNext steps:")
@@ -224,11 +736,62 @@ if __name__ == "__main__":
         default=None,
         help="Random seed for reproducibility (default: 42)"
     )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=None,
+        help=f"Stream customers and their activity tables to disk in chunks of this many rows "
+             f"to cap memory (config default: {CUSTOMER_CONFIG['chunk_size']:,})"
+    )
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=1,
+        help="Processes generating customer shards in parallel; output is identical "
+             "for any worker count (default: 1)"
+    )
+    parser.add_argument(
+        "--stage-workers",
+        type=int,
+        default=None,
+        help="Processes running independent generation stages (e.g. usage, interactions and "
+             f"campaigns) at once; 1 runs them in sequence (default: {CUSTOMER_CONFIG['stage_workers']}, "
+             f"at most the CPU count)"
+    )
+    parser.add_argument(
+        "--as-of",
+        default=None,
+        help="Reference date (YYYY-MM-DD) all generated dates are relative to (default: today)"
+    )
+    parser.add_argument(
+        "--append-months",
+        type=int,
+        default=None,
+        help="Instead of a full run, append this many billing months of usage, interactions "
+             "and campaigns to the existing data"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Regenerate every stage instead of reusing the outputs of stages whose config "
+             "sections, seed and sizes are unchanged (needed after editing generator code)"
+    )
+    parser.add_argument(
+        "--no-usage-cube",
+        action="store_true",
+        help="Skip the dense memory-mapped usage cube (internal/usage_cube.npy)"
+    )
     
     args = parser.parse_args()
     
     try:
-        main(num_customers=args.customers, seed=args.seed)
+        if args.append_months:
+            append_months(args.append_months)
+        else:
+            main(num_customers=args.customers, seed=args.seed,
+                 chunk_size=args.chunk_size, workers=args.workers, as_of=args.as_of,
+                 usage_cube=False if args.no_usage_cube else None, stage_workers=args.stage_workers,
+                 use_cache=not args.no_cache)
     except KeyboardInterrupt:
         print("\n\nGeneration cancelled by user.")
         sys.exit(1)
@@ -0,0 +1,126 @@
+"""
+Snowmobile Wireless - CDR Stream Generator
+Explodes the generated monthly usage into call-detail records for load testing
+
+Usage is read in blocks of CDR_CONFIG["usage_rows_per_block"] rows, so
+memory stays bounded at any scale. Each block's events are written as one
+part file per billing month (cdr/billing_month=YYYY-MM/part-NNNNN.csv)
+and rolled back up on the fly; every usage row must be reproduced by its
+events. Throughput is reported in events per second.
+
+The seed and as-of date default to those of the run that wrote the usage
+(its run_state.json), so events fall in the same billing months and are
+drawn from the same streams; config and today are used without one.
+
+Usage:
+    python generate_cdrs.py [--seed 42] [--as-of 2026-03-31] [--max-blocks N] [--no-write]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+
+from config import RANDOM_SEED, OUTPUT_DIR, OUTPUT_FILES, CDR_CONFIG
+from generators.cdr_generator import USAGE_COLUMNS, generate_cdr_block, rollup_mismatches
+from generators.time_axis import TimeAxis
+
+
+def write_partitions(events: pd.DataFrame, month: np.ndarray, out_dir: str, block: int) -> int:
+    """Write one block's events as a part file per billing month; returns bytes written"""
+    written = 0
+    bounds = np.flatnonzero(np.diff(month.astype(np.int64), prepend=-1, append=-1))
+    for first, stop in zip(bounds[:-1], bounds[1:]):
+        partition = os.path.join(out_dir, f"billing_month={month[first]}")
+        os.makedirs(partition, exist_ok=True)
+        filepath = os.path.join(partition, f"part-{block:05d}.csv")
+        events.iloc[first:stop].to_csv(filepath, index=False)
+        written += os.path.getsize(filepath)
+    return written
+
+
+def load_base_run() -> dict:
+    """Run state of the generation run in OUTPUT_DIR, or {} when there is none"""
+    filepath = os.path.join(OUTPUT_DIR, OUTPUT_FILES["run_state"])
+    if not os.path.exists(filepath):
+        return {}
+    with open(filepath) as f:
+        return json.load(f)
+
+
+def main(seed: int = None, as_of: str = None, max_blocks: int = None, write: bool = True) -> int:
+    base_run = load_base_run()
+    seed = seed or base_run.get("seed") or RANDOM_SEED
+    time_axis = TimeAxis(as_of or base_run.get("as_of"))
+    usage_path = os.path.join(OUTPUT_DIR, OUTPUT_FILES["monthly_usage"])
+    out_dir = os.path.join(OUTPUT_DIR, OUTPUT_FILES["cdr_events"])
+    block_rows = CDR_CONFIG["usage_rows_per_block"]
+
+    print("=" * 70)
+    print("SNOWMOBILE WIRELESS - CDR STREAM GENERATOR")
+    print("=" * 70)
+    print(f"  Usage: {usage_path}")
+    print(f"  Output: {out_dir if write else '(not written)'}")
+    print(f"  Random seed: {seed}")
+    print(f"  As-of date: {time_axis.as_of}")
+    print(f"  Usage rows per block: {block_rows:,}")
+
+    if write:
+        shutil.rmtree(out_dir, ignore_errors=True)
+        os.makedirs(out_dir)
+
+    n_usage = n_events = n_bytes = mismatches = 0
+    generate_time = write_time = 0.0
+    start = time.perf_counter()
+    reader = pd.read_csv(usage_path, usecols=USAGE_COLUMNS, chunksize=block_rows)
+    progress = tqdm(desc="  CDR events", unit=" events", unit_scale=True)
+
+    for block, usage in enumerate(reader):
+        if max_blocks is not None and block >= max_blocks:
+            break
+        t0 = time.perf_counter()
+        events, rollup, month = generate_cdr_block(usage, seed, block, time_axis)
+        mismatches += rollup_mismatches(usage, rollup)
+        t1 = time.perf_counter()
+        if write:
+            n_bytes += write_partitions(events, month, out_dir, block)
+        write_time += time.perf_counter() - t1
+        generate_time += t1 - t0
+
+        n_usage += len(usage)
+        n_events += len(events)
+        progress.update(len(events))
+
+    progress.close()
+    elapsed = time.perf_counter() - start
+
+    print(f"\n  ✓ Generated {n_events:,} CDR events from {n_usage:,} usage rows")
+    print(f"    Generation: {generate_time:.1f}s ({n_events / max(generate_time, 1e-9):,.0f} events/s)")
+    if write:
+        print(f"    Writing:    {write_time:.1f}s ({n_bytes / (1024 * 1024):,.1f} MB)")
+    print(f"    End to end: {elapsed:.1f}s ({n_events / max(elapsed, 1e-9):,.0f} events/s)")
+
+    if mismatches:
+        print(f"  ✗ {mismatches:,} usage rows are not reproduced by their CDR rollup")
+        return 1
+    print("  ✓ CDR rollup reproduces every monthly_usage row")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a CDR event stream from monthly usage")
+    parser.add_argument("--seed", "-s", type=int, default=None,
+                        help=f"Random seed (default: the usage run's, else {RANDOM_SEED})")
+    parser.add_argument("--as-of", type=str, default=None,
+                        help="As-of date (YYYY-MM-DD) of the usage run; events stop at this day "
+                             "(default: the usage run's, else today)")
+    parser.add_argument("--max-blocks", type=int, default=None, help="Stop after this many usage blocks")
+    parser.add_argument("--no-write", action="store_true", help="Generate and check events without writing them")
+    args = parser.parse_args()
+    sys.exit(main(seed=args.seed, as_of=args.as_of, max_blocks=args.max_blocks, write=not args.no_write))
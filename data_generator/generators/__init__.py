@@ -1,26 +1,53 @@
 """
 Snowmobile Wireless - Data Generators
 Individual generator modules for each data type
+
+Modules are imported on first attribute access (PEP 562), so a one-table
+run or an audit script only loads the generators it uses.
 """
 
-from .customer_generator import generate_customers
-from .usage_generator import generate_monthly_usage
-from .interaction_generator import generate_support_interactions
-from .campaign_generator import generate_campaign_responses
-from .zip_demographics_generator import generate_zip_demographics
-from .economic_generator import generate_economic_indicators
-from .competitive_generator import generate_competitive_landscape
-from .lifestyle_generator import generate_lifestyle_segments
-
-__all__ = [
-    'generate_customers',
-    'generate_monthly_usage',
-    'generate_support_interactions',
-    'generate_campaign_responses',
-    'generate_zip_demographics',
-    'generate_economic_indicators',
-    'generate_competitive_landscape',
-    'generate_lifestyle_segments',
-]
+import importlib
+import os
+import sys
+
+# Generator modules import `config` from the data_generator directory
+_DATA_GENERATOR_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _DATA_GENERATOR_DIR not in sys.path:
+    sys.path.append(_DATA_GENERATOR_DIR)
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'generate_customers': 'customer_generator',
+    'generate_monthly_usage': 'usage_generator',
+    'generate_support_interactions': 'interaction_generator',
+    'generate_campaign_responses': 'campaign_generator',
+    'generate_zip_demographics': 'zip_demographics_generator',
+    'generate_economic_indicators': 'economic_generator',
+    'generate_competitive_landscape': 'competitive_generator',
+    'generate_lifestyle_segments': 'lifestyle_generator',
+    'generate_zip_derived_tables': 'zip_derived_generator',
+    'ZipFeatures': 'zip_features',
+    'GeoSampler': 'geo_sampler',
+    'CustomerView': 'customer_view',
+    'CampaignCatalog': 'campaign_catalog',
+    'StageGraph': 'stage_graph',
+    'StageCache': 'stage_cache',
+    'WriteBehindWriter': 'write_behind',
+    'PricingTable': 'billing',
+    'reprice_usage': 'billing',
+    'score_churn_risk': 'churn_model',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
 
 
+def __dir__():
+    return sorted(list(globals()) + __all__)
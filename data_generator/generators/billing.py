@@ -0,0 +1,118 @@
+"""
+Snowmobile Wireless - Billing Engine
+Vectorized monthly bills from usage arrays and a plan pricing table
+
+The usage generator bills each row through `compute_charges`; the same
+function re-prices already generated usage under a what-if pricing table
+(`reprice_usage`) without regenerating it.
+"""
+
+import numpy as np
+import pandas as pd
+
+from config import PLAN_CONFIG, BILLING_CONFIG
+from .customer_view import CustomerView
+
+
+# Charge columns written to monthly_usage, in output order
+CHARGE_COLUMNS = ["base_charge", "overage_charges", "roaming_charges", "add_on_charges",
+                  "discounts_applied", "total_bill"]
+
+# Plan billed for rows whose plan is not in the pricing table
+DEFAULT_PLAN = "Powder"
+
+
+class PricingTable:
+    """Plan prices and bill rules as arrays indexed by plan code
+
+    Built from PLAN_CONFIG (price, data_gb allowance) and BILLING_CONFIG;
+    `with_changes` derives a scenario table without touching either.
+    """
+
+    def __init__(self, plans: dict = None, rules: dict = None):
+        plans = PLAN_CONFIG if plans is None else plans
+        self.plans = plans
+        self.rules = {**BILLING_CONFIG, **(rules or {})}
+        self.plan_names = np.array(list(plans), dtype=object)
+        self.price = np.array([plan["price"] for plan in plans.values()])
+        self.data_allowance_gb = np.array([plan["data_gb"] for plan in plans.values()], dtype=float)
+        self.overage_rate = np.where(np.isin(self.plan_names, self.rules["overage_plans"]),
+                                     self.rules["overage_rate_per_gb"], 0)
+        self._codes = {name: code for code, name in enumerate(self.plan_names)}
+
+    def __repr__(self) -> str:
+        prices = ", ".join(f"{name}={price}" for name, price in zip(self.plan_names, self.price))
+        return f"PricingTable({prices})"
+
+    def plan_codes(self, plan_name: np.ndarray) -> np.ndarray:
+        """Plan code per row (unknown plans are billed as DEFAULT_PLAN)"""
+        codes = pd.Series(plan_name, dtype=object).map(self._codes)
+        return codes.fillna(self._codes[DEFAULT_PLAN]).to_numpy(dtype=np.int64)
+
+    def with_changes(self, price_changes: dict = None, **rules) -> "PricingTable":
+        """Scenario table with plan price deltas ({plan: +/- dollars}) and rule overrides"""
+        price_changes = price_changes or {}
+        unknown = set(price_changes) - set(self.plans)
+        if unknown:
+            raise ValueError(f"unknown plans in price changes: {sorted(unknown)}")
+        unknown = set(rules) - set(self.rules)
+        if unknown:
+            raise ValueError(f"unknown billing rules: {sorted(unknown)}")
+        plans = {name: {**plan, "price": plan["price"] + price_changes.get(name, 0)}
+                 for name, plan in self.plans.items()}
+        return PricingTable(plans, {**self.rules, **rules})
+
+
+def compute_charges(pricing: PricingTable, plan_code: np.ndarray, data_usage_gb: np.ndarray,
+                    roaming_days: np.ndarray, roaming_data_gb: np.ndarray,
+                    has_device_protection: np.ndarray, has_streaming_bundle: np.ndarray,
+                    autopay_enrolled: np.ndarray, tenure_months: np.ndarray) -> dict:
+    """Bill every usage row at once; returns CHARGE_COLUMNS as arrays"""
+    rules = pricing.rules
+    base_charge = pricing.price[plan_code]
+
+    # Overage charges (limited plans, per GB over the allowance)
+    over_allowance = np.maximum(0, data_usage_gb - pricing.data_allowance_gb[plan_code])
+    overage = np.round(over_allowance * pricing.overage_rate[plan_code], 2)
+
+    # Roaming charges
+    roaming = np.where(roaming_days > 0,
+                       np.round(roaming_days * rules["roaming_rate_per_day"]
+                                + roaming_data_gb * rules["roaming_rate_per_gb"], 2), 0.0)
+
+    # Add-on charges
+    add_ons = (rules["device_protection_fee"] * has_device_protection
+               + rules["streaming_bundle_fee"] * has_streaming_bundle)
+
+    # Discounts (autopay, plus loyalty for long-tenure customers)
+    loyalty = np.where(tenure_months > rules["loyalty_min_tenure_months"],
+                       np.round(base_charge * rules["loyalty_discount_pct"], 2), 0.0)
+    discounts = rules["autopay_discount"] * autopay_enrolled + loyalty
+
+    total = np.round(np.maximum(0, base_charge + overage + roaming + add_ons - discounts), 2)
+    return dict(zip(CHARGE_COLUMNS, (base_charge, overage, roaming, add_ons, discounts, total)))
+
+
+def reprice_usage(usage_df: pd.DataFrame, customers, pricing: PricingTable) -> pd.DataFrame:
+    """Recompute the charge columns of generated usage under `pricing`
+
+    `customers` (a CustomerView or customer DataFrame) supplies each row's
+    plan, add-ons, autopay and tenure; usage volumes are left as generated.
+    """
+    customers = CustomerView.of(customers)
+    rows = pd.Index(customers['customer_id']).get_indexer(usage_df['customer_id'])
+    if (rows < 0).any():
+        raise ValueError(f"{(rows < 0).sum():,} usage rows reference unknown customers")
+
+    charges = compute_charges(
+        pricing,
+        pricing.plan_codes(customers['plan_name'])[rows],
+        usage_df['data_usage_gb'].to_numpy(),
+        usage_df['roaming_days'].to_numpy(),
+        usage_df['roaming_data_gb'].to_numpy(),
+        customers.get('has_device_protection', False)[rows],
+        customers.get('has_streaming_bundle', False)[rows],
+        customers.get('autopay_enrolled', False)[rows],
+        customers['tenure_months'][rows],
+    )
+    return usage_df.assign(**charges)
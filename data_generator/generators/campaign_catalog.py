@@ -0,0 +1,151 @@
+"""
+Snowmobile Wireless - Campaign Catalog
+Campaign dimension shared by the campaign responses
+
+A campaign is one template sent on one channel during one calendar month,
+so every month has len(templates) x len(channels) campaigns. Responses
+carry the campaign's small integer `campaign_key` (dense from the
+catalog's first month) and the catalog holds its ID, type, template,
+channel, send window and audience size. A month's campaign IDs are drawn
+from that month's "campaign_catalog" stream (see streams.py), so they are
+the same in a full run and in a month appended to it.
+"""
+
+import numpy as np
+import pandas as pd
+
+from config import CAMPAIGN_CHANNELS
+from .ids import random_hex_ids
+from .streams import block_rng, month_period, resolve_seed
+from .text_dictionary import TextDictionary
+from .time_axis import TimeAxis
+
+
+CAMPAIGN_TEMPLATES = {
+    "Retention": [
+        {"name": "Loyalty Thank You", "offer": "10% off next 3 months", "value": 30},
+        {"name": "We Miss You", "offer": "$50 bill credit", "value": 50},
+        {"name": "Stay With Us", "offer": "Free device protection 6 months", "value": 90},
+        {"name": "Anniversary Reward", "offer": "Double rewards points", "value": 25},
+    ],
+    "Upsell": [
+        {"name": "Upgrade to Unlimited", "offer": "Blizzard plan at Powder price for 3 months", "value": 60},
+        {"name": "Premium Experience", "offer": "Try Summit plan free for 1 month", "value": 95},
+        {"name": "More Data", "offer": "Add 10GB for $10/month", "value": 10},
+        {"name": "Hotspot Add-On", "offer": "Free hotspot for 3 months", "value": 45},
+    ],
+    "Cross-sell": [
+        {"name": "Protect Your Device", "offer": "Snowpack Protection 50% off first 3 months", "value": 22},
+        {"name": "Stream More", "offer": "Peak Streaming bundle at $5/month", "value": 15},
+        {"name": "Go International", "offer": "Altitude Roaming first trip free", "value": 30},
+        {"name": "Add a Line", "offer": "$0 activation for additional line", "value": 35},
+    ],
+    "Win-back": [
+        {"name": "Come Back Offer", "offer": "$100 credit on return", "value": 100},
+        {"name": "Fresh Start", "offer": "50% off for 6 months", "value": 150},
+        {"name": "We've Changed", "offer": "Free month of service", "value": 75},
+    ],
+    "Loyalty": [
+        {"name": "Rewards Redemption", "offer": "Double points weekend", "value": 0},
+        {"name": "Exclusive Access", "offer": "Early upgrade eligibility", "value": 50},
+        {"name": "Thank You Gift", "offer": "Free accessory credit $50", "value": 50},
+        {"name": "Gold Member Perk", "offer": "Priority customer service", "value": 20},
+    ],
+    "Seasonal": [
+        {"name": "Back to School", "offer": "Free tablet with new line", "value": 300},
+        {"name": "Holiday Special", "offer": "BOGO device offer", "value": 500},
+        {"name": "Summer Savings", "offer": "3 months free streaming", "value": 30},
+        {"name": "Black Friday", "offer": "$400 off flagship phones", "value": 400},
+    ],
+}
+
+# Compiled template table: one row per template, and each campaign
+# type's template rows
+_ALL_TEMPLATES = [(campaign_type, t) for campaign_type, templates in CAMPAIGN_TEMPLATES.items() for t in templates]
+CAMPAIGN_NAMES = TextDictionary(t["name"] for _, t in _ALL_TEMPLATES)
+CAMPAIGN_OFFERS = TextDictionary(t["offer"] for _, t in _ALL_TEMPLATES)
+TEMPLATE_TYPES = np.array([campaign_type for campaign_type, _ in _ALL_TEMPLATES], dtype=object)
+TEMPLATE_NAMES = CAMPAIGN_NAMES.codes([t["name"] for _, t in _ALL_TEMPLATES])
+TEMPLATE_OFFERS = CAMPAIGN_OFFERS.codes([t["offer"] for _, t in _ALL_TEMPLATES])
+TEMPLATE_VALUES = np.array([t["value"] for _, t in _ALL_TEMPLATES])
+TYPE_TEMPLATES = {
+    campaign_type: np.flatnonzero(TEMPLATE_TYPES == campaign_type) for campaign_type in CAMPAIGN_TEMPLATES
+}
+
+CHANNELS = np.array(list(CAMPAIGN_CHANNELS), dtype=object)
+CAMPAIGNS_PER_MONTH = len(_ALL_TEMPLATES) * len(CHANNELS)
+
+CATALOG_COLUMNS = [
+    "campaign_key", "campaign_id", "campaign_name", "campaign_type", "offer_type", "offer_value",
+    "channel", "send_start", "send_end", "audience_size",
+]
+
+
+class CampaignCatalog:
+    """Every campaign of the calendar months first_month .. month of last_day
+
+    Sends stop at `last_day` (the as-of date of the run).
+    """
+
+    def __init__(self, first_month, last_day, seed: int = None):
+        self.first_month = np.datetime64(first_month, 'M')
+        self.last_day = np.datetime64(last_day, 'D')
+        self.n_months = int((self.last_day.astype('datetime64[M]') - self.first_month).astype(np.int64)) + 1
+        self.seed = resolve_seed(seed)
+        self._campaign_ids = None
+
+    @classmethod
+    def covering(cls, time_axis: TimeAxis, window_days: int = 365, seed: int = None) -> "CampaignCatalog":
+        """Catalog of every month touched by the `window_days` days up to the as-of date"""
+        return cls(time_axis.as_of - (window_days - 1), time_axis.as_of, seed)
+
+    def __len__(self) -> int:
+        return self.n_months * CAMPAIGNS_PER_MONTH
+
+    @property
+    def campaign_ids(self) -> np.ndarray:
+        """Campaign ID of every key, drawn from each month's own stream"""
+        if self._campaign_ids is None:
+            self._campaign_ids = np.concatenate([
+                random_hex_ids(CAMPAIGNS_PER_MONTH, 8,
+                               block_rng(self.seed, "campaign_catalog", 0, month_period(self.first_month + offset)))
+                for offset in range(self.n_months)
+            ])
+        return self._campaign_ids
+
+    def keys(self, sent_at: np.ndarray, template: np.ndarray, channel: np.ndarray) -> np.ndarray:
+        """Campaign key of each send (template and channel codes)"""
+        month = (np.asarray(sent_at).astype('datetime64[M]') - self.first_month).astype(np.int64)
+        if len(month) and (month.min() < 0 or month.max() >= self.n_months):
+            raise ValueError(f"send dates fall outside the catalog's months "
+                             f"{self.first_month} .. {self.first_month + self.n_months - 1}")
+        return (month * len(_ALL_TEMPLATES) + template) * len(CHANNELS) + channel
+
+    def month_offset(self, month) -> int:
+        """Position of a calendar month in the catalog"""
+        return int((np.datetime64(month, 'M') - self.first_month).astype(np.int64))
+
+    def frame(self, audience_size: np.ndarray = None, months=None) -> pd.DataFrame:
+        """The catalog (or some of its months) with CATALOG_COLUMNS
+
+        `audience_size` holds the number of responses per campaign key
+        over the whole catalog (zeros when omitted).
+        """
+        offsets = np.arange(self.n_months) if months is None else np.array([self.month_offset(m) for m in months])
+        key = (offsets[:, None] * CAMPAIGNS_PER_MONTH + np.arange(CAMPAIGNS_PER_MONTH)).ravel()
+        template, channel = np.divmod(key % CAMPAIGNS_PER_MONTH, len(CHANNELS))
+        month = self.first_month + np.repeat(offsets, CAMPAIGNS_PER_MONTH)
+        if audience_size is None:
+            audience_size = np.zeros(len(self), dtype=np.int64)
+        return pd.DataFrame({
+            "campaign_key": key,
+            "campaign_id": self.campaign_ids[key],
+            "campaign_name": CAMPAIGN_NAMES.column(TEMPLATE_NAMES[template]),
+            "campaign_type": TEMPLATE_TYPES[template],
+            "offer_type": CAMPAIGN_OFFERS.column(TEMPLATE_OFFERS[template]),
+            "offer_value": TEMPLATE_VALUES[template],
+            "channel": CHANNELS[channel],
+            "send_start": month.astype('datetime64[D]'),
+            "send_end": np.minimum((month + 1).astype('datetime64[D]') - 1, self.last_day),
+            "audience_size": audience_size[key],
+        })
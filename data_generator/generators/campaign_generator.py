@@ -3,189 +3,156 @@ Snowmobile Wireless - Campaign Generator
 Generates marketing campaign response data
 """
 
-import uuid
-from datetime import datetime, timedelta
 import numpy as np
 import pandas as pd
 from tqdm import tqdm
 
-import sys
-sys.path.append('..')
-from config import CAMPAIGN_TYPES, CAMPAIGN_CHANNELS
+from config import CAMPAIGN_TYPES, SEGMENT_THRESHOLDS
+from .customer_view import CustomerView
+from .campaign_catalog import (
+    CampaignCatalog, CAMPAIGN_NAMES, CAMPAIGN_OFFERS, CHANNELS, TEMPLATE_NAMES,
+    TEMPLATE_OFFERS, TEMPLATE_VALUES, TYPE_TEMPLATES
+)
+from .ids import id_columns
+from .streams import block_rng, block_ranges, resolve_seed
+from .time_axis import TimeAxis
+from .text_dictionary import choose_codes
+from .distributions import CAMPAIGN_TYPE_BY_CUSTOMER, CAMPAIGN_CHANNEL_MIX
 
 
-CAMPAIGN_TEMPLATES = {
-    "Retention": [
-        {"name": "Loyalty Thank You", "offer": "10% off next 3 months", "value": 30},
-        {"name": "We Miss You", "offer": "$50 bill credit", "value": 50},
-        {"name": "Stay With Us", "offer": "Free device protection 6 months", "value": 90},
-        {"name": "Anniversary Reward", "offer": "Double rewards points", "value": 25},
-    ],
-    "Upsell": [
-        {"name": "Upgrade to Unlimited", "offer": "Blizzard plan at Powder price for 3 months", "value": 60},
-        {"name": "Premium Experience", "offer": "Try Summit plan free for 1 month", "value": 95},
-        {"name": "More Data", "offer": "Add 10GB for $10/month", "value": 10},
-        {"name": "Hotspot Add-On", "offer": "Free hotspot for 3 months", "value": 45},
-    ],
-    "Cross-sell": [
-        {"name": "Protect Your Device", "offer": "Snowpack Protection 50% off first 3 months", "value": 22},
-        {"name": "Stream More", "offer": "Peak Streaming bundle at $5/month", "value": 15},
-        {"name": "Go International", "offer": "Altitude Roaming first trip free", "value": 30},
-        {"name": "Add a Line", "offer": "$0 activation for additional line", "value": 35},
-    ],
-    "Win-back": [
-        {"name": "Come Back Offer", "offer": "$100 credit on return", "value": 100},
-        {"name": "Fresh Start", "offer": "50% off for 6 months", "value": 150},
-        {"name": "We've Changed", "offer": "Free month of service", "value": 75},
-    ],
-    "Loyalty": [
-        {"name": "Rewards Redemption", "offer": "Double points weekend", "value": 0},
-        {"name": "Exclusive Access", "offer": "Early upgrade eligibility", "value": 50},
-        {"name": "Thank You Gift", "offer": "Free accessory credit $50", "value": 50},
-        {"name": "Gold Member Perk", "offer": "Priority customer service", "value": 20},
-    ],
-    "Seasonal": [
-        {"name": "Back to School", "offer": "Free tablet with new line", "value": 300},
-        {"name": "Holiday Special", "offer": "BOGO device offer", "value": 500},
-        {"name": "Summer Savings", "offer": "3 months free streaming", "value": 30},
-        {"name": "Black Friday", "offer": "$400 off flagship phones", "value": 400},
-    ],
-}
+# Funnel rates by campaign type
+CAMPAIGN_TYPE_CODES = pd.Index(list(CAMPAIGN_TYPES))
+RESPONSE_RATES = np.array([info["response_rate"] for info in CAMPAIGN_TYPES.values()])
+CONVERSION_RATES = np.array([info["conversion_rate"] for info in CAMPAIGN_TYPES.values()])
 
 
-def weighted_choice(distribution: dict) -> str:
-    items = list(distribution.keys())
-    weights = list(distribution.values())
-    return np.random.choice(items, p=weights)
+def generate_campaign_responses(customers,
+                                 avg_per_customer: float = 5.0,
+                                 seed: int = None, first_block: int = 0,
+                                 time_axis: TimeAxis = None, window_days: int = 365,
+                                 min_per_customer: int = 1, period: int = None,
+                                 catalog: CampaignCatalog = None) -> pd.DataFrame:
+    """Generate campaign response records
 
-
-def generate_campaign_responses(customers_df: pd.DataFrame,
-                                 avg_per_customer: float = 5.0) -> pd.DataFrame:
-    """Generate campaign response records"""
+    Customers are processed in RNG blocks (see streams.py) so output depends
+    only on `seed` and row position; `first_block` is the global block index
+    of the first row of `customers` when it is a slice of the population.
+    `customers` is a CustomerView or a customer DataFrame.
+    Send dates fall in the `window_days` days (or tenure) up to `time_axis`
+    (default: today); each customer gets `min_per_customer` to 15 campaigns.
+    `period` keys the random streams of a month appended to a run.
+    campaign_name and offer_type are Categoricals (see text_dictionary.py).
+    Each response references its campaign in `catalog` (default: the
+    catalog of the window's months) by `campaign_key`.
+    """
     
-    n_customers = len(customers_df)
+    customers = CustomerView.of(customers)
+    n_customers = len(customers)
     est_records = int(n_customers * avg_per_customer)
     
     print(f"  Generating ~{est_records:,} campaign response records...")
     
+    seed = resolve_seed(seed)
+    time_axis = time_axis or TimeAxis()
+    if catalog is None:
+        catalog = CampaignCatalog.covering(time_axis, window_days, seed)
     records = []
-    customer_data = customers_df.set_index('customer_id').to_dict('index')
+    progress = tqdm(total=n_customers, desc="  Campaigns")
     
-    for customer_id, cust in tqdm(customer_data.items(), desc="  Campaigns"):
-        # Number of campaigns based on tenure and value
-        tenure = cust.get('tenure_months', 12)
-        arpu = cust.get('monthly_arpu', 50)
-        churn_risk = cust.get('churn_risk_score', 0.2)
+    for block, first, stop in block_ranges(n_customers):
+        rng = block_rng(seed, "campaigns", first_block + block, period)
+        block_customers = customers.slice(first, stop)
+        arpus = block_customers.get('monthly_arpu', 50)
+        risks = block_customers.get('churn_risk_score', 0.2)
+        
+        # Number of campaigns based on tenure and value:
+        # more campaigns for higher value customers and those at risk
+        counts = rng.poisson(avg_per_customer, len(block_customers))
+        counts = np.where(arpus > 70, (counts * 1.2).astype(np.int64), counts)
+        counts = np.where(risks > 0.5, (counts * 1.3).astype(np.int64), counts)
+        counts = np.clip(counts, min_per_customer, 15)  # Cap at 15
+        
+        # Campaign type (influenced by customer status), drawn for every
+        # campaign in the block at once
+        segment = np.select(
+            [risks > SEGMENT_THRESHOLDS["campaign_at_risk_churn"], arpus > SEGMENT_THRESHOLDS["campaign_high_arpu"]],
+            ["At Risk", "High ARPU"], "Standard"
+        )
+        campaign_types = CAMPAIGN_TYPE_BY_CUSTOMER.sample(np.repeat(segment, counts), rng)
+        customer_ids = np.repeat(block_customers['customer_id'], counts)
+        row_risks = np.repeat(risks, counts)
+        row_app_user = np.repeat(block_customers.get('app_user', False), counts)
+        
+        # Campaign timing: within the window, and not before the customer joined
+        window = np.minimum(window_days, np.repeat(block_customers.get('tenure_months', 12), counts) * 30)
+        sent_dates = time_axis.timestamps_before((rng.random(len(window)) * window).astype(np.int64), rng)
+        
+        # Template and channel, which with the send month identify the
+        # catalog campaign
+        n_rows = len(customer_ids)
+        template = choose_codes(campaign_types, TYPE_TEMPLATES, rng)
+        channel_codes = CAMPAIGN_CHANNEL_MIX.sample_codes(n_rows, rng)
+        channels = CHANNELS[channel_codes]
+        campaign_keys = catalog.keys(sent_dates, template, channel_codes)
+        
+        # Stage probabilities, adjusted from the customer profile
+        type_code = CAMPAIGN_TYPE_CODES.get_indexer(campaign_types)
+        open_rate = RESPONSE_RATES[type_code] * 3  # Open rate higher than response
+        open_rate = np.where(row_app_user & np.isin(channels, ["App Push", "SMS"]), open_rate * 1.3, open_rate)
+        response_rate = RESPONSE_RATES[type_code]
+        response_rate = np.where((row_risks > 0.6) & (campaign_types == "Retention"),
+                                 response_rate * 1.5, response_rate)  # Higher response to retention for at-risk
+        acceptance_rate = CONVERSION_RATES[type_code] / response_rate
+        
+        # Response funnel: each stage a Bernoulli draw gated on the one before
+        delivered = rng.random(n_rows) < 0.95  # Most are delivered
+        opened = delivered & (rng.random(n_rows) < np.minimum(open_rate, 0.8))
+        clicked = opened & (rng.random(n_rows) < 0.5)
+        responded = clicked & (rng.random(n_rows) < np.minimum(response_rate * 2, 0.6))
+        converted = responded & (rng.random(n_rows) < acceptance_rate)
+        declined = responded & ~converted & (rng.random(n_rows) < 0.6)
+        
+        # Handle complaints (rare)
+        complained = responded & (rng.random(n_rows) < 0.02)
+        converted &= ~complained
+        response_type = np.select([complained, converted, declined], ["Complained", "Accepted", "Declined"], "Ignored")
         
-        # More campaigns for higher value customers and those at risk
-        base_campaigns = np.random.poisson(avg_per_customer)
-        if arpu > 70:
-            base_campaigns = int(base_campaigns * 1.2)
-        if churn_risk > 0.5:
-            base_campaigns = int(base_campaigns * 1.3)
+        # Response timing
+        response_delay = (rng.exponential(48, n_rows) * 3600).astype(np.int64).astype('timedelta64[s]')
+        response_at = np.where(responded, sent_dates + response_delay, np.datetime64('NaT'))
         
-        base_campaigns = max(1, min(base_campaigns, 15))  # Cap at 15
+        # Conversion value
+        offer_value = TEMPLATE_VALUES[template]
+        conversion_value = np.where(converted, np.round(offer_value * rng.uniform(0.8, 1.2, n_rows), 2), 0.0)
         
-        for _ in range(base_campaigns):
-            response_id = str(uuid.uuid4())
-            campaign_id = str(uuid.uuid4())[:8].upper()
-            
-            # Select campaign type (influenced by customer status)
-            if churn_risk > 0.5:
-                type_weights = {"Retention": 0.40, "Upsell": 0.15, "Cross-sell": 0.10,
-                               "Win-back": 0.05, "Loyalty": 0.20, "Seasonal": 0.10}
-            elif arpu > 80:
-                type_weights = {"Retention": 0.15, "Upsell": 0.30, "Cross-sell": 0.20,
-                               "Win-back": 0.02, "Loyalty": 0.25, "Seasonal": 0.08}
-            else:
-                type_weights = {k: v["weight"] for k, v in CAMPAIGN_TYPES.items()}
-            
-            campaign_type = weighted_choice(type_weights)
-            campaign_info = CAMPAIGN_TYPES[campaign_type]
-            
-            # Select specific campaign
-            templates = CAMPAIGN_TEMPLATES.get(campaign_type, [{"name": "General", "offer": "Special offer", "value": 25}])
-            template = np.random.choice(templates)
-            
-            # Campaign timing
-            days_ago = np.random.randint(0, min(365, tenure * 30))
-            sent_at = datetime.now() - timedelta(days=days_ago)
-            
-            # Channel
-            channel = weighted_choice(CAMPAIGN_CHANNELS)
-            
-            # Delivery (most are delivered)
-            delivered = np.random.random() < 0.95
-            
-            # Response funnel
-            base_open_rate = campaign_info["response_rate"] * 3  # Open rate higher than response
-            base_response_rate = campaign_info["response_rate"]
-            base_conversion_rate = campaign_info["conversion_rate"]
-            
-            # Adjust rates based on customer profile
-            if cust.get('app_user', False) and channel in ["App Push", "SMS"]:
-                base_open_rate *= 1.3
-            if churn_risk > 0.6 and campaign_type == "Retention":
-                base_response_rate *= 1.5  # Higher response to retention for at-risk
-            
-            opened = delivered and np.random.random() < min(base_open_rate, 0.8)
-            clicked = opened and np.random.random() < 0.5
-            responded = clicked and np.random.random() < min(base_response_rate * 2, 0.6)
-            
-            # Response type
-            if responded:
-                if np.random.random() < base_conversion_rate / base_response_rate:
-                    response_type = "Accepted"
-                    converted = True
-                else:
-                    response_type = np.random.choice(["Declined", "Ignored"], p=[0.6, 0.4])
-                    converted = False
-            else:
-                response_type = "Ignored"
-                converted = False
-            
-            # Response timing
-            if responded:
-                response_delay = timedelta(hours=np.random.exponential(48))
-                response_at = sent_at + response_delay
-            else:
-                response_at = None
-            
-            # Conversion value
-            if converted:
-                conversion_value = template["value"] * np.random.uniform(0.8, 1.2)
-            else:
-                conversion_value = 0
-            
-            # Handle complaints (rare)
-            if responded and np.random.random() < 0.02:
-                response_type = "Complained"
-                converted = False
-                conversion_value = 0
-            
-            record = {
-                "response_id": response_id,
-                "customer_id": customer_id,
-                "campaign_id": campaign_id,
-                "campaign_name": template["name"],
-                "campaign_type": campaign_type,
-                "campaign_category": campaign_type,
-                "offer_type": template["offer"],
-                "offer_value": template["value"],
-                "channel": channel,
-                "sent_at": sent_at,
-                "delivered": delivered,
-                "opened": opened,
-                "clicked": clicked,
-                "responded": responded,
-                "response_type": response_type,
-                "response_at": response_at,
-                "converted": converted,
-                "conversion_value": round(conversion_value, 2),
-            }
-            records.append(record)
+        ids = id_columns(n_rows, "response", rng)
+        block_df = pd.DataFrame({
+            "response_id": ids.pop("response_id"),
+            "customer_id": customer_ids,
+            "campaign_id": catalog.campaign_ids[campaign_keys],
+            "campaign_key": campaign_keys,
+            "campaign_name": CAMPAIGN_NAMES.column(TEMPLATE_NAMES[template]),
+            "campaign_type": campaign_types,
+            "campaign_category": campaign_types,
+            "offer_type": CAMPAIGN_OFFERS.column(TEMPLATE_OFFERS[template]),
+            "offer_value": offer_value,
+            "channel": channels,
+            "sent_at": sent_dates,
+            "delivered": delivered,
+            "opened": opened,
+            "clicked": clicked,
+            "responded": responded,
+            "response_type": response_type.astype(object),
+            "response_at": response_at,
+            "converted": converted,
+            "conversion_value": conversion_value,
+            **ids,
+        })
+        records.append(block_df)
+        progress.update(stop - first)
     
-    df = pd.DataFrame(records)
+    progress.close()
+    df = pd.concat(records, ignore_index=True) if records else pd.DataFrame()
     print(f"  ✓ Generated {len(df):,} campaign records")
     return df
 
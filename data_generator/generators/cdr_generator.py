@@ -0,0 +1,158 @@
+"""
+Snowmobile Wireless - CDR Generator
+Explodes monthly usage rows into call-detail records (calls, SMS, MMS, data)
+
+Each usage row is split into events whose totals reproduce it exactly:
+call seconds per call type sum to the row's minutes, call/SMS/MMS event
+counts match its counters and data session volumes sum to its GB.
+Usage is processed in fixed blocks of CDR_CONFIG["usage_rows_per_block"]
+rows, each drawing from its own "cdr" stream (see streams.py), so events
+depend only on the seed, the as-of date and the usage rows.
+"""
+
+import numpy as np
+import pandas as pd
+
+from config import CDR_CONFIG
+from .streams import block_rng
+from .time_axis import TimeAxis
+
+
+CDR_COLUMNS = ["customer_id", "event_type", "call_type", "started_at", "duration_sec", "volume_kb"]
+
+# Usage columns a CDR block reads, and the ones its rollup reproduces
+USAGE_COLUMNS = ["customer_id", "billing_month", "voice_minutes_onnet", "voice_minutes_offnet",
+                 "voice_minutes_intl", "voice_calls_count", "sms_sent", "mms_sent", "data_usage_gb"]
+ROLLUP_COLUMNS = USAGE_COLUMNS[2:]
+
+EVENT_TYPES = np.array(["Call", "SMS", "MMS", "Data"], dtype=object)
+CALL_TYPES = np.array(["On-net", "Off-net", "International", None], dtype=object)
+NO_CALL_TYPE = 3
+
+KB_PER_GB = 1_000_000
+
+
+def split_totals(totals: np.ndarray, counts: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Split integer `totals[g]` into `counts[g]` random integer parts per group
+
+    Parts are returned group after group and sum exactly to each total;
+    groups with a zero count must have a zero total.
+    """
+    n_events = int(counts.sum())
+    if n_events == 0:
+        return np.zeros(0, dtype=np.int64)
+    group = np.repeat(np.arange(len(counts)), counts)
+    starts = np.cumsum(counts) - counts
+
+    # Random weights, normalized per group through the running sum
+    cumulative = np.cumsum(rng.exponential(1.0, n_events))
+    before = np.concatenate(([0.0], cumulative))[starts]
+    group_weight = np.concatenate(([0.0], cumulative))[starts + counts] - before
+    share = (cumulative - before[group]) / group_weight[group]  # 1.0 exactly at each group's last event
+
+    running = np.floor(share * totals[group]).astype(np.int64)
+    parts = np.diff(running, prepend=0)
+    has_events = counts > 0
+    parts[starts[has_events]] = running[starts[has_events]]
+    return parts
+
+
+def _event_times(month_start: np.ndarray, window_sec: np.ndarray, row: np.ndarray,
+                 rng: np.random.Generator) -> np.ndarray:
+    """Uniform timestamps within each event's billing-month window"""
+    offsets = (rng.random(len(row)) * window_sec[row]).astype(np.int64)
+    return month_start[row] + offsets.astype('timedelta64[s]')
+
+
+def generate_cdr_block(usage: pd.DataFrame, seed: int, block: int,
+                       time_axis: TimeAxis = None) -> tuple:
+    """CDR events for one block of usage rows, plus their rollup
+
+    Returns (events, rollup, month): `events` has CDR_COLUMNS, `rollup` has
+    ROLLUP_COLUMNS per usage row recomputed from the events, and `month`
+    is each event's billing month (for partitioning).
+    """
+    rng = block_rng(seed, "cdr", block)
+    time_axis = time_axis or TimeAxis()
+    n = len(usage)
+
+    # Billing-month window per row: the calendar month, cut off at the as-of day
+    month_start = usage['billing_month'].to_numpy().astype('datetime64[D]')
+    month_end = np.minimum((month_start.astype('datetime64[M]') + 1).astype('datetime64[D]'),
+                           time_axis.as_of + 1)
+    window_sec = np.maximum(1, (month_end - month_start).astype('timedelta64[s]').astype(np.int64))
+    month_start = month_start.astype('datetime64[s]')
+
+    # Calls: one per kind of minutes used, the rest spread in proportion to minutes
+    minutes = usage[ROLLUP_COLUMNS[:3]].to_numpy(dtype=np.int64)
+    used = (minutes > 0).astype(np.int64)
+    extra = np.maximum(0, usage['voice_calls_count'].to_numpy(dtype=np.int64) - used.sum(axis=1))
+    total_minutes = minutes.sum(axis=1, keepdims=True)
+    p = np.where(total_minutes > 0, minutes / np.maximum(total_minutes, 1), [1.0, 0.0, 0.0])
+    calls = used + rng.multinomial(extra, p)
+    call_seconds = split_totals(minutes.ravel() * 60, calls.ravel(), rng)
+    call_group = np.repeat(np.arange(3 * n), calls.ravel())
+    call_row, call_type = np.divmod(call_group, 3)
+
+    # Messages
+    sms = usage['sms_sent'].to_numpy(dtype=np.int64)
+    mms = usage['mms_sent'].to_numpy(dtype=np.int64)
+    sms_row = np.repeat(np.arange(n), sms)
+    mms_row = np.repeat(np.arange(n), mms)
+
+    # Data sessions, volumes summing to the row's usage
+    data_kb = np.round(usage['data_usage_gb'].to_numpy(dtype=float) * KB_PER_GB).astype(np.int64)
+    expected_sessions = CDR_CONFIG["data_sessions_base"] + CDR_CONFIG["data_sessions_per_gb"] * data_kb / KB_PER_GB
+    sessions = np.where(data_kb > 0, np.maximum(1, rng.poisson(expected_sessions)), 0)
+    session_kb = split_totals(data_kb, sessions, rng)
+    session_row = np.repeat(np.arange(n), sessions)
+    session_sec = 1 + rng.exponential(CDR_CONFIG["data_session_mean_sec"], len(session_row)).astype(np.int64)
+
+    row = np.concatenate([call_row, sms_row, mms_row, session_row])
+    event_type = np.repeat(np.arange(4), [len(call_row), len(sms_row), len(mms_row), len(session_row)])
+    call_type = np.concatenate([call_type, np.full(len(row) - len(call_row), NO_CALL_TYPE)])
+    duration = np.concatenate([call_seconds, np.zeros(len(sms_row) + len(mms_row), dtype=np.int64), session_sec])
+    volume = np.concatenate([np.zeros(len(row) - len(session_row), dtype=np.int64), session_kb])
+    started_at = _event_times(month_start, window_sec, row, rng)
+
+    rollup = rollup_cdrs(row, event_type, call_type, duration, volume, n)
+
+    # Month partitions, time-ordered within each
+    month = month_start.astype('datetime64[M]')[row]
+    order = np.lexsort((started_at, month))
+    events = pd.DataFrame({
+        "customer_id": usage['customer_id'].to_numpy()[row[order]],
+        "event_type": EVENT_TYPES[event_type[order]],
+        "call_type": CALL_TYPES[call_type[order]],
+        "started_at": started_at[order],
+        "duration_sec": duration[order],
+        "volume_kb": volume[order],
+    })
+    return events, rollup, month[order]
+
+
+def rollup_cdrs(row: np.ndarray, event_type: np.ndarray, call_type: np.ndarray,
+                duration: np.ndarray, volume: np.ndarray, n_rows: int) -> pd.DataFrame:
+    """Aggregate events back into the monthly_usage counters, one row per usage row"""
+    is_call = event_type == 0
+    call_key = row[is_call] * 3 + call_type[is_call]
+    call_seconds = np.bincount(call_key, weights=duration[is_call], minlength=3 * n_rows).reshape(n_rows, 3)
+    counts = np.bincount(row * 4 + event_type, minlength=4 * n_rows).reshape(n_rows, 4)
+    data_kb = np.bincount(row, weights=volume, minlength=n_rows)
+    return pd.DataFrame({
+        "voice_minutes_onnet": (call_seconds[:, 0] // 60).astype(np.int64),
+        "voice_minutes_offnet": (call_seconds[:, 1] // 60).astype(np.int64),
+        "voice_minutes_intl": (call_seconds[:, 2] // 60).astype(np.int64),
+        "voice_calls_count": counts[:, 0],
+        "sms_sent": counts[:, 1],
+        "mms_sent": counts[:, 2],
+        "data_usage_gb": np.round(data_kb / KB_PER_GB, 3),
+    })
+
+
+def rollup_mismatches(usage: pd.DataFrame, rollup: pd.DataFrame) -> int:
+    """Number of usage rows whose CDR rollup does not reproduce them"""
+    expected = usage[ROLLUP_COLUMNS].reset_index(drop=True)
+    differs = ~np.isclose(expected.to_numpy(dtype=float), rollup[ROLLUP_COLUMNS].to_numpy(dtype=float),
+                          rtol=0, atol=1e-9)
+    return int(differs.any(axis=1).sum())
@@ -0,0 +1,49 @@
+"""
+Snowmobile Wireless - Churn Risk Model
+Vectorized churn-risk scoring kernel with coefficients from CHURN_RISK_WEIGHTS
+
+Used by the customer generator and importable on its own to re-score an
+existing customers table after tweaking the weights.
+"""
+
+import numpy as np
+
+from config import CHURN_RISK_WEIGHTS, PLAN_GROUPS
+
+
+PREPAID_PLANS = [plan for plan, group in PLAN_GROUPS.items() if group == "Prepaid"]
+
+
+def score_churn_risk(tenure, complaints, plan, price_sensitivity, competition_intensity,
+                     late_payments=None, noise=None, weights: dict = None) -> np.ndarray:
+    """Score churn risk for whole columns in one pass
+
+    Arguments are equal-length arrays (or Series): tenure in months,
+    complaint counts, plan names, ZIP price sensitivity and DMA competition
+    intensity ("High" adds the competitor factor). `late_payments` and
+    `noise` are optional per-row additions; `weights` defaults to
+    CHURN_RISK_WEIGHTS. Returns float64 scores clipped to
+    [min_risk, max_risk].
+    """
+    w = CHURN_RISK_WEIGHTS if weights is None else {**CHURN_RISK_WEIGHTS, **weights}
+
+    risk = (
+        w["base_risk"]
+        + w["tenure_factor"] * np.asarray(tenure, dtype=float)  # Longer tenure = lower risk
+        + w["complaint_factor"] * np.asarray(complaints, dtype=float)
+        + w["competitor_intensity_factor"] * (np.asarray(competition_intensity, dtype=object) == "High")
+        + w["price_sensitivity_factor"] * np.asarray(price_sensitivity, dtype=float)
+        + w["prepaid_plan_factor"] * np.isin(np.asarray(plan, dtype=object), PREPAID_PLANS)
+    )
+    if late_payments is not None:
+        risk += w["payment_issue_factor"] * np.asarray(late_payments, dtype=float)
+    if noise is not None:
+        risk += noise
+
+    return np.clip(risk, w["min_risk"], w["max_risk"])
+
+
+def churn_noise(n: int, rng=np.random, weights: dict = None) -> np.ndarray:
+    """Per-customer noise the generator adds on top of the model score"""
+    w = CHURN_RISK_WEIGHTS if weights is None else {**CHURN_RISK_WEIGHTS, **weights}
+    return rng.normal(0, w["noise_std"], n)
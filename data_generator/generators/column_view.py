@@ -0,0 +1,62 @@
+"""
+Snowmobile Wireless - Column View
+Struct-of-arrays base shared by CustomerView and ZipFeatures
+
+A column view holds one typed numpy array per column of a source
+DataFrame, so generators read whole columns without pandas overhead.
+Subclasses declare the columns they extract and their dtypes in
+`COLUMNS`, and defaults for optional columns in `DEFAULTS`.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class ColumnView:
+    """Typed, column-per-array view of a DataFrame's `COLUMNS`
+
+    A column absent from the source frame takes its `DEFAULTS` value for
+    every row, or is left out of the view when it has no default.
+    """
+
+    COLUMNS = {}
+    DEFAULTS = {}
+
+    def __init__(self, columns: dict, n: int):
+        self.columns = columns
+        self.n = n
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame):
+        """Extract the view's columns of a DataFrame"""
+        n = len(df)
+        columns = {}
+        for name, dtype in cls.COLUMNS.items():
+            if name in df:
+                values = df[name].to_numpy()
+            elif name in cls.DEFAULTS:
+                values = np.full(n, cls.DEFAULTS[name])
+            else:
+                continue
+            columns[name] = values.astype(dtype, copy=False)
+        return cls(columns, n)
+
+    @classmethod
+    def of(cls, source):
+        """Accept either a view of this type or a DataFrame to build one from"""
+        return source if isinstance(source, cls) else cls.from_frame(source)
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def get(self, name: str, default) -> np.ndarray:
+        """Column `name`, or `default` for every row when it is missing"""
+        if name in self.columns:
+            return self.columns[name]
+        return np.full(self.n, default)
@@ -3,14 +3,12 @@ Snowmobile Wireless - Competitive Landscape Generator
 Generates competitive intelligence data by DMA
 """
 
-from datetime import date, timedelta
 import numpy as np
 import pandas as pd
 from tqdm import tqdm
 
-import sys
-sys.path.append('..')
 from config import CARRIER_MARKET_SHARE, CARRIER_AVG_PRICE
+from .time_axis import TimeAxis
 
 
 # Top 210 DMAs (comprehensive list aligned with zip_demographics)
@@ -92,17 +90,25 @@ DMA_DATA = [
     # Additional markets for coverage
 ]
 
-# Generate remaining DMAs programmatically with unique codes
-existing_codes = {d[0] for d in DMA_DATA}
-next_code = 700  # Start from 700 to avoid conflicts
-while len(DMA_DATA) < 210:
-    code = str(next_code)
-    if code not in existing_codes:
-        dma_name = f"Market {code}"
-        pop = int(np.random.uniform(100000, 800000))
-        DMA_DATA.append((code, dma_name, pop))
-        existing_codes.add(code)
-    next_code += 1
+def dma_markets(n_dmas: int = 210, rng=np.random) -> list:
+    """DMA_DATA padded with generated markets (unique codes from 700) up to `n_dmas`
+
+    The filler markets are drawn when first needed rather than at import,
+    so they follow the run seed instead of whatever state NumPy had when
+    the module was loaded.
+    """
+    markets = list(DMA_DATA)
+    existing_codes = {d[0] for d in markets}
+    next_code = 700  # Start from 700 to avoid conflicts
+    while len(markets) < n_dmas:
+        code = str(next_code)
+        if code not in existing_codes:
+            dma_name = f"Market {code}"
+            pop = int(rng.uniform(100000, 800000))
+            markets.append((code, dma_name, pop))
+            existing_codes.add(code)
+        next_code += 1
+    return markets
 
 
 COMPETITOR_PROMOS = [
@@ -119,25 +125,29 @@ COMPETITOR_PROMOS = [
 ]
 
 
-def generate_competitive_landscape(n_dmas: int = 210) -> pd.DataFrame:
-    """Generate competitive landscape data for each DMA"""
+def generate_competitive_landscape(n_dmas: int = 210, time_axis: TimeAxis = None, rng=np.random) -> pd.DataFrame:
+    """Generate competitive landscape data for each DMA, as of `time_axis` (default: today)
+
+    `rng` is a numpy Generator or the legacy np.random module.
+    """
     
+    time_axis = time_axis or TimeAxis()
     print(f"  Generating {n_dmas:,} competitive landscape records...")
     
     records = []
     
-    for i, (dma_code, dma_name, base_subs) in enumerate(tqdm(DMA_DATA[:n_dmas], desc="  Competitive")):
+    for i, (dma_code, dma_name, base_subs) in enumerate(tqdm(dma_markets(n_dmas, rng)[:n_dmas], desc="  Competitive")):
         
         # Market size (based on DMA population)
-        total_subs = int(base_subs * np.random.uniform(0.8, 1.2))
-        avg_revenue_per_sub = np.random.uniform(55, 75)
+        total_subs = int(base_subs * rng.uniform(0.8, 1.2))
+        avg_revenue_per_sub = rng.uniform(55, 75)
         market_revenue = round(total_subs * avg_revenue_per_sub * 12 / 1e6, 2)  # Annual in millions
-        market_growth = round(np.random.normal(2.5, 2), 2)  # ~2.5% avg growth
+        market_growth = round(rng.normal(2.5, 2), 2)  # ~2.5% avg growth
         
         # Market share with variation
-        vz_share = round(max(15, min(40, CARRIER_MARKET_SHARE["Verizon"]["mean"] + np.random.normal(0, 5))), 2)
-        att_share = round(max(15, min(35, CARRIER_MARKET_SHARE["AT&T"]["mean"] + np.random.normal(0, 5))), 2)
-        tmo_share = round(max(15, min(35, CARRIER_MARKET_SHARE["T-Mobile"]["mean"] + np.random.normal(0, 4))), 2)
+        vz_share = round(max(15, min(40, CARRIER_MARKET_SHARE["Verizon"]["mean"] + rng.normal(0, 5))), 2)
+        att_share = round(max(15, min(35, CARRIER_MARKET_SHARE["AT&T"]["mean"] + rng.normal(0, 5))), 2)
+        tmo_share = round(max(15, min(35, CARRIER_MARKET_SHARE["T-Mobile"]["mean"] + rng.normal(0, 4))), 2)
         
         # Snowmobile share varies by market
         # Stronger in West/Mountain, weaker in some East Coast markets
@@ -148,42 +158,42 @@ def generate_competitive_landscape(n_dmas: int = 210) -> pd.DataFrame:
         else:
             snow_base = 18
         
-        snow_share = round(max(10, min(30, snow_base + np.random.normal(0, 4))), 2)
+        snow_share = round(max(10, min(30, snow_base + rng.normal(0, 4))), 2)
         
-        # Regional carriers get remainder
+        # Regional carriers get the remainder (at least 2%). When the big four
+        # leave less than that, shrink only their share above the 15/10 floors,
+        # so normalizing to 100% never pushes a carrier below its floor.
         total_big4 = vz_share + att_share + tmo_share + snow_share
-        regional_share = round(max(2, 100 - total_big4), 2)
-        
-        # Normalize to 100%
-        total = vz_share + att_share + tmo_share + snow_share + regional_share
-        factor = 100 / total
-        vz_share = round(vz_share * factor, 2)
-        att_share = round(att_share * factor, 2)
-        tmo_share = round(tmo_share * factor, 2)
-        snow_share = round(snow_share * factor, 2)
+        if total_big4 > 98:
+            floors = 15 + 15 + 15 + 10
+            factor = 1 - (total_big4 - 98) / (total_big4 - floors)
+            vz_share = round(15 + (vz_share - 15) * factor, 2)
+            att_share = round(15 + (att_share - 15) * factor, 2)
+            tmo_share = round(15 + (tmo_share - 15) * factor, 2)
+            snow_share = round(10 + (snow_share - 10) * factor, 2)
         regional_share = round(100 - vz_share - att_share - tmo_share - snow_share, 2)
         
         # Subscriber counts
         snow_subs = int(total_subs * snow_share / 100)
         
         # NPS scores
-        snow_nps = int(np.random.normal(32, 8))  # Slightly above avg
-        vz_nps = int(np.random.normal(28, 10))
-        att_nps = int(np.random.normal(22, 10))
-        tmo_nps = int(np.random.normal(35, 12))  # T-Mobile often higher
+        snow_nps = int(rng.normal(32, 8))  # Slightly above avg
+        vz_nps = int(rng.normal(28, 10))
+        att_nps = int(rng.normal(22, 10))
+        tmo_nps = int(rng.normal(35, 12))  # T-Mobile often higher
         
         # Coverage
-        snow_coverage = round(max(85, min(99, 96 + np.random.normal(0, 3))), 2)
-        snow_5g = round(max(60, min(95, 82 + np.random.normal(0, 8))), 2)
-        vz_coverage = round(max(90, min(99, 97 + np.random.normal(0, 2))), 2)
-        att_coverage = round(max(88, min(99, 96 + np.random.normal(0, 2))), 2)
-        tmo_coverage = round(max(85, min(99, 95 + np.random.normal(0, 3))), 2)
+        snow_coverage = round(max(85, min(99, 96 + rng.normal(0, 3))), 2)
+        snow_5g = round(max(60, min(95, 82 + rng.normal(0, 8))), 2)
+        vz_coverage = round(max(90, min(99, 97 + rng.normal(0, 2))), 2)
+        att_coverage = round(max(88, min(99, 96 + rng.normal(0, 2))), 2)
+        tmo_coverage = round(max(85, min(99, 95 + rng.normal(0, 3))), 2)
         
         # Pricing
-        vz_price = round(CARRIER_AVG_PRICE["Verizon"]["mean"] + np.random.normal(0, 5), 2)
-        att_price = round(CARRIER_AVG_PRICE["AT&T"]["mean"] + np.random.normal(0, 5), 2)
-        tmo_price = round(CARRIER_AVG_PRICE["T-Mobile"]["mean"] + np.random.normal(0, 5), 2)
-        regional_price = round(CARRIER_AVG_PRICE["Regional"]["mean"] + np.random.normal(0, 8), 2)
+        vz_price = round(CARRIER_AVG_PRICE["Verizon"]["mean"] + rng.normal(0, 5), 2)
+        att_price = round(CARRIER_AVG_PRICE["AT&T"]["mean"] + rng.normal(0, 5), 2)
+        tmo_price = round(CARRIER_AVG_PRICE["T-Mobile"]["mean"] + rng.normal(0, 5), 2)
+        regional_price = round(CARRIER_AVG_PRICE["Regional"]["mean"] + rng.normal(0, 8), 2)
         
         # Market concentration (HHI)
         hhi = round((vz_share**2 + att_share**2 + tmo_share**2 + snow_share**2 + regional_share**2) / 100, 2)
@@ -197,9 +207,9 @@ def generate_competitive_landscape(n_dmas: int = 210) -> pd.DataFrame:
             price_war = "Low"
         
         # Competitor promo
-        if np.random.random() < 0.7:  # 70% of markets have active promo
-            promo = np.random.choice(COMPETITOR_PROMOS)
-            promo_end = date.today() + timedelta(days=np.random.randint(7, 60))
+        if rng.random() < 0.7:  # 70% of markets have active promo
+            promo = rng.choice(COMPETITOR_PROMOS)
+            promo_end = time_axis.days_after(7 + int(rng.random() * 53))
         else:
             promo = None
             promo_end = None
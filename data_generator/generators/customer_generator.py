@@ -1,330 +1,347 @@
 """
 Snowmobile Wireless - Customer Generator
 Generates synthetic customer master data
+
+Columns are drawn for the whole population at once as NumPy arrays; the
+conditional rules (plan by age, device by plan, ...) are applied as masks.
 """
 
-import uuid
-from datetime import date, timedelta
+from typing import Iterator
 import numpy as np
 import pandas as pd
-from tqdm import tqdm
-from faker import Faker
-
-import sys
-sys.path.append('..')
-from config import (
-    STATE_DISTRIBUTION, REGION_MAPPING, AGE_DISTRIBUTION, GENDER_DISTRIBUTION,
-    ACQUISITION_CHANNEL_DISTRIBUTION, PLAN_CONFIG, CONTRACT_TYPE_WEIGHTS,
-    DEVICE_BRANDS, CHURN_RISK_WEIGHTS
+
+from config import AGE_DISTRIBUTION, PLAN_CONFIG, DEVICE_BRANDS, CUSTOMER_CONFIG, PLAN_AGE_BANDS
+from .churn_model import score_churn_risk, churn_noise
+from .geo_sampler import GeoSampler
+from .time_axis import TimeAxis
+from .ids import random_uuids
+from .streams import BLOCK_SIZE, block_rng, block_ranges, resolve_seed
+from .distributions import (
+    CompiledDistribution, sample_grouped, assign_bands, plan_groups, AGE_BUCKET_MIX, GENDER_MIX,
+    ACQUISITION_CHANNEL_MIX, DEVICE_TIER_MIX, PLAN_BY_AGE, DEVICE_BRAND_BY_PLAN,
+    PAYMENT_METHOD_BY_PLAN, CREDIT_CLASS_BY_PLAN
 )
 
-# Initialize Faker
-fake = Faker('en_US')
-Faker.seed(42)
+
+PLAN_NAMES = list(PLAN_CONFIG.keys())
+
+# Rewards tier and churn reason mixes (plan, device, payment and credit
+# tables are conditional tables in config.py)
+REWARDS_TIER_MIX = {
+    "Veteran": CompiledDistribution({"Gold": 0.6, "Platinum": 0.4}),
+    "Established": CompiledDistribution({"Silver": 0.7, "Gold": 0.3}),
+    "New": CompiledDistribution({"Bronze": 0.8, "Silver": 0.2}),
+}
+CHURN_REASON_MIX = CompiledDistribution({"Price": 0.35, "Service Quality": 0.20, "Competitor Offer": 0.25,
+                                         "Coverage": 0.10, "Support Experience": 0.10})
 
 
-def weighted_choice(distribution: dict) -> str:
-    """Select from distribution based on weights (auto-normalizes)"""
-    items = list(distribution.keys())
-    weights = np.array(list(distribution.values()), dtype=float)
-    weights = weights / weights.sum()  # Normalize to ensure sum = 1
-    return np.random.choice(items, p=weights)
+def uniform_int(low: np.ndarray, high: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Per-row integer in [low, high) with array bounds"""
+    low = np.asarray(low)
+    span = np.asarray(high) - low
+    return low + (rng.random(np.broadcast(low, span).shape) * span).astype(np.int64)
 
 
-def generate_age(age_dist: dict) -> int:
-    """Generate age based on distribution"""
-    bucket = weighted_choice({k: v["pct"] for k, v in age_dist.items()})
-    return np.random.randint(age_dist[bucket]["min"], age_dist[bucket]["max"] + 1)
+def generate_age(size: int, rng: np.random.Generator) -> np.ndarray:
+    """Generate ages based on distribution"""
+    bucket = AGE_BUCKET_MIX.sample_codes(size, rng)
+    mins = np.array([v["min"] for v in AGE_DISTRIBUTION.values()])[bucket]
+    maxs = np.array([v["max"] for v in AGE_DISTRIBUTION.values()])[bucket]
+    return uniform_int(mins, maxs + 1, rng)
 
 
-def generate_tenure() -> int:
+def generate_tenure(size: int, rng: np.random.Generator) -> np.ndarray:
     """Generate customer tenure in months (exponential distribution)"""
     # Most customers are newer, fewer are long-tenured
-    tenure = int(np.random.exponential(24))  # Mean of 24 months
-    return min(max(tenure, 1), 120)  # Cap at 10 years
+    tenure = rng.exponential(24, size).astype(np.int64)  # Mean of 24 months
+    return np.clip(tenure, 1, 120)  # Cap at 10 years
 
 
-def generate_device(plan_name: str) -> dict:
-    """Generate device based on plan type"""
+def generate_device(plan_name: np.ndarray, rng: np.random.Generator) -> dict:
+    """Generate device columns based on plan type"""
+    n = len(plan_name)
+
     # Premium plans more likely to have flagship devices
-    if plan_name in ['Summit', 'Blizzard']:
-        device_weights = {
-            "Apple": 0.60, "Samsung": 0.25, "Google": 0.08,
-            "Motorola": 0.04, "OnePlus": 0.02, "Other": 0.01
-        }
-    elif plan_name == 'Glacier':
-        device_weights = {
-            "Apple": 0.30, "Samsung": 0.35, "Google": 0.05,
-            "Motorola": 0.15, "OnePlus": 0.02, "Other": 0.13
-        }
-    else:
-        device_weights = {k: v["weight"] for k, v in DEVICE_BRANDS.items()}
-    
-    brand = weighted_choice(device_weights)
-    brand_info = DEVICE_BRANDS[brand]
-    
-    model = np.random.choice(brand_info["models"])
-    tier = weighted_choice(brand_info["tiers"])
-    
+    brand = DEVICE_BRAND_BY_PLAN.sample(plan_groups(plan_name), rng)
+
+    model = np.empty(n, dtype=object)
+    device_os = np.empty(n, dtype=object)
+    for brand_name, brand_info in DEVICE_BRANDS.items():
+        mask = brand == brand_name
+        models = np.array(brand_info["models"], dtype=object)
+        model[mask] = models[rng.integers(0, len(models), int(mask.sum()))]
+        device_os[mask] = brand_info["os"]
+    tier = sample_grouped(brand, DEVICE_TIER_MIX, rng)
+
     # 5G capable based on tier and model recency
-    is_5g = tier == "Flagship" or (tier == "Mid" and np.random.random() < 0.6)
-    
+    is_5g = (tier == "Flagship") | ((tier == "Mid") & (rng.random(n) < 0.6))
+
     return {
         "brand": brand,
         "model": model,
         "tier": tier,
-        "os": brand_info["os"],
+        "os": device_os,
         "is_5g": is_5g,
-        "age_months": np.random.randint(1, 36)
+        "age_months": rng.integers(1, 36, n),
     }
 
 
-def calculate_churn_risk(tenure: int, complaints: int, plan: str, 
-                         price_sensitivity: float, competition_intensity: str) -> float:
-    """Calculate churn risk score based on multiple factors"""
-    risk = CHURN_RISK_WEIGHTS["base_risk"]
-    
-    # Tenure factor (longer tenure = lower risk)
-    risk += CHURN_RISK_WEIGHTS["tenure_factor"] * tenure
-    
-    # Complaints factor
-    risk += CHURN_RISK_WEIGHTS["complaint_factor"] * complaints
-    
-    # Competition intensity
-    if competition_intensity == "High":
-        risk += CHURN_RISK_WEIGHTS["competitor_intensity_factor"]
-    
-    # Price sensitivity
-    risk += CHURN_RISK_WEIGHTS["price_sensitivity_factor"] * price_sensitivity
-    
-    # Plan factor (prepaid higher risk)
-    if plan == "Glacier":
-        risk += 0.10
-    
-    # Add some randomness
-    risk += np.random.normal(0, 0.05)
-    
-    return max(0.01, min(0.99, risk))
-
-
-def generate_customers(n_records: int, zip_df: pd.DataFrame, 
-                       lifestyle_df: pd.DataFrame, competitive_df: pd.DataFrame) -> pd.DataFrame:
-    """Generate synthetic customer data"""
-    
-    print(f"  Generating {n_records:,} customer records...")
-    
-    # Pre-compute ZIP code list and DMA mappings
-    zip_codes = zip_df['zip_code'].tolist()
-    zip_to_state = dict(zip(zip_df['zip_code'], zip_df['state_code']))
-    zip_to_dma = dict(zip(zip_df['zip_code'], zip_df['dma_code']))
-    
-    # Get lifestyle data for price sensitivity
-    zip_to_price_sens = dict(zip(lifestyle_df['zip_code'], lifestyle_df['price_sensitivity_index']))
-    
-    # Get competition intensity by DMA
-    dma_to_competition = dict(zip(competitive_df['dma_code'], competitive_df['price_war_intensity']))
-    
-    records = []
-    
-    for _ in tqdm(range(n_records), desc="  Customers"):
-        customer_id = str(uuid.uuid4())
-        account_id = f"SNM{np.random.randint(10000000, 99999999)}"
-        
-        # Location - weighted by state population
-        state = weighted_choice(STATE_DISTRIBUTION)
-        # Get ZIP codes for this state
-        state_zips = zip_df[zip_df['state_code'] == state]['zip_code'].tolist()
-        if state_zips:
-            zip_code = np.random.choice(state_zips)
-        else:
-            zip_code = np.random.choice(zip_codes)
-        
-        dma_code = zip_to_dma.get(zip_code, "500")
-        
-        # Demographics
-        age = generate_age(AGE_DISTRIBUTION)
-        gender = weighted_choice(GENDER_DISTRIBUTION)
-        
-        # Tenure and dates
-        tenure_months = generate_tenure()
-        customer_since = date.today() - timedelta(days=tenure_months * 30)
-        
-        # Acquisition channel
-        acquisition_channel = weighted_choice(ACQUISITION_CHANNEL_DISTRIBUTION)
-        
-        # Plan selection (influenced by age and tenure)
-        if age >= 55:
-            plan_weights = {"Glacier": 0.10, "Flurry": 0.25, "Powder": 0.35, 
-                          "Blizzard": 0.15, "Avalanche": 0.08, "Summit": 0.07}
-        elif age <= 28:
-            plan_weights = {"Glacier": 0.15, "Flurry": 0.10, "Powder": 0.30,
-                          "Blizzard": 0.30, "Avalanche": 0.05, "Summit": 0.10}
-        else:
-            plan_weights = {k: v["weight"] for k, v in PLAN_CONFIG.items()}
-        
-        plan_name = weighted_choice(plan_weights)
-        plan_info = PLAN_CONFIG[plan_name]
-        
-        # Lines on account
-        if plan_name == "Avalanche":
-            lines = np.random.randint(plan_info.get("min_lines", 3), 
-                                     plan_info.get("max_lines", 6) + 1)
-        elif age >= 35 and age <= 55 and np.random.random() < 0.3:
-            lines = np.random.randint(2, 5)
-        else:
-            lines = 1
-        
-        # Contract type
-        contract_type = np.random.choice(
-            plan_info["contract_types"],
-            p=[1/len(plan_info["contract_types"])] * len(plan_info["contract_types"])
-        )
-        
-        # Contract end date
-        if contract_type in ["12M", "24M"]:
-            months = 12 if contract_type == "12M" else 24
-            contract_end = date.today() + timedelta(days=np.random.randint(0, months * 30))
-        elif contract_type == "DevicePayment":
-            contract_end = date.today() + timedelta(days=np.random.randint(0, 24 * 30))
-        else:
-            contract_end = None
-        
-        # Device
-        device = generate_device(plan_name)
-        
-        # Financial
-        arpu_range = plan_info["typical_arpu_range"]
-        monthly_arpu = round(np.random.uniform(arpu_range[0], arpu_range[1]), 2)
-        if lines > 1:
-            monthly_arpu = round(monthly_arpu * (1 + 0.6 * (lines - 1)), 2)
-        
-        lifetime_value = round(monthly_arpu * tenure_months * 0.85, 2)
-        total_revenue_12m = round(monthly_arpu * min(12, tenure_months), 2)
-        
-        # Payment method
-        payment_weights = {"AutoPay": 0.55, "Card": 0.25, "Manual": 0.15, "Cash": 0.05}
-        if plan_name == "Glacier":
-            payment_weights = {"AutoPay": 0.30, "Card": 0.30, "Manual": 0.25, "Cash": 0.15}
-        payment_method = weighted_choice(payment_weights)
-        autopay = payment_method == "AutoPay" or (payment_method == "Card" and np.random.random() < 0.5)
-        paperless = autopay or np.random.random() < 0.6
-        
-        # Credit class
-        credit_weights = {"A": 0.40, "B": 0.30, "C": 0.20, "D": 0.10}
-        if plan_name in ["Summit", "Blizzard"]:
-            credit_weights = {"A": 0.55, "B": 0.30, "C": 0.12, "D": 0.03}
-        elif plan_name == "Glacier":
-            credit_weights = {"A": 0.20, "B": 0.30, "C": 0.30, "D": 0.20}
-        credit_class = weighted_choice(credit_weights)
-        
-        # Add-ons
-        has_protection = np.random.random() < (0.4 if device["tier"] == "Flagship" else 0.15)
-        has_roaming = np.random.random() < 0.08
-        has_streaming = plan_name in ["Summit", "Blizzard"] and np.random.random() < 0.25
-        
-        # Loyalty
-        rewards_member = tenure_months >= 6 and np.random.random() < 0.65
-        if rewards_member:
-            if tenure_months >= 48 and monthly_arpu >= 70:
-                rewards_tier = np.random.choice(["Gold", "Platinum"], p=[0.6, 0.4])
-            elif tenure_months >= 24:
-                rewards_tier = np.random.choice(["Silver", "Gold"], p=[0.7, 0.3])
-            else:
-                rewards_tier = np.random.choice(["Bronze", "Silver"], p=[0.8, 0.2])
-            rewards_points = np.random.randint(100, 10000)
-        else:
-            rewards_tier = None
-            rewards_points = 0
-        
-        # Engagement
-        app_user = np.random.random() < (0.8 if age <= 45 else 0.5)
-        app_engagement = round(np.random.beta(2, 3), 2) if app_user else 0
-        last_app_login = date.today() - timedelta(days=np.random.randint(0, 90)) if app_user else None
-        
-        # NPS
-        nps_response = np.random.random() < 0.15  # 15% survey response rate
-        if nps_response:
-            # Skewed towards promoters for this company
-            nps_score = int(np.random.choice(
-                range(-100, 101),
-                p=np.array([0.1 if i < 0 else (0.3 if i <= 30 else 0.6) 
-                           for i in range(-100, 101)]) / sum([0.1 if i < 0 else (0.3 if i <= 30 else 0.6) 
-                                                              for i in range(-100, 101)])
-            ))
-            # Simpler approach
-            nps_score = int(np.random.normal(30, 35))
-            nps_score = max(-100, min(100, nps_score))
-            nps_date = date.today() - timedelta(days=np.random.randint(0, 180))
-        else:
-            nps_score = None
-            nps_date = None
-        
-        # Complaints
-        complaint_count = int(np.random.exponential(0.5))
-        complaint_count = min(complaint_count, 10)
-        
-        # Churn risk
-        price_sensitivity = zip_to_price_sens.get(zip_code, 50)
-        competition = dma_to_competition.get(dma_code, "Medium")
-        churn_risk = calculate_churn_risk(tenure_months, complaint_count, plan_name,
-                                          price_sensitivity, competition)
-        
-        # Predicted churn reason
-        if churn_risk > 0.5:
-            reasons = ["Price", "Service Quality", "Competitor Offer", "Coverage", "Support Experience"]
-            predicted_reason = np.random.choice(reasons, p=[0.35, 0.20, 0.25, 0.10, 0.10])
-        else:
-            predicted_reason = None
-        
-        record = {
-            "customer_id": customer_id,
-            "account_id": account_id,
-            "zip_code": zip_code,
-            "state_code": state,
-            "dma_code": dma_code,
-            "age": age,
-            "gender": gender,
-            "customer_since": customer_since,
-            "tenure_months": tenure_months,
-            "acquisition_channel": acquisition_channel,
-            "plan_name": plan_name,
-            "plan_category": plan_info["category"],
-            "plan_price": plan_info["price"],
-            "lines_on_account": lines,
-            "contract_type": contract_type,
-            "contract_end_date": contract_end,
-            "device_brand": device["brand"],
-            "device_model": device["model"],
-            "device_tier": device["tier"],
-            "device_os": device["os"],
-            "device_age_months": device["age_months"],
-            "is_5g_capable": device["is_5g"],
-            "monthly_arpu": monthly_arpu,
-            "lifetime_value": lifetime_value,
-            "total_revenue_12m": total_revenue_12m,
-            "payment_method": payment_method,
-            "autopay_enrolled": autopay,
-            "paperless_billing": paperless,
-            "credit_class": credit_class,
-            "has_device_protection": has_protection,
-            "has_intl_roaming": has_roaming,
-            "has_streaming_bundle": has_streaming,
-            "rewards_member": rewards_member,
-            "rewards_tier": rewards_tier,
-            "rewards_points_balance": rewards_points,
-            "app_user": app_user,
-            "app_engagement_score": app_engagement,
-            "last_app_login": last_app_login,
-            "nps_score": nps_score,
-            "nps_survey_date": nps_date,
-            "churn_risk_score": round(churn_risk, 2),
-            "predicted_churn_reason": predicted_reason,
-            "complaint_count_12m": complaint_count,
-        }
-        records.append(record)
-    
-    df = pd.DataFrame(records)
-    print(f"  ✓ Generated {len(df):,} customers")
+def _generate_customer_block(n: int, rng: np.random.Generator, time_axis: TimeAxis, geo: GeoSampler,
+                             zip_price_sens: np.ndarray, dma_to_competition: dict) -> pd.DataFrame:
+    """Generate one block of `n` customers from its own random stream"""
+
+    customer_id, customer_key = random_uuids(n, rng, surrogate=True)
+    account_id = np.char.add("SNM", rng.integers(10000000, 99999999, n).astype(str))
+
+    # Location - weighted by state population
+    state, zip_pos = geo.sample(n, rng)
+    zip_code = geo.zip_codes[zip_pos]
+    dma_code = geo.dma_codes[zip_pos]
+
+    # Demographics
+    age = generate_age(n, rng)
+    gender = GENDER_MIX.sample(n, rng)
+
+    # Tenure and dates
+    tenure_months = generate_tenure(n, rng)
+    customer_since = time_axis.days_before(tenure_months * 30)
+
+    # Acquisition channel
+    acquisition_channel = ACQUISITION_CHANNEL_MIX.sample(n, rng)
+
+    # Plan selection (influenced by age and tenure)
+    plan_name = PLAN_BY_AGE.sample(assign_bands(age, PLAN_AGE_BANDS), rng)
+    plan_group = plan_groups(plan_name)
+    plan_frame = pd.DataFrame.from_dict(PLAN_CONFIG, orient='index')
+    plan_category = plan_frame["category"].reindex(plan_name).to_numpy()
+    plan_price = plan_frame["price"].reindex(plan_name).to_numpy()
+
+    # Lines on account
+    avalanche = plan_name == "Avalanche"
+    family_age = (age >= 35) & (age <= 55) & (rng.random(n) < 0.3)
+    lines = np.where(
+        avalanche,
+        rng.integers(PLAN_CONFIG["Avalanche"].get("min_lines", 3),
+                     PLAN_CONFIG["Avalanche"].get("max_lines", 6) + 1, n),
+        np.where(family_age, rng.integers(2, 5, n), 1)
+    )
+
+    # Contract type (uniform over the plan's allowed contracts)
+    contract_type = np.empty(n, dtype=object)
+    contract_draw = rng.random(n)
+    for name, plan_info in PLAN_CONFIG.items():
+        mask = plan_name == name
+        options = np.array(plan_info["contract_types"], dtype=object)
+        contract_type[mask] = options[(contract_draw[mask] * len(options)).astype(np.int64)]
+
+    # Contract end date
+    contract_months = np.select(
+        [contract_type == "12M", np.isin(contract_type, ["24M", "DevicePayment"])],
+        [12, 24], 0
+    )
+    contract_end = time_axis.days_after(uniform_int(0, np.maximum(contract_months, 1) * 30, rng))
+    contract_end[contract_months == 0] = np.datetime64('NaT')
+
+    # Device
+    device = generate_device(plan_name, rng)
+
+    # Financial
+    arpu_range = np.array([PLAN_CONFIG[p]["typical_arpu_range"] for p in PLAN_NAMES], dtype=float)
+    plan_idx = pd.Index(PLAN_NAMES).get_indexer(plan_name)
+    monthly_arpu = np.round(rng.uniform(arpu_range[plan_idx, 0], arpu_range[plan_idx, 1]), 2)
+    monthly_arpu = np.where(lines > 1, np.round(monthly_arpu * (1 + 0.6 * (lines - 1)), 2), monthly_arpu)
+
+    lifetime_value = np.round(monthly_arpu * tenure_months * 0.85, 2)
+    total_revenue_12m = np.round(monthly_arpu * np.minimum(12, tenure_months), 2)
+
+    # Payment method
+    payment_method = PAYMENT_METHOD_BY_PLAN.sample(plan_group, rng)
+    autopay = (payment_method == "AutoPay") | ((payment_method == "Card") & (rng.random(n) < 0.5))
+    paperless = autopay | (rng.random(n) < 0.6)
+
+    # Credit class
+    credit_class = CREDIT_CLASS_BY_PLAN.sample(plan_group, rng)
+
+    # Add-ons
+    has_protection = rng.random(n) < np.where(device["tier"] == "Flagship", 0.4, 0.15)
+    has_roaming = rng.random(n) < 0.08
+    has_streaming = np.isin(plan_name, ["Summit", "Blizzard"]) & (rng.random(n) < 0.25)
+
+    # Loyalty
+    rewards_member = (tenure_months >= 6) & (rng.random(n) < 0.65)
+    rewards_group = np.where(~rewards_member, "None",
+                             np.where((tenure_months >= 48) & (monthly_arpu >= 70), "Veteran",
+                                      np.where(tenure_months >= 24, "Established", "New")))
+    rewards_tier = sample_grouped(rewards_group, REWARDS_TIER_MIX, rng)
+    rewards_points = np.where(rewards_member, rng.integers(100, 10000, n), 0)
+
+    # Engagement
+    app_user = rng.random(n) < np.where(age <= 45, 0.8, 0.5)
+    app_engagement = np.where(app_user, np.round(rng.beta(2, 3, n), 2), 0)
+    last_app_login = time_axis.days_before(rng.integers(0, 90, n))
+    last_app_login[~app_user] = np.datetime64('NaT')
+
+    # NPS (15% survey response rate, skewed towards promoters)
+    nps_response = rng.random(n) < 0.15
+    nps_score = np.clip(rng.normal(30, 35, n).astype(np.int64), -100, 100).astype(float)
+    nps_score[~nps_response] = np.nan
+    nps_date = time_axis.days_before(rng.integers(0, 180, n))
+    nps_date[~nps_response] = np.datetime64('NaT')
+
+    # Complaints
+    complaint_count = np.minimum(rng.exponential(0.5, n).astype(np.int64), 10)
+
+    # Churn risk
+    price_sensitivity = zip_price_sens[zip_pos]
+    competition = pd.Series(dma_code).map(dma_to_competition).fillna("Medium").to_numpy(dtype=object)
+    churn_risk = score_churn_risk(tenure_months, complaint_count, plan_name,
+                                  price_sensitivity, competition, noise=churn_noise(n, rng))
+
+    # Predicted churn reason
+    predicted_reason = np.where(churn_risk > 0.5, CHURN_REASON_MIX.sample(n, rng), None)
+
+    df = pd.DataFrame({
+        "customer_id": customer_id,
+        "account_id": account_id,
+        "zip_code": zip_code,
+        "state_code": state,
+        "dma_code": dma_code,
+        "age": age,
+        "gender": gender,
+        "customer_since": customer_since,
+        "tenure_months": tenure_months,
+        "acquisition_channel": acquisition_channel,
+        "plan_name": plan_name,
+        "plan_category": plan_category,
+        "plan_price": plan_price,
+        "lines_on_account": lines,
+        "contract_type": contract_type,
+        "contract_end_date": contract_end,
+        "device_brand": device["brand"],
+        "device_model": device["model"],
+        "device_tier": device["tier"],
+        "device_os": device["os"],
+        "device_age_months": device["age_months"],
+        "is_5g_capable": device["is_5g"],
+        "monthly_arpu": monthly_arpu,
+        "lifetime_value": lifetime_value,
+        "total_revenue_12m": total_revenue_12m,
+        "payment_method": payment_method,
+        "autopay_enrolled": autopay,
+        "paperless_billing": paperless,
+        "credit_class": credit_class,
+        "has_device_protection": has_protection,
+        "has_intl_roaming": has_roaming,
+        "has_streaming_bundle": has_streaming,
+        "rewards_member": rewards_member,
+        "rewards_tier": rewards_tier,
+        "rewards_points_balance": rewards_points,
+        "app_user": app_user,
+        "app_engagement_score": app_engagement,
+        "last_app_login": last_app_login,
+        "nps_score": nps_score,
+        "nps_survey_date": nps_date,
+        "churn_risk_score": np.round(churn_risk, 2),
+        "predicted_churn_reason": predicted_reason,
+        "complaint_count_12m": complaint_count,
+    })
+    if CUSTOMER_CONFIG.get("surrogate_keys"):
+        df["customer_key"] = customer_key
     return df
 
 
+def _customer_lookups(zip_df: pd.DataFrame, lifestyle_df: pd.DataFrame,
+                      competitive_df: pd.DataFrame, geo: GeoSampler = None,
+                      time_axis: TimeAxis = None) -> dict:
+    """Per-run lookups shared by every customer block"""
+    # Indexed state -> ZIP lookup
+    if geo is None:
+        geo = GeoSampler(zip_df)
+
+    return {
+        "time_axis": time_axis or TimeAxis(),
+        "geo": geo,
+        # Lifestyle price sensitivity, aligned to sampler ZIP order
+        "zip_price_sens": geo.align(
+            lifestyle_df.set_index('zip_code')['price_sensitivity_index'], default=50
+        ).astype(float),
+        # Competition intensity by DMA
+        "dma_to_competition": dict(zip(competitive_df['dma_code'], competitive_df['price_war_intensity'])),
+    }
+
+
+def _iter_customer_blocks(seed: int, start: int, stop: int, lookups: dict) -> Iterator[pd.DataFrame]:
+    """Yield the customer blocks covering global rows [start, stop)"""
+    for block, first, last in block_ranges(stop - start):
+        block += start // BLOCK_SIZE
+        yield _generate_customer_block(last - first, block_rng(seed, "customers", block), **lookups)
+
+
+def generate_customer_range(start: int, stop: int, zip_df: pd.DataFrame,
+                            lifestyle_df: pd.DataFrame, competitive_df: pd.DataFrame,
+                            geo: GeoSampler = None, seed: int = None,
+                            time_axis: TimeAxis = None) -> pd.DataFrame:
+    """Generate the customers at global rows [start, stop) of a seeded run
+
+    `start` must be a multiple of BLOCK_SIZE. Shards built this way
+    concatenate to exactly the rows a single generate_customers call with
+    the same seed produces.
+    """
+    if start % BLOCK_SIZE:
+        raise ValueError(f"start must be a multiple of BLOCK_SIZE ({BLOCK_SIZE:,})")
+    lookups = _customer_lookups(zip_df, lifestyle_df, competitive_df, geo, time_axis)
+    blocks = list(_iter_customer_blocks(resolve_seed(seed), start, stop, lookups))
+    return pd.concat(blocks, ignore_index=True) if blocks else pd.DataFrame()
+
+
+def iter_customer_chunks(n_records: int, zip_df: pd.DataFrame,
+                         lifestyle_df: pd.DataFrame, competitive_df: pd.DataFrame,
+                         geo: GeoSampler = None, seed: int = None,
+                         chunk_size: int = CUSTOMER_CONFIG["chunk_size"],
+                         time_axis: TimeAxis = None) -> Iterator[pd.DataFrame]:
+    """Yield customers in DataFrames of `chunk_size` rows (the last may be shorter)
+
+    Rows are drawn in fixed RNG blocks (see streams.py) and re-sliced into
+    chunks, so the concatenated output for a given seed is identical for
+    any chunk size. Peak memory is about one chunk plus one block.
+    `geo` is the shared state -> ZIP sampler; it is built from `zip_df`
+    when not supplied. Dates are relative to `time_axis` (default: today).
+    """
+    lookups = _customer_lookups(zip_df, lifestyle_df, competitive_df, geo, time_axis)
+
+    pending = []
+    pending_rows = 0
+    produced = 0
+    for block_df in _iter_customer_blocks(resolve_seed(seed), 0, n_records, lookups):
+        pending.append(block_df)
+        pending_rows += len(block_df)
+        produced += len(block_df)
+
+        while pending_rows >= chunk_size or (produced == n_records and pending_rows):
+            buffered = pd.concat(pending, ignore_index=True) if len(pending) > 1 else pending[0]
+            yield buffered.iloc[:chunk_size].reset_index(drop=True)
+            rest = buffered.iloc[chunk_size:]
+            pending = [rest] if len(rest) else []
+            pending_rows = len(rest)
+
+
+def generate_customers(n_records: int, zip_df: pd.DataFrame,
+                       lifestyle_df: pd.DataFrame, competitive_df: pd.DataFrame,
+                       geo: GeoSampler = None, seed: int = None,
+                       time_axis: TimeAxis = None) -> pd.DataFrame:
+    """Generate synthetic customer data
+
+    `geo` is the shared state -> ZIP sampler; it is built from `zip_df`
+    when not supplied. `seed` selects the random streams; without it one
+    is derived from the global NumPy state.
+    """
+
+    print(f"  Generating {n_records:,} customer records...")
+
+    chunks = iter_customer_chunks(n_records, zip_df, lifestyle_df, competitive_df,
+                                  geo=geo, seed=seed, chunk_size=max(n_records, 1),
+                                  time_axis=time_axis)
+    df = pd.concat(chunks, ignore_index=True) if n_records else pd.DataFrame()
+    print(f"  ✓ Generated {len(df):,} customers")
+    return df
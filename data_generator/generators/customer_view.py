@@ -0,0 +1,49 @@
+"""
+Snowmobile Wireless - Customer View
+Struct-of-arrays hand-off of the customer table to downstream generators
+"""
+
+import numpy as np
+
+from .column_view import ColumnView
+
+
+# Customer fields read by the usage, interaction and campaign generators
+VIEW_COLUMNS = {
+    "customer_id": object,
+    "age": np.int64,
+    "tenure_months": np.int64,
+    "plan_name": object,
+    "lines_on_account": np.int64,
+    "monthly_arpu": np.float64,
+    "churn_risk_score": np.float64,
+    "credit_class": object,
+    "is_5g_capable": bool,
+    "has_intl_roaming": bool,
+    "has_device_protection": bool,
+    "has_streaming_bundle": bool,
+    "autopay_enrolled": bool,
+    "app_user": bool,
+}
+
+
+class CustomerView(ColumnView):
+    """Typed, column-per-array view of (a slice of) the customer table
+
+    Built once per customer table and shared by every downstream generator;
+    slicing returns numpy views, so a block of customers costs no copies
+    and no per-customer Python objects. `get` mirrors dict.get: a column
+    absent from the source table reads as `default` for every customer.
+    """
+
+    COLUMNS = VIEW_COLUMNS
+
+    def with_columns(self, **columns) -> "CustomerView":
+        """Copy of the view with some columns replaced (e.g. advanced tenure)"""
+        return CustomerView({**self.columns, **columns}, self.n)
+
+    def slice(self, first: int, stop: int) -> "CustomerView":
+        """Customers [first, stop) as a view onto the same arrays"""
+        stop = min(stop, self.n)
+        return CustomerView({name: values[first:stop] for name, values in self.columns.items()},
+                            max(0, stop - first))
@@ -0,0 +1,145 @@
+"""
+Snowmobile Wireless - Compiled Distributions
+Categorical distributions from config.py, normalized once into alias tables
+"""
+
+import numpy as np
+import pandas as pd
+
+from config import (
+    STATE_DISTRIBUTION, URBAN_RURAL_DISTRIBUTION, AGE_DISTRIBUTION, GENDER_DISTRIBUTION,
+    ACQUISITION_CHANNEL_DISTRIBUTION, DEVICE_BRANDS, CAMPAIGN_CHANNELS, LIFESTYLE_BY_GEOGRAPHY,
+    PLAN_GROUPS, PLAN_BY_AGE_BAND, DEVICE_BRAND_BY_PLAN_GROUP, PAYMENT_METHOD_BY_PLAN_GROUP,
+    CREDIT_CLASS_BY_PLAN_GROUP, PAYMENT_STATUS_BY_CREDIT_CLASS, SUPPORT_CHANNEL_BY_AGE_BAND,
+    SUPPORT_CATEGORY_BY_SEGMENT, CAMPAIGN_TYPE_BY_SEGMENT, COMPLAINT_SENTIMENT,
+    CSAT_BY_SENTIMENT_BAND, RESOLUTION_BY_CATEGORY_GROUP
+)
+
+
+class CompiledDistribution:
+    """Categorical distribution with Vose alias tables
+
+    Weights are normalized once at construction; every draw afterwards is
+    two uniforms (column + coin flip), independent of the number of
+    categories. `rng` is a numpy Generator or the legacy np.random module.
+    """
+
+    def __init__(self, weights: dict):
+        self.labels = np.array(list(weights.keys()), dtype=object)
+        p = np.array(list(weights.values()), dtype=float)
+        if len(p) == 0 or p.sum() <= 0:
+            raise ValueError("distribution needs at least one positive weight")
+        self.p = p / p.sum()
+        self.prob, self.alias = self._build_alias(self.p)
+
+    @staticmethod
+    def _build_alias(p: np.ndarray):
+        """Vose's alias method: O(k) table build for k categories"""
+        k = len(p)
+        scaled = p * k
+        prob = np.ones(k)
+        alias = np.arange(k)
+        small = [i for i in range(k) if scaled[i] < 1.0]
+        large = [i for i in range(k) if scaled[i] >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        return prob, alias
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def sample_codes(self, n: int, rng=np.random) -> np.ndarray:
+        """Draw `n` category indices"""
+        column = (rng.random(n) * len(self.labels)).astype(np.int64)
+        accept = rng.random(n) < self.prob[column]
+        return np.where(accept, column, self.alias[column])
+
+    def sample(self, n: int, rng=np.random) -> np.ndarray:
+        """Draw `n` labels"""
+        return self.labels[self.sample_codes(n, rng)]
+
+
+def sample_grouped(groups: np.ndarray, tables: dict, rng=np.random) -> np.ndarray:
+    """Draw one label per row from the compiled table selected by its group
+
+    Rows whose group has no table are left as None.
+    """
+    out = np.empty(len(groups), dtype=object)
+    for group, table in tables.items():
+        mask = groups == group
+        n = int(mask.sum())
+        if n:
+            out[mask] = table.sample(n, rng)
+    return out
+
+
+class ConditionalDistribution:
+    """Conditional probability table: one compiled distribution per group
+
+    Built from a config table {group: {label: weight}}. `sample` draws the
+    child column for all rows at once, one vectorized draw per group.
+    """
+
+    def __init__(self, tables: dict):
+        self.tables = {group: CompiledDistribution(weights) for group, weights in tables.items()}
+
+    def __getitem__(self, group) -> CompiledDistribution:
+        return self.tables[group]
+
+    def sample(self, groups: np.ndarray, rng=np.random) -> np.ndarray:
+        """Draw one label per row from its group's table"""
+        return sample_grouped(groups, self.tables, rng)
+
+
+def assign_bands(values: np.ndarray, bands: dict) -> np.ndarray:
+    """Label each value with its band from a {label: lower bound} table"""
+    labels = np.array(list(bands.keys()), dtype=object)
+    lower = np.array(list(bands.values()))
+    return labels[np.searchsorted(lower, values, side='right') - 1]
+
+
+def plan_groups(plan_name: np.ndarray) -> np.ndarray:
+    """Map plan names to their PLAN_GROUPS label (unknown plans are Standard)"""
+    return pd.Series(plan_name).map(PLAN_GROUPS).fillna("Standard").to_numpy(dtype=object)
+
+
+# =============================================================================
+# COMPILED CONFIG DISTRIBUTIONS
+# =============================================================================
+
+STATE_MIX = CompiledDistribution(STATE_DISTRIBUTION)
+URBAN_RURAL_MIX = CompiledDistribution(URBAN_RURAL_DISTRIBUTION)
+AGE_BUCKET_MIX = CompiledDistribution({k: v["pct"] for k, v in AGE_DISTRIBUTION.items()})
+GENDER_MIX = CompiledDistribution(GENDER_DISTRIBUTION)
+ACQUISITION_CHANNEL_MIX = CompiledDistribution(ACQUISITION_CHANNEL_DISTRIBUTION)
+DEVICE_TIER_MIX = {brand: CompiledDistribution(info["tiers"]) for brand, info in DEVICE_BRANDS.items()}
+CAMPAIGN_CHANNEL_MIX = CompiledDistribution(CAMPAIGN_CHANNELS)
+
+# Lifestyle by geography, plus the secondary-lifestyle tables that exclude
+# each possible primary
+LIFESTYLE_MIX_BY_GEOGRAPHY = {
+    geo: CompiledDistribution(dist) for geo, dist in LIFESTYLE_BY_GEOGRAPHY.items()
+}
+SECONDARY_LIFESTYLE_MIX = {
+    (geo, primary): CompiledDistribution({k: v for k, v in dist.items() if k != primary})
+    for geo, dist in LIFESTYLE_BY_GEOGRAPHY.items()
+    for primary in dist
+    if len(dist) > 1
+}
+
+# Conditional tables
+PLAN_BY_AGE = ConditionalDistribution(PLAN_BY_AGE_BAND)
+DEVICE_BRAND_BY_PLAN = ConditionalDistribution(DEVICE_BRAND_BY_PLAN_GROUP)
+PAYMENT_METHOD_BY_PLAN = ConditionalDistribution(PAYMENT_METHOD_BY_PLAN_GROUP)
+CREDIT_CLASS_BY_PLAN = ConditionalDistribution(CREDIT_CLASS_BY_PLAN_GROUP)
+PAYMENT_STATUS_BY_CREDIT = ConditionalDistribution(PAYMENT_STATUS_BY_CREDIT_CLASS)
+SUPPORT_CHANNEL_BY_AGE = ConditionalDistribution(SUPPORT_CHANNEL_BY_AGE_BAND)
+SUPPORT_CATEGORY_BY_RISK = ConditionalDistribution(SUPPORT_CATEGORY_BY_SEGMENT)
+CAMPAIGN_TYPE_BY_CUSTOMER = ConditionalDistribution(CAMPAIGN_TYPE_BY_SEGMENT)
+COMPLAINT_SENTIMENT_MIX = CompiledDistribution(COMPLAINT_SENTIMENT)
+CSAT_BY_SENTIMENT = ConditionalDistribution(CSAT_BY_SENTIMENT_BAND)
+RESOLUTION_BY_CATEGORY = ConditionalDistribution(RESOLUTION_BY_CATEGORY_GROUP)
@@ -0,0 +1,70 @@
+"""
+Snowmobile Wireless - Geo Sampler
+Indexed state -> ZIP lookup shared by the geo-aware generators
+"""
+
+import numpy as np
+import pandas as pd
+
+from .distributions import CompiledDistribution, STATE_MIX
+
+
+class GeoSampler:
+    """ZIP codes grouped by state in contiguous arrays with per-state offsets
+
+    Built once from the `generate_zip_demographics` output. ZIP rows are
+    stable-sorted by state so every state's ZIPs occupy the slice
+    `[offsets[s], offsets[s] + counts[s])`; drawing a ZIP for a state is an
+    offset plus a scaled uniform, so millions of draws are one array op.
+    """
+
+    def __init__(self, zip_df: pd.DataFrame, state_mix: CompiledDistribution = STATE_MIX):
+        zip_states = zip_df['state_code'].to_numpy(dtype=str)
+        order = np.argsort(zip_states, kind='stable')
+
+        # ZIP attributes in state-grouped order
+        self.zip_states = zip_states[order].astype(object)
+        self.zip_codes = zip_df['zip_code'].to_numpy(dtype=object)[order]
+        self.dma_codes = zip_df['dma_code'].to_numpy(dtype=object)[order]
+
+        # State weights and their slices into the ZIP arrays
+        self.state_mix = state_mix
+        self.states = state_mix.labels
+
+        sorted_states = zip_states[order]
+        self.offsets = np.searchsorted(sorted_states, self.states.astype(str), side='left')
+        self.counts = np.searchsorted(sorted_states, self.states.astype(str), side='right') - self.offsets
+
+        # States without ZIPs fall back to the whole ZIP universe
+        missing = self.counts == 0
+        self.offsets[missing] = 0
+        self.counts[missing] = len(self.zip_codes)
+
+    def __len__(self) -> int:
+        return len(self.zip_codes)
+
+    def sample_states(self, n: int, rng=np.random) -> np.ndarray:
+        """Draw `n` state indices weighted by population"""
+        return self.state_mix.sample_codes(n, rng)
+
+    def sample_zips(self, state_idx: np.ndarray, rng=np.random) -> np.ndarray:
+        """Draw one ZIP position per row, uniformly within the row's state"""
+        state_idx = np.asarray(state_idx)
+        draw = rng.random(len(state_idx)) * self.counts[state_idx]
+        return self.offsets[state_idx] + draw.astype(np.int64)
+
+    def sample(self, n: int, rng=np.random):
+        """Draw `n` (state codes, ZIP positions) pairs
+
+        Returns `(states, zip_pos)`; index `zip_codes`, `dma_codes` or any
+        array from `align` with `zip_pos` to get the ZIP-level columns.
+        """
+        state_idx = self.sample_states(n, rng)
+        return self.states[state_idx], self.sample_zips(state_idx, rng)
+
+    def align(self, values: pd.Series, default=None) -> np.ndarray:
+        """Reorder a per-ZIP Series (indexed by zip_code) to sampler order"""
+        aligned = values.reindex(self.zip_codes)
+        if default is not None:
+            aligned = aligned.fillna(default)
+        return aligned.to_numpy()
@@ -0,0 +1,76 @@
+"""
+Snowmobile Wireless - Record IDs
+UUID-format keys drawn in bulk from the seeded random streams
+"""
+
+import numpy as np
+
+from config import CUSTOMER_CONFIG
+
+
+HEX_DIGITS = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+HEX_DIGITS_UPPER = np.frombuffer(b"0123456789ABCDEF", dtype=np.uint8)
+
+# Character positions of the 32 hex digits within the 36-character UUID form
+UUID_HEX_POSITIONS = np.array([i for i in range(36) if i not in (8, 13, 18, 23)])
+
+
+def random_id_bytes(n: int, rng=np.random) -> np.ndarray:
+    """Draw `n` version-4 UUIDs as an (n, 16) uint8 array"""
+    raw = np.frombuffer(rng.bytes(16 * n), dtype=np.uint8).reshape(n, 16).copy()
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40  # version 4
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80  # RFC 4122 variant
+    return raw
+
+
+def hex_digits(raw: np.ndarray, upper: bool = False) -> np.ndarray:
+    """Hex-encode each row of a uint8 array, as an (n, 2 * width) ASCII array"""
+    digits = HEX_DIGITS_UPPER if upper else HEX_DIGITS
+    nibbles = np.empty((raw.shape[0], raw.shape[1] * 2), dtype=np.uint8)
+    nibbles[:, 0::2] = raw >> 4
+    nibbles[:, 1::2] = raw & 0x0F
+    return digits[nibbles]
+
+
+def _to_strings(chars: np.ndarray) -> np.ndarray:
+    """Rows of ASCII codes -> object array of str"""
+    width = chars.shape[1]
+    return np.ascontiguousarray(chars).view(f"S{width}").ravel().astype(f"U{width}").astype(object)
+
+
+def format_uuids(raw: np.ndarray) -> np.ndarray:
+    """(n, 16) UUID bytes -> object array of canonical 8-4-4-4-12 strings"""
+    chars = np.full((raw.shape[0], 36), ord("-"), dtype=np.uint8)
+    chars[:, UUID_HEX_POSITIONS] = hex_digits(raw)
+    return _to_strings(chars)
+
+
+def surrogate_keys(raw: np.ndarray) -> np.ndarray:
+    """int64 surrogate key from the first 8 bytes of each UUID"""
+    return np.ascontiguousarray(raw[:, :8]).view(">i8").ravel().astype(np.int64)
+
+
+def random_uuids(n: int, rng=np.random, surrogate: bool = False):
+    """Draw `n` UUID strings from `rng`
+
+    With `surrogate=True` returns (uuids, int64 keys); the key is the
+    UUID's leading 8 bytes, so either form identifies the row.
+    """
+    raw = random_id_bytes(n, rng)
+    if surrogate:
+        return format_uuids(raw), surrogate_keys(raw)
+    return format_uuids(raw)
+
+
+def random_hex_ids(n: int, length: int, rng=np.random) -> np.ndarray:
+    """Draw `n` upper-case hex IDs of `length` characters (length must be even)"""
+    raw = np.frombuffer(rng.bytes(n * length // 2), dtype=np.uint8).reshape(n, length // 2)
+    return _to_strings(hex_digits(raw, upper=True))
+
+
+def id_columns(n: int, name: str, rng=np.random) -> dict:
+    """`<name>_id` (plus `<name>_key` when surrogate keys are on) for `n` rows"""
+    uuids, keys = random_uuids(n, rng, surrogate=True)
+    if CUSTOMER_CONFIG.get("surrogate_keys"):
+        return {f"{name}_id": uuids, f"{name}_key": keys}
+    return {f"{name}_id": uuids}
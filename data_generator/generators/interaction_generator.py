@@ -3,19 +3,23 @@ Snowmobile Wireless - Interaction Generator
 Generates support interaction data
 """
 
-import uuid
-from datetime import datetime, timedelta
 import numpy as np
 import pandas as pd
 from tqdm import tqdm
-from faker import Faker
 
-import sys
-sys.path.append('..')
-from config import SUPPORT_CHANNELS, SUPPORT_CATEGORIES, SUPPORT_SUBCATEGORIES
-
-fake = Faker('en_US')
-Faker.seed(42)
+from config import (
+    SUPPORT_SUBCATEGORIES, SUPPORT_AGE_BANDS, SEGMENT_THRESHOLDS,
+    RESOLUTION_HOURS_BY_CATEGORY_GROUP, FCR_RATE_BY_CATEGORY_GROUP
+)
+from .customer_view import CustomerView
+from .ids import id_columns
+from .streams import block_rng, block_ranges, resolve_seed
+from .time_axis import TimeAxis
+from .text_dictionary import TextDictionary, choose_codes
+from .distributions import (
+    assign_bands, SUPPORT_CHANNEL_BY_AGE, SUPPORT_CATEGORY_BY_RISK, COMPLAINT_SENTIMENT_MIX,
+    CSAT_BY_SENTIMENT, RESOLUTION_BY_CATEGORY
+)
 
 
 # Sample verbatims by category and sentiment
@@ -149,126 +153,150 @@ AGENT_SUMMARIES = {
     ],
 }
 
+DEFAULT_SUMMARY = "Assisted customer with inquiry."
+
+# Dictionaries of the template-drawn text columns. Intents are every
+# (category, subcategory) pair; a subcategory draw picks a pair code,
+# which is the intent's code and maps to the subcategory's.
+INTENT_PAIRS = [(category, subcategory) for category, subcategories in SUPPORT_SUBCATEGORIES.items()
+                for subcategory in subcategories]
+INTENTS = TextDictionary(f"{category} - {subcategory}" for category, subcategory in INTENT_PAIRS)
+SUBCATEGORIES = TextDictionary(subcategory for _, subcategory in INTENT_PAIRS)
+INTENT_SUBCATEGORY = SUBCATEGORIES.codes([subcategory for _, subcategory in INTENT_PAIRS])
+CATEGORY_INTENTS = {
+    category: np.array([code for code, pair in enumerate(INTENT_PAIRS) if pair[0] == category])
+    for category in SUPPORT_SUBCATEGORIES
+}
+
+VERBATIMS = TextDictionary(verbatim for templates in VERBATIM_TEMPLATES.values()
+                           for options in templates.values() for verbatim in options)
+VERBATIM_CODES = {
+    category: {bucket: VERBATIMS.codes(options) for bucket, options in templates.items()}
+    for category, templates in VERBATIM_TEMPLATES.items()
+}
+
+SUMMARIES = TextDictionary([summary for options in AGENT_SUMMARIES.values() for summary in options]
+                           + [DEFAULT_SUMMARY])
+SUMMARY_CODES = {category: SUMMARIES.codes(options) for category, options in AGENT_SUMMARIES.items()}
 
-def weighted_choice(distribution: dict) -> str:
-    items = list(distribution.keys())
-    weights = list(distribution.values())
-    return np.random.choice(items, p=weights)
 
+def generate_support_interactions(customers, 
+                                   avg_per_customer: float = 2.0,
+                                   seed: int = None, first_block: int = 0,
+                                   time_axis: TimeAxis = None, window_days: int = 365,
+                                   period: int = None) -> pd.DataFrame:
+    """Generate support interaction records
 
-def generate_support_interactions(customers_df: pd.DataFrame, 
-                                   avg_per_customer: float = 2.0) -> pd.DataFrame:
-    """Generate support interaction records"""
+    Customers are processed in RNG blocks (see streams.py) so output depends
+    only on `seed` and row position; `first_block` is the global block index
+    of the first row of `customers` when it is a slice of the population.
+    `customers` is a CustomerView or a customer DataFrame.
+    Interactions fall in the `window_days` days up to `time_axis` (default:
+    today); `period` keys the random streams of a month appended to a run.
+    Each block's interactions are sampled column by column, never row by row;
+    template-drawn text columns are Categoricals (see text_dictionary.py).
+    """
     
-    n_customers = len(customers_df)
+    customers = CustomerView.of(customers)
+    n_customers = len(customers)
     est_records = int(n_customers * avg_per_customer)
     
     print(f"  Generating ~{est_records:,} support interaction records...")
     
+    seed = resolve_seed(seed)
+    time_axis = time_axis or TimeAxis()
     records = []
-    customer_data = customers_df.set_index('customer_id').to_dict('index')
+    progress = tqdm(total=n_customers, desc="  Interactions")
     
-    for customer_id, cust in tqdm(customer_data.items(), desc="  Interactions"):
+    for block, first, stop in block_ranges(n_customers):
+        rng = block_rng(seed, "interactions", first_block + block, period)
+        block_customers = customers.slice(first, stop)
+        n = len(block_customers)
+        risks = block_customers.get('churn_risk_score', 0)
+        
         # Number of interactions based on tenure and churn risk
-        base_interactions = np.random.poisson(avg_per_customer)
+        counts = rng.poisson(avg_per_customer, n)
         
         # High churn risk customers have more interactions
-        if cust.get('churn_risk_score', 0) > 0.5:
-            base_interactions = int(base_interactions * 1.5)
+        counts = np.where(risks > 0.5, (counts * 1.5).astype(np.int64), counts)
         
         # Newer customers have more onboarding interactions
-        if cust.get('tenure_months', 12) < 6:
-            base_interactions += np.random.randint(0, 2)
+        counts += np.where(block_customers.get('tenure_months', 12) < 6, rng.integers(0, 2, n), 0)
+        
+        # Channel (influenced by age) and category (influenced by churn risk),
+        # drawn for every interaction in the block at once
+        ages = block_customers.get('age', 40)
+        risk_segment = np.where(risks > SEGMENT_THRESHOLDS["support_at_risk_churn"], "At Risk", "Standard")
+        channels = SUPPORT_CHANNEL_BY_AGE.sample(np.repeat(assign_bands(ages, SUPPORT_AGE_BANDS), counts), rng)
+        categories = SUPPORT_CATEGORY_BY_RISK.sample(np.repeat(risk_segment, counts), rng)
+        customer_ids = np.repeat(block_customers['customer_id'], counts)
+        
+        # Random date in the window (by default the last 12 months)
+        interaction_dates = time_axis.timestamps_before(rng.integers(0, window_days, len(channels)), rng)
+        
+        # Every other column is drawn a column at a time as well
+        n_rows = len(customer_ids)
+        is_complaint = categories == "Complaint"
+        category_group = np.where(is_complaint, "Complaint", "Standard")
+        intent_codes = choose_codes(categories, CATEGORY_INTENTS, rng)
+        
+        # Sentiment
+        sentiments = np.round(rng.uniform(-0.2, 0.8, n_rows), 2)
+        negative = np.isin(categories, ["Billing", "Technical"]) & (rng.random(n_rows) < 0.4)
+        sentiments[negative] = np.round(rng.uniform(-0.6, 0, negative.sum()), 2)
+        sentiments[is_complaint] = COMPLAINT_SENTIMENT_MIX.sample(is_complaint.sum(), rng).astype(float)
+        
+        # CSAT score (correlated with sentiment)
+        sentiment_band = np.select([sentiments < -0.3, sentiments > 0.3], ["Negative", "Positive"], "Neutral")
+        csat = CSAT_BY_SENTIMENT.sample(sentiment_band, rng).astype(np.int64)
+        
+        # Resolution
+        resolution = RESOLUTION_BY_CATEGORY.sample(category_group, rng)
+        complaint_hours = RESOLUTION_HOURS_BY_CATEGORY_GROUP["Complaint"]
+        standard_hours = RESOLUTION_HOURS_BY_CATEGORY_GROUP["Standard"]
+        resolution_time = rng.uniform(np.where(is_complaint, complaint_hours[0], standard_hours[0]),
+                                      np.where(is_complaint, complaint_hours[1], standard_hours[1]))
+        fcr_rate = np.where(is_complaint, FCR_RATE_BY_CATEGORY_GROUP["Complaint"],
+                            FCR_RATE_BY_CATEGORY_GROUP["Standard"])
+        fcr = rng.random(n_rows) < fcr_rate
+        
+        # Verbatim (none where the category has no templates for the sentiment)
+        sentiment_bucket = np.select([sentiments < -0.2, sentiments > 0.3], ["negative", "positive"], "neutral")
+        verbatim_codes = np.full(n_rows, -1, dtype=np.int64)
+        for category, buckets in VERBATIM_CODES.items():
+            in_category = categories == category
+            for bucket, options in buckets.items():
+                rows = np.flatnonzero(in_category & (sentiment_bucket == bucket))
+                if len(options) and len(rows):
+                    verbatim_codes[rows] = options[rng.integers(0, len(options), len(rows))]
+        
+        # Summary
+        summary_codes = choose_codes(categories, SUMMARY_CODES, rng, default=SUMMARIES.codes([DEFAULT_SUMMARY])[0])
+        
+        ids = id_columns(n_rows, "interaction", rng)
+        block_records = pd.DataFrame({
+            "interaction_id": ids.pop("interaction_id"),
+            "customer_id": customer_ids,
+            "interaction_date": interaction_dates,
+            "channel": channels,
+            "category": categories,
+            "subcategory": SUBCATEGORIES.column(np.where(intent_codes >= 0, INTENT_SUBCATEGORY[intent_codes], -1)),
+            "intent": INTENTS.column(intent_codes),
+            "resolution_status": resolution,
+            "resolution_time_hours": np.round(resolution_time, 2),
+            "first_contact_resolution": fcr,
+            "sentiment_score": sentiments,
+            "csat_score": csat,
+            "interaction_summary": SUMMARIES.column(summary_codes),
+            "customer_verbatim": VERBATIMS.column(verbatim_codes),
+            **ids,
+        })
         
-        for _ in range(base_interactions):
-            interaction_id = str(uuid.uuid4())
-            
-            # Random date in last 12 months
-            days_ago = np.random.randint(0, 365)
-            interaction_date = datetime.now() - timedelta(days=days_ago)
-            
-            # Channel (influenced by age)
-            if cust.get('age', 40) < 35:
-                channel_weights = {"App": 0.35, "Chat": 0.30, "Call": 0.15, 
-                                  "Email": 0.10, "Store": 0.05, "Social": 0.05}
-            elif cust.get('age', 40) > 55:
-                channel_weights = {"Call": 0.45, "Store": 0.25, "Email": 0.15,
-                                  "App": 0.08, "Chat": 0.05, "Social": 0.02}
-            else:
-                channel_weights = SUPPORT_CHANNELS
-            
-            channel = weighted_choice(channel_weights)
-            
-            # Category (influenced by churn risk)
-            if cust.get('churn_risk_score', 0) > 0.6:
-                cat_weights = {"Billing": 0.35, "Complaint": 0.25, "Technical": 0.20,
-                              "Sales": 0.10, "General": 0.05, "Account": 0.05}
-            else:
-                cat_weights = SUPPORT_CATEGORIES
-            
-            category = weighted_choice(cat_weights)
-            subcategory = np.random.choice(SUPPORT_SUBCATEGORIES.get(category, ["General"]))
-            intent = f"{category} - {subcategory}"
-            
-            # Sentiment
-            if category == "Complaint":
-                sentiment = np.random.choice([-0.8, -0.6, -0.4], p=[0.5, 0.3, 0.2])
-            elif category in ["Billing", "Technical"] and np.random.random() < 0.4:
-                sentiment = round(np.random.uniform(-0.6, 0), 2)
-            else:
-                sentiment = round(np.random.uniform(-0.2, 0.8), 2)
-            
-            # CSAT score (correlated with sentiment)
-            if sentiment < -0.3:
-                csat = np.random.choice([1, 2, 3], p=[0.4, 0.4, 0.2])
-            elif sentiment > 0.3:
-                csat = np.random.choice([3, 4, 5], p=[0.1, 0.3, 0.6])
-            else:
-                csat = np.random.choice([2, 3, 4], p=[0.2, 0.5, 0.3])
-            
-            # Resolution
-            if category == "Complaint":
-                resolution = np.random.choice(["Resolved", "Escalated", "Pending", "Unresolved"],
-                                            p=[0.45, 0.30, 0.15, 0.10])
-                resolution_time = np.random.uniform(2, 48)
-                fcr = np.random.random() < 0.3
-            else:
-                resolution = np.random.choice(["Resolved", "Escalated", "Pending"],
-                                            p=[0.75, 0.15, 0.10])
-                resolution_time = np.random.uniform(0.1, 8)
-                fcr = np.random.random() < 0.65
-            
-            # Verbatim
-            sentiment_bucket = "negative" if sentiment < -0.2 else ("positive" if sentiment > 0.3 else "neutral")
-            verbatims = VERBATIM_TEMPLATES.get(category, {}).get(sentiment_bucket, [])
-            if verbatims:
-                verbatim = np.random.choice(verbatims)
-            else:
-                verbatim = None
-            
-            # Summary
-            summaries = AGENT_SUMMARIES.get(category, ["Assisted customer with inquiry."])
-            summary = np.random.choice(summaries)
-            
-            record = {
-                "interaction_id": interaction_id,
-                "customer_id": customer_id,
-                "interaction_date": interaction_date,
-                "channel": channel,
-                "category": category,
-                "subcategory": subcategory,
-                "intent": intent,
-                "resolution_status": resolution,
-                "resolution_time_hours": round(resolution_time, 2),
-                "first_contact_resolution": fcr,
-                "sentiment_score": sentiment,
-                "csat_score": csat,
-                "interaction_summary": summary,
-                "customer_verbatim": verbatim,
-            }
-            records.append(record)
+        records.append(block_records)
+        progress.update(stop - first)
     
-    df = pd.DataFrame(records)
+    progress.close()
+    df = pd.concat(records, ignore_index=True) if records else pd.DataFrame()
     print(f"  ✓ Generated {len(df):,} interaction records")
     return df
 
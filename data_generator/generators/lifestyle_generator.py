@@ -5,187 +5,166 @@ Generates psychographic/lifestyle data by ZIP code
 
 import numpy as np
 import pandas as pd
-from tqdm import tqdm
 
-import sys
-sys.path.append('..')
-from config import (
-    LIFESTYLE_CLUSTERS, LIFESTYLE_BY_GEOGRAPHY, TECH_ADOPTION_BY_LIFESTYLE
+from config import TECH_ADOPTION_BY_LIFESTYLE
+from .distributions import (
+    CompiledDistribution, LIFESTYLE_MIX_BY_GEOGRAPHY, SECONDARY_LIFESTYLE_MIX, sample_grouped
 )
+from .zip_features import ZipFeatures
 
 
-def weighted_choice(distribution: dict) -> str:
-    items = list(distribution.keys())
-    weights = list(distribution.values())
-    # Normalize weights
-    total = sum(weights)
-    weights = [w/total for w in weights]
-    return np.random.choice(items, p=weights)
+DEFAULT_TECH_ADOPTION = {"mean": 50, "std": 15}
 
+NEWS_CONSUMPTION_MIX = CompiledDistribution({"Heavy": 0.25, "Moderate": 0.50, "Light": 0.25})
 
-def generate_lifestyle_segments(zip_df: pd.DataFrame) -> pd.DataFrame:
-    """Generate lifestyle segment data for each ZIP code"""
-    
-    n_zips = len(zip_df)
+# Primary news source for younger (median age < 45) and older ZIPs
+NEWS_SOURCE_MIX = {
+    True: CompiledDistribution({"Social": 0.30, "TV": 0.25, "Online": 0.35, "Print": 0.10}),
+    False: CompiledDistribution({"Social": 0.15, "TV": 0.40, "Online": 0.30, "Print": 0.15}),
+}
+
+# Channel preference ranges (digital, phone, store) by median age band; chat takes the rest
+CHANNEL_PREFERENCE_BY_AGE = {
+    "Young": {"digital": (50, 70), "phone": (10, 20), "store": (5, 15)},
+    "Middle": {"digital": (35, 50), "phone": (20, 35), "store": (15, 25)},
+    "Senior": {"digital": (20, 35), "phone": (35, 50), "store": (20, 35)},
+}
+
+
+def _channel_preferences(median_age: np.ndarray, rng) -> dict:
+    """Preferred-channel shares (digital, phone, store, chat) from the ZIP's median age"""
+    band = np.select([median_age < 35, median_age > 55], ["Young", "Senior"], "Middle")
+    prefs = {}
+    for channel in ("digital", "phone", "store"):
+        low = np.zeros(len(band))
+        high = np.zeros(len(band))
+        for name, ranges in CHANNEL_PREFERENCE_BY_AGE.items():
+            low[band == name], high[band == name] = ranges[channel]
+        prefs[channel] = np.round(rng.uniform(low, high), 2)
+    prefs["chat"] = np.round(100 - prefs["digital"] - prefs["phone"] - prefs["store"], 2)
+    return prefs
+
+
+def generate_lifestyle_segments(zip_df, rng=np.random) -> pd.DataFrame:
+    """Generate lifestyle segment data for each ZIP code
+
+    `zip_df` is the ZIP demographics DataFrame or a ZipFeatures view of it.
+    """
+
+    zips = ZipFeatures.of(zip_df)
+    n_zips = len(zips)
     print(f"  Generating {n_zips:,} lifestyle segment records...")
-    
-    records = []
-    
-    for _, row in tqdm(zip_df.iterrows(), total=n_zips, desc="  Lifestyle"):
-        zip_code = row['zip_code']
-        urban_rural = row['urban_rural_class']
-        median_income = row['median_household_income']
-        median_age = row['median_age']
-        pct_bachelors = row.get('pct_bachelors', 30)
-        
-        # Select primary lifestyle based on geography
-        lifestyle_dist = LIFESTYLE_BY_GEOGRAPHY.get(urban_rural, LIFESTYLE_BY_GEOGRAPHY["Suburban"])
-        primary_lifestyle = weighted_choice(lifestyle_dist)
-        
-        # Secondary lifestyle (different from primary)
-        remaining = {k: v for k, v in lifestyle_dist.items() if k != primary_lifestyle}
-        if remaining:
-            secondary_lifestyle = weighted_choice(remaining)
-        else:
-            secondary_lifestyle = primary_lifestyle
-        
-        # Lifestyle diversity (higher in urban areas)
-        diversity = round(np.random.uniform(0.3, 0.8) if urban_rural == "Urban" else np.random.uniform(0.1, 0.5), 2)
-        
-        # Tech adoption based on lifestyle and demographics
-        tech_params = TECH_ADOPTION_BY_LIFESTYLE.get(primary_lifestyle, {"mean": 50, "std": 15})
-        
-        # Adjust for income and education
-        income_factor = (median_income - 75000) / 50000 * 10
-        edu_factor = (pct_bachelors - 30) / 20 * 5
-        age_factor = (40 - median_age) / 20 * 10  # Younger = higher tech
-        
-        tech_score = int(tech_params["mean"] + income_factor + edu_factor + age_factor + np.random.normal(0, tech_params["std"]))
-        tech_score = max(10, min(95, tech_score))
-        
-        # Smartphone penetration
-        smartphone_pct = round(max(70, min(98, 85 + tech_score/10 + np.random.normal(0, 3))), 2)
-        
-        # iPhone vs Android split (iPhone higher in affluent areas)
-        iphone_base = 45 + (median_income - 75000) / 10000 + (tech_score - 50) / 10
-        pct_iphone = round(max(30, min(70, iphone_base + np.random.normal(0, 8))), 2)
-        pct_android = round(100 - pct_iphone, 2)
-        
-        # Smart home adoption
-        smart_home = round(max(5, min(60, tech_score * 0.5 + np.random.normal(0, 10))), 2)
-        
-        # Streaming penetration
-        streaming_pct = round(max(50, min(95, 70 + tech_score/5 + np.random.normal(0, 8))), 2)
-        
-        # Cord cutters
-        cord_cutter = round(max(15, min(70, 35 + tech_score/5 - (median_age - 40)/3 + np.random.normal(0, 10))), 2)
-        
-        # Screen time
-        screen_time = round(max(3, min(10, 6 + (tech_score - 50)/20 - (median_age - 40)/15 + np.random.normal(0, 1))), 1)
-        
-        # Social media heavy users
-        social_heavy = round(max(10, min(70, 40 - (median_age - 35)/2 + np.random.normal(0, 12))), 2)
-        
-        # Online shopping
-        online_shop = round(max(40, min(90, 60 + tech_score/10 + np.random.normal(0, 8))), 2)
-        
-        # Mobile banking
-        mobile_bank = round(max(30, min(85, 55 + tech_score/10 + np.random.normal(0, 10))), 2)
-        
-        # Media consumption
-        streaming_hrs = round(max(5, min(40, 20 + tech_score/10 - (median_age - 40)/5 + np.random.normal(0, 5))), 1)
-        gaming_hrs = round(max(0, min(20, 8 - (median_age - 30)/5 + np.random.normal(0, 4))), 1)
-        
-        news_level = np.random.choice(["Heavy", "Moderate", "Light"], p=[0.25, 0.50, 0.25])
-        news_source = np.random.choice(
-            ["Social", "TV", "Online", "Print"],
-            p=[0.30, 0.25, 0.35, 0.10] if median_age < 45 else [0.15, 0.40, 0.30, 0.15]
-        )
-        
-        # Values and priorities
-        # Price sensitivity (inversely correlated with income)
-        price_sens = int(max(10, min(90, 60 - (median_income - 75000) / 5000 + np.random.normal(0, 15))))
-        
-        # Brand loyalty
-        brand_loyalty = int(max(20, min(80, 50 + (median_age - 40) / 3 + np.random.normal(0, 12))))
-        
-        # Eco consciousness
-        eco = int(max(15, min(85, 50 + (pct_bachelors - 30) / 3 + np.random.normal(0, 15))))
-        
-        # Early adopter
-        early_adopter = int(max(10, min(90, tech_score * 0.8 - (median_age - 35) / 2 + np.random.normal(0, 10))))
-        
-        # Communication preferences
-        if median_age < 35:
-            pref_digital = round(np.random.uniform(50, 70), 2)
-            pref_phone = round(np.random.uniform(10, 20), 2)
-            pref_store = round(np.random.uniform(5, 15), 2)
-            pref_chat = round(100 - pref_digital - pref_phone - pref_store, 2)
-        elif median_age > 55:
-            pref_digital = round(np.random.uniform(20, 35), 2)
-            pref_phone = round(np.random.uniform(35, 50), 2)
-            pref_store = round(np.random.uniform(20, 35), 2)
-            pref_chat = round(100 - pref_digital - pref_phone - pref_store, 2)
-        else:
-            pref_digital = round(np.random.uniform(35, 50), 2)
-            pref_phone = round(np.random.uniform(20, 35), 2)
-            pref_store = round(np.random.uniform(15, 25), 2)
-            pref_chat = round(100 - pref_digital - pref_phone - pref_store, 2)
-        
-        # Wireless behaviors
-        avg_data = round(max(5, min(50, 15 + tech_score/5 - (median_age - 40)/3 + np.random.normal(0, 8))), 1)
-        avg_lines = round(max(1, min(4, 1.5 + (urban_rural == "Suburban") * 0.8 + np.random.normal(0, 0.5))), 1)
-        
-        family_propensity = round(max(10, min(70, 30 + (urban_rural == "Suburban") * 20 + np.random.normal(0, 10))), 2)
-        premium_propensity = round(max(5, min(50, 20 + (median_income - 75000) / 5000 + tech_score/5 + np.random.normal(0, 10))), 2)
-        prepaid_propensity = round(max(5, min(50, 25 - (median_income - 75000) / 8000 + np.random.normal(0, 10))), 2)
-        
-        # Churn factors
-        deal_seeker = int(max(10, min(90, price_sens * 0.8 + np.random.normal(0, 10))))
-        switching_prop = round(max(5, min(40, 15 + price_sens/5 - brand_loyalty/10 + np.random.normal(0, 5))), 2)
-        competitor_aware = round(max(20, min(80, 50 + deal_seeker/5 + np.random.normal(0, 10))), 2)
-        
-        record = {
-            "zip_code": zip_code,
-            "primary_lifestyle": primary_lifestyle,
-            "secondary_lifestyle": secondary_lifestyle,
-            "lifestyle_diversity": diversity,
-            "tech_adoption_score": tech_score,
-            "smartphone_penetration": smartphone_pct,
-            "pct_iphone": pct_iphone,
-            "pct_android": pct_android,
-            "smart_home_adoption": smart_home,
-            "streaming_penetration": streaming_pct,
-            "cord_cutter_rate": cord_cutter,
-            "avg_daily_screen_time": screen_time,
-            "social_media_heavy_pct": social_heavy,
-            "online_shopping_pct": online_shop,
-            "mobile_banking_pct": mobile_bank,
-            "streaming_hours_week": streaming_hrs,
-            "gaming_hours_week": gaming_hrs,
-            "news_consumption": news_level,
-            "primary_news_source": news_source,
-            "price_sensitivity_index": price_sens,
-            "brand_loyalty_index": brand_loyalty,
-            "eco_consciousness": eco,
-            "early_adopter_index": early_adopter,
-            "pref_channel_digital": pref_digital,
-            "pref_channel_phone": pref_phone,
-            "pref_channel_store": pref_store,
-            "pref_channel_chat": pref_chat,
-            "avg_data_usage_gb": avg_data,
-            "avg_lines_per_account": avg_lines,
-            "family_plan_propensity": family_propensity,
-            "premium_plan_propensity": premium_propensity,
-            "prepaid_propensity": prepaid_propensity,
-            "deal_seeker_index": deal_seeker,
-            "switching_propensity": switching_prop,
-            "competitor_awareness": competitor_aware,
-        }
-        records.append(record)
-    
-    df = pd.DataFrame(records)
-    print(f"  ✓ Generated {len(df):,} lifestyle segment records")
-    return df
 
+    urban_rural = zips["urban_rural_class"]
+    median_income = zips["median_household_income"]
+    median_age = zips["median_age"]
+    pct_bachelors = zips["pct_bachelors"]
+    suburban = urban_rural == "Suburban"
+
+    # Primary lifestyle by geography, secondary from the same mix without the primary
+    geography = np.where(np.isin(urban_rural, list(LIFESTYLE_MIX_BY_GEOGRAPHY)), urban_rural, "Suburban")
+    primary_lifestyle = sample_grouped(geography, LIFESTYLE_MIX_BY_GEOGRAPHY, rng)
+    secondary_lifestyle = primary_lifestyle.copy()
+    for (geo, primary), mix in SECONDARY_LIFESTYLE_MIX.items():
+        mask = (geography == geo) & (primary_lifestyle == primary)
+        n = int(mask.sum())
+        if n:
+            secondary_lifestyle[mask] = mix.sample(n, rng)
+
+    # Lifestyle diversity (higher in urban areas)
+    diversity = np.round(np.where(urban_rural == "Urban",
+                                  rng.uniform(0.3, 0.8, n_zips), rng.uniform(0.1, 0.5, n_zips)), 2)
 
+    # Tech adoption based on lifestyle, adjusted for income, education and age
+    tech_mean = pd.Series(primary_lifestyle).map(
+        {k: v["mean"] for k, v in TECH_ADOPTION_BY_LIFESTYLE.items()}).fillna(DEFAULT_TECH_ADOPTION["mean"]).to_numpy()
+    tech_std = pd.Series(primary_lifestyle).map(
+        {k: v["std"] for k, v in TECH_ADOPTION_BY_LIFESTYLE.items()}).fillna(DEFAULT_TECH_ADOPTION["std"]).to_numpy()
+    income_factor = (median_income - 75000) / 50000 * 10
+    edu_factor = (pct_bachelors - 30) / 20 * 5
+    age_factor = (40 - median_age) / 20 * 10  # Younger = higher tech
+    tech_score = (tech_mean + income_factor + edu_factor + age_factor + rng.normal(0, tech_std)).astype(np.int64)
+    tech_score = np.clip(tech_score, 10, 95)
+
+    # Device and service penetration (iPhone higher in affluent areas)
+    smartphone_pct = np.round(np.clip(85 + tech_score / 10 + rng.normal(0, 3, n_zips), 70, 98), 2)
+    iphone_base = 45 + (median_income - 75000) / 10000 + (tech_score - 50) / 10
+    pct_iphone = np.round(np.clip(iphone_base + rng.normal(0, 8, n_zips), 30, 70), 2)
+    pct_android = np.round(100 - pct_iphone, 2)
+    smart_home = np.round(np.clip(tech_score * 0.5 + rng.normal(0, 10, n_zips), 5, 60), 2)
+    streaming_pct = np.round(np.clip(70 + tech_score / 5 + rng.normal(0, 8, n_zips), 50, 95), 2)
+    cord_cutter = np.round(np.clip(35 + tech_score / 5 - (median_age - 40) / 3 + rng.normal(0, 10, n_zips), 15, 70), 2)
+
+    # Digital habits
+    screen_time = np.round(np.clip(6 + (tech_score - 50) / 20 - (median_age - 40) / 15 + rng.normal(0, 1, n_zips), 3, 10), 1)
+    social_heavy = np.round(np.clip(40 - (median_age - 35) / 2 + rng.normal(0, 12, n_zips), 10, 70), 2)
+    online_shop = np.round(np.clip(60 + tech_score / 10 + rng.normal(0, 8, n_zips), 40, 90), 2)
+    mobile_bank = np.round(np.clip(55 + tech_score / 10 + rng.normal(0, 10, n_zips), 30, 85), 2)
+
+    # Media consumption
+    streaming_hrs = np.round(np.clip(20 + tech_score / 10 - (median_age - 40) / 5 + rng.normal(0, 5, n_zips), 5, 40), 1)
+    gaming_hrs = np.round(np.clip(8 - (median_age - 30) / 5 + rng.normal(0, 4, n_zips), 0, 20), 1)
+    news_level = NEWS_CONSUMPTION_MIX.sample(n_zips, rng)
+    news_source = sample_grouped(median_age < 45, NEWS_SOURCE_MIX, rng)
+
+    # Values and priorities: price sensitivity falls with income, loyalty rises with age
+    price_sens = np.clip(60 - (median_income - 75000) / 5000 + rng.normal(0, 15, n_zips), 10, 90).astype(np.int64)
+    brand_loyalty = np.clip(50 + (median_age - 40) / 3 + rng.normal(0, 12, n_zips), 20, 80).astype(np.int64)
+    eco = np.clip(50 + (pct_bachelors - 30) / 3 + rng.normal(0, 15, n_zips), 15, 85).astype(np.int64)
+    early_adopter = np.clip(tech_score * 0.8 - (median_age - 35) / 2 + rng.normal(0, 10, n_zips), 10, 90).astype(np.int64)
+
+    # Communication preferences
+    prefs = _channel_preferences(median_age, rng)
+
+    # Wireless behaviors
+    avg_data = np.round(np.clip(15 + tech_score / 5 - (median_age - 40) / 3 + rng.normal(0, 8, n_zips), 5, 50), 1)
+    avg_lines = np.round(np.clip(1.5 + suburban * 0.8 + rng.normal(0, 0.5, n_zips), 1, 4), 1)
+    family_propensity = np.round(np.clip(30 + suburban * 20 + rng.normal(0, 10, n_zips), 10, 70), 2)
+    premium_propensity = np.round(np.clip(20 + (median_income - 75000) / 5000 + tech_score / 5
+                                          + rng.normal(0, 10, n_zips), 5, 50), 2)
+    prepaid_propensity = np.round(np.clip(25 - (median_income - 75000) / 8000 + rng.normal(0, 10, n_zips), 5, 50), 2)
+
+    # Churn factors
+    deal_seeker = np.clip(price_sens * 0.8 + rng.normal(0, 10, n_zips), 10, 90).astype(np.int64)
+    switching_prop = np.round(np.clip(15 + price_sens / 5 - brand_loyalty / 10 + rng.normal(0, 5, n_zips), 5, 40), 2)
+    competitor_aware = np.round(np.clip(50 + deal_seeker / 5 + rng.normal(0, 10, n_zips), 20, 80), 2)
+
+    df = pd.DataFrame({
+        "zip_code": zips["zip_code"],
+        "primary_lifestyle": primary_lifestyle,
+        "secondary_lifestyle": secondary_lifestyle,
+        "lifestyle_diversity": diversity,
+        "tech_adoption_score": tech_score,
+        "smartphone_penetration": smartphone_pct,
+        "pct_iphone": pct_iphone,
+        "pct_android": pct_android,
+        "smart_home_adoption": smart_home,
+        "streaming_penetration": streaming_pct,
+        "cord_cutter_rate": cord_cutter,
+        "avg_daily_screen_time": screen_time,
+        "social_media_heavy_pct": social_heavy,
+        "online_shopping_pct": online_shop,
+        "mobile_banking_pct": mobile_bank,
+        "streaming_hours_week": streaming_hrs,
+        "gaming_hours_week": gaming_hrs,
+        "news_consumption": news_level,
+        "primary_news_source": news_source,
+        "price_sensitivity_index": price_sens,
+        "brand_loyalty_index": brand_loyalty,
+        "eco_consciousness": eco,
+        "early_adopter_index": early_adopter,
+        "pref_channel_digital": prefs["digital"],
+        "pref_channel_phone": prefs["phone"],
+        "pref_channel_store": prefs["store"],
+        "pref_channel_chat": prefs["chat"],
+        "avg_data_usage_gb": avg_data,
+        "avg_lines_per_account": avg_lines,
+        "family_plan_propensity": family_propensity,
+        "premium_plan_propensity": premium_propensity,
+        "prepaid_propensity": prepaid_propensity,
+        "deal_seeker_index": deal_seeker,
+        "switching_propensity": switching_prop,
+        "competitor_awareness": competitor_aware,
+    })
+    print(f"  ✓ Generated {len(df):,} lifestyle segment records")
+    return df
@@ -0,0 +1,82 @@
+"""
+Snowmobile Wireless - Stage Cache
+Content-addressed cache of generation stage outputs, for resuming runs
+
+A stage's key hashes everything its output depends on: the config.py
+sections it reads, its parameters (seed, row counts, as-of date) and the
+keys of the stages it takes inputs from. A change to a config section
+therefore re-runs the stages that read it and everything downstream of
+them, and nothing else.
+
+Each finished stage leaves a manifest (key and the sizes of the files it
+wrote) and its pickled result in the cache directory. A stage whose key
+matches its manifest, with its files still in place, is skipped and its
+result loaded instead; an interrupted run resumes from the first stage
+without a valid manifest. Code changes are not part of the key: after
+editing a generator, run once without the cache.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+
+
+class StageCache:
+    """Stage manifests and results in `directory`, for outputs under `output_dir`
+
+    With a `writer` (see write_behind.py) manifests are written on its
+    background thread, after the stage's own queued CSV writes.
+    """
+
+    def __init__(self, directory: str, output_dir: str, writer=None):
+        self.directory = directory
+        self.output_dir = output_dir
+        self.writer = writer
+
+    @staticmethod
+    def key(name: str, config_sections: dict, params: dict, upstream_keys: list) -> str:
+        """Hash of a stage's config sections, parameters and upstream stage keys"""
+        content = repr((name, sorted(config_sections.items()), sorted(params.items()), sorted(upstream_keys)))
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def _paths(self, name: str) -> tuple:
+        return (os.path.join(self.directory, f"{name}.json"),
+                os.path.join(self.directory, f"{name}.pkl"))
+
+    def _sizes(self, outputs: list) -> dict:
+        return {path: os.path.getsize(os.path.join(self.output_dir, path)) for path in outputs}
+
+    def load(self, name: str, key: str, outputs: list) -> tuple:
+        """(True, result) when the stage's manifest matches `key` and its outputs are intact"""
+        manifest_path, result_path = self._paths(name)
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            if manifest["key"] != key or manifest["outputs"] != self._sizes(outputs):
+                return False, None
+            with open(result_path, "rb") as f:
+                return True, pickle.load(f)
+        except (OSError, ValueError, KeyError, pickle.UnpicklingError, EOFError):
+            return False, None
+
+    def invalidate(self, name: str):
+        """Drop a stage's manifest before it re-runs, so a partial rewrite is never reused"""
+        manifest_path, _ = self._paths(name)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+
+    def store(self, name: str, key: str, result, outputs: list):
+        """Record a finished stage (on the writer thread when there is one)"""
+        if self.writer is not None:
+            self.writer.submit(self._store, name, key, result, outputs)
+        else:
+            self._store(name, key, result, outputs)
+
+    def _store(self, name: str, key: str, result, outputs: list):
+        os.makedirs(self.directory, exist_ok=True)
+        manifest_path, result_path = self._paths(name)
+        with open(result_path, "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(manifest_path, "w") as f:
+            json.dump({"key": key, "outputs": self._sizes(outputs)}, f, indent=2)
@@ -0,0 +1,181 @@
+"""
+Snowmobile Wireless - Stage Graph
+Runs the generation stages in dependency order, independent stages at once
+
+A stage is a callable plus the names of the stages whose results it
+takes, passed as keyword arguments of the same names. Stages are added
+after their dependencies, so insertion order is a valid run order and
+the graph cannot have cycles. Each stage starts as soon as its
+dependencies have finished, in a pool of `workers` processes; inline
+stages (e.g. one that runs its own process pool) run in the calling
+process. Stages draw from their own random streams (see streams.py), so
+outputs do not depend on which stages happen to overlap.
+
+Per-stage times give the critical path: the chain of dependent stages
+that bounds the wall-clock time of the run however many workers it has.
+Time an in-process stage spends blocked on the write-behind writer is
+not counted as the stage's run time (see write_behind.py).
+
+With a StageCache, each stage is keyed by the config sections and
+parameters it declares plus its dependencies' keys, and stages whose
+cached output is still valid are skipped (see stage_cache.py).
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .stage_cache import StageCache
+
+
+def _timed_call(func, kwargs: dict, writer=None):
+    """Run one stage and return (result, seconds), less any time blocked on `writer`"""
+    waited = writer.wait_time if writer is not None else 0.0
+    start = time.time()
+    result = func(**kwargs)
+    seconds = time.time() - start
+    if writer is not None:
+        seconds -= writer.wait_time - waited
+    return result, seconds
+
+
+class Stage:
+    """One node of the graph: a callable, the stages it depends on and its cache inputs
+
+    `config` maps config section names to their values and `params` holds
+    the other arguments the output depends on; `outputs` are the files
+    (relative to the output directory) the stage writes.
+    """
+
+    def __init__(self, name: str, func, deps: tuple = (), inline: bool = False,
+                 config: dict = None, params: dict = None, outputs: tuple = ()):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.inline = inline
+        self.config = config or {}
+        self.params = params or {}
+        self.outputs = list(outputs)
+
+
+class StageGraph:
+    """Dependency graph of generation stages with a concurrent runner
+
+    `func` must be picklable (a module-level function, or a
+    functools.partial of one) unless the stage is inline.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.durations = {}
+        self.cached = set()
+        self.wall_time = None
+
+    def add(self, name: str, func, deps: tuple = (), inline: bool = False,
+            config: dict = None, params: dict = None, outputs: tuple = ()) -> "StageGraph":
+        """Add a stage; its dependencies must already be in the graph"""
+        if name in self.stages:
+            raise ValueError(f"stage {name!r} is already in the graph")
+        missing = [dep for dep in deps if dep not in self.stages]
+        if missing:
+            raise ValueError(f"stage {name!r} depends on unknown stages: {', '.join(missing)}")
+        self.stages[name] = Stage(name, func, deps, inline, config, params, outputs)
+        return self
+
+    def keys(self) -> dict:
+        """Cache key of every stage"""
+        keys = {}
+        for name, stage in self.stages.items():
+            keys[name] = StageCache.key(name, stage.config, stage.params, [keys[dep] for dep in stage.deps])
+        return keys
+
+    def run(self, workers: int = 1, cache: StageCache = None, writer=None) -> dict:
+        """Run every stage and return {stage name: result}
+
+        With `workers` <= 1 all stages run in this process, in insertion
+        order. With a `cache`, stages with a valid cached result are
+        skipped and every stage that runs is recorded in it. `writer` is
+        the write-behind writer in-process stages queue their output on;
+        their waits on it are left out of the stage times. An exception
+        in any stage cancels the stages not yet started and is re-raised
+        here.
+        """
+        results = {}
+        pending = list(self.stages.values())
+        running = {}
+        keys = self.keys() if cache is not None else {}
+        start = time.time()
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+        def finish(name, result, seconds):
+            results[name], self.durations[name] = result, seconds
+            if cache is not None:
+                cache.store(name, keys[name], result, self.stages[name].outputs)
+
+        try:
+            while pending or running:
+                ready = [stage for stage in pending if all(dep in results for dep in stage.deps)]
+                pending = [stage for stage in pending if stage not in ready]
+                hits = []
+                if cache is not None:
+                    for stage in ready:
+                        hit, result = cache.load(stage.name, keys[stage.name], stage.outputs)
+                        if hit:
+                            results[stage.name], self.durations[stage.name] = result, 0.0
+                            self.cached.add(stage.name)
+                            hits.append(stage)
+                        else:
+                            cache.invalidate(stage.name)
+                    ready = [stage for stage in ready if stage not in hits]
+                inline = [stage for stage in ready if pool is None or stage.inline]
+
+                # Submit pool stages first so they overlap with the inline ones
+                for stage in ready:
+                    if stage not in inline:
+                        kwargs = {dep: results[dep] for dep in stage.deps}
+                        running[pool.submit(_timed_call, stage.func, kwargs)] = stage.name
+                for stage in inline:
+                    kwargs = {dep: results[dep] for dep in stage.deps}
+                    finish(stage.name, *_timed_call(stage.func, kwargs, writer))
+                if inline or hits:
+                    # Dependents of the finished or cached stages may be ready now
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        finish(name, *future.result())
+                    except Exception as e:
+                        e.add_note(f"in generation stage {name!r}")
+                        raise
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+        self.wall_time = time.time() - start
+        return results
+
+    def critical_path(self) -> tuple:
+        """Longest chain of dependent stages by run time: (stage names, seconds)"""
+        finish = {}
+        previous = {}
+        for name, stage in self.stages.items():
+            before = max(stage.deps, key=finish.get, default=None)
+            previous[name] = before
+            finish[name] = self.durations[name] + (finish[before] if before else 0.0)
+        name = max(finish, key=finish.get)
+        seconds = finish[name]
+        path = []
+        while name is not None:
+            path.append(name)
+            name = previous[name]
+        return path[::-1], seconds
+
+    def print_timings(self):
+        """Per-stage times with the critical path marked"""
+        path, seconds = self.critical_path()
+        print("\nStage timings (* = critical path):")
+        for name in self.stages:
+            timing = "  cached" if name in self.cached else f"{self.durations[name]:7.1f}s"
+            print(f"  {'*' if name in path else ' '} {name:<24} {timing}")
+        print(f"  Critical path: {' → '.join(path)} ({seconds:.1f}s)")
+        print(f"  Wall clock: {self.wall_time:.1f}s (stages total {sum(self.durations.values()):.1f}s)")
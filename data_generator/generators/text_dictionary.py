@@ -0,0 +1,66 @@
+"""
+Snowmobile Wireless - Text Dictionaries
+Dictionary-encoded text columns drawn from small template sets
+
+Verbatims, agent summaries, intents and campaign names/offers are picked
+from a few dozen templates, so they are generated and kept as integer
+codes into a fixed vocabulary (pandas Categoricals) rather than as one
+Python string per row. The vocabulary is fixed up front, so blocks and
+shards concatenate without re-encoding; CSV writers expand the strings
+only at serialization time.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# Template-drawn text columns per table; readers pass `text_dtypes(table)`
+# to read_csv to get them back as Categoricals
+TEXT_COLUMNS = {
+    "support_interactions": ["subcategory", "intent", "interaction_summary", "customer_verbatim"],
+    "campaign_responses": ["campaign_name", "offer_type"],
+    "campaign_catalog": ["campaign_name", "offer_type"],
+}
+
+
+def text_dtypes(table: str) -> dict:
+    """read_csv dtype mapping that loads a table's text columns as categories"""
+    return {column: "category" for column in TEXT_COLUMNS.get(table, [])}
+
+
+class TextDictionary:
+    """Fixed vocabulary of a template-drawn text column
+
+    `codes` maps template strings to codes (used to pre-compile option
+    lists) and `column` turns drawn codes into a Categorical (code -1 is a
+    missing value).
+    """
+
+    def __init__(self, values):
+        self.values = list(dict.fromkeys(values))
+        self.dtype = pd.CategoricalDtype(self.values)
+        self._codes = {value: code for code, value in enumerate(self.values)}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def codes(self, values) -> np.ndarray:
+        """Codes of a (small) list of vocabulary strings"""
+        return np.array([self._codes[value] for value in values], dtype=np.int64)
+
+    def column(self, codes: np.ndarray) -> pd.Categorical:
+        """Categorical column from drawn codes"""
+        return pd.Categorical.from_codes(codes, dtype=self.dtype)
+
+
+def choose_codes(keys: np.ndarray, options: dict, rng, default: int = -1) -> np.ndarray:
+    """Uniform pick from the code array `options[key]` for every row
+
+    Keys without options get `default` (-1 reads back as missing).
+    """
+    picks = np.full(len(keys), default, dtype=np.int64)
+    for key, choices in options.items():
+        rows = np.flatnonzero(keys == key)
+        if len(rows) and len(choices):
+            picks[rows] = choices[rng.integers(0, len(choices), len(rows))]
+    return picks
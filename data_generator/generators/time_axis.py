@@ -0,0 +1,58 @@
+"""
+Snowmobile Wireless - Time Axis
+Run calendar shared by the generators, built once from the as-of date
+"""
+
+from datetime import date
+import numpy as np
+
+from config import SEASONAL_USAGE_FACTORS
+
+
+SEASONAL_FACTORS = np.array([SEASONAL_USAGE_FACTORS[month] for month in range(1, 13)])
+
+
+class TimeAxis:
+    """Calendar for one run, anchored at `as_of` (default: today)
+
+    Every generator dates its rows from the same anchor, so a run that
+    crosses midnight stays consistent and a fixed `as_of` makes reruns
+    reproducible. Dates are datetime64 throughout: `as_of` and day
+    offsets at day resolution, event timestamps at second resolution.
+    """
+
+    def __init__(self, as_of=None):
+        self.as_of = np.datetime64(date.today() if as_of is None else as_of, 'D')
+        self.as_of_timestamp = self.as_of.astype('datetime64[s]')
+        self.current_month = self.as_of.astype('datetime64[M]')
+
+    def __repr__(self) -> str:
+        return f"TimeAxis(as_of={self.as_of})"
+
+    @property
+    def as_of_date(self) -> date:
+        return self.as_of.astype(object)
+
+    def billing_months(self, months: int) -> np.ndarray:
+        """First-of-month dates of the last `months` billing months, oldest first"""
+        back = np.arange(months - 1, -1, -1)
+        return (self.current_month - back).astype('datetime64[D]')
+
+    @staticmethod
+    def seasonal_factors(month_dates: np.ndarray) -> np.ndarray:
+        """Seasonal usage factor for each date's calendar month"""
+        return SEASONAL_FACTORS[month_dates.astype('datetime64[M]').astype(np.int64) % 12]
+
+    def days_before(self, days) -> np.ndarray:
+        """Dates `days` before the as-of date (datetime64[D])"""
+        return self.as_of - np.asarray(days).astype('timedelta64[D]')
+
+    def days_after(self, days) -> np.ndarray:
+        """Dates `days` after the as-of date (datetime64[D])"""
+        return self.as_of + np.asarray(days).astype('timedelta64[D]')
+
+    def timestamps_before(self, days, rng) -> np.ndarray:
+        """Timestamps on the days `days` before the as-of date, at a time of day drawn from `rng` (datetime64[s])"""
+        days = np.asarray(days)
+        seconds = rng.integers(0, 86400, days.shape).astype('timedelta64[s]')
+        return self.as_of_timestamp - days.astype('timedelta64[D]') + seconds
@@ -0,0 +1,129 @@
+"""
+Snowmobile Wireless - Usage Cube
+Dense customers × months × metrics float32 copy of monthly usage
+
+The usage generator fills a memory-mapped .npy cube (row = customer index
+in customers.csv, column = billing month, oldest first) alongside the long
+monthly_usage table. A customer with tenure shorter than the window has
+usage in the oldest min(months, tenure) columns and NaN in the most recent
+ones, the same months the long table has rows for. An index file holds the
+customer IDs, months and metric names, so time-series questions become
+array slices instead of group-bys.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+CUBE_METRICS = [
+    "data_usage_gb", "data_usage_5g_pct", "voice_minutes_onnet", "voice_minutes_offnet",
+    "voice_minutes_intl", "voice_calls_count", "sms_sent", "mms_sent", "roaming_days",
+    "roaming_data_gb", "overage_charges", "total_bill", "days_to_payment",
+]
+
+
+def _nanmean(values: np.ndarray) -> np.ndarray:
+    """Mean over the last axis ignoring NaN; NaN (without a warning) when all are NaN"""
+    counts = (~np.isnan(values)).sum(axis=-1)
+    return np.where(counts > 0, np.nansum(values, axis=-1) / np.maximum(counts, 1), np.nan)
+
+
+class UsageCubeWriter:
+    """Creates the cube file and fills it block by block
+
+    Picklable: shard worker processes reopen the same file and write their
+    own customer rows, so a sharded run fills one cube without a merge.
+    """
+
+    def __init__(self, path: str, index_path: str, n_customers: int, month_dates: np.ndarray):
+        self.path = path
+        self.index_path = index_path
+        self.shape = (n_customers, len(month_dates), len(CUBE_METRICS))
+        self.month_dates = month_dates
+        self._cube = None
+
+    def create(self):
+        """Allocate the cube on disk with every cell NaN"""
+        cube = np.lib.format.open_memmap(self.path, mode="w+", dtype=np.float32, shape=self.shape)
+        cube[:] = np.nan
+        cube.flush()
+        del cube
+
+    def write_index(self, customer_ids: np.ndarray):
+        """Customer IDs (cube row order), months and metric names"""
+        np.savez(self.index_path,
+                 customer_ids=np.asarray(customer_ids).astype("S36"),
+                 months=self.month_dates.astype("datetime64[M]"),
+                 metrics=np.array(CUBE_METRICS))
+
+    def write_rows(self, first_row: int, cust: np.ndarray, month_offset: np.ndarray, usage: pd.DataFrame):
+        """Scatter long-format usage rows of customers first_row + cust into the cube"""
+        if self._cube is None:
+            self._cube = np.load(self.path, mmap_mode="r+")
+        values = usage[CUBE_METRICS].to_numpy(dtype=np.float32)
+        self._cube[first_row + cust, month_offset] = values
+
+    def flush(self):
+        """Flush this process's writes to disk"""
+        if self._cube is not None:
+            self._cube.flush()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_cube"] = None
+        return state
+
+
+class UsageCube:
+    """Read-only, memory-mapped usage cube with its index
+
+    Slices are zero-copy views of the file: `metric("total_bill")` is a
+    (customers, months) array, `customer(id)` a (months, metrics) array.
+    """
+
+    def __init__(self, path: str, index_path: str):
+        self.values = np.load(path, mmap_mode="r")
+        with np.load(index_path) as index:
+            self.customer_ids = index["customer_ids"].astype(str)
+            self.months = index["months"]
+            self.metrics = list(index["metrics"])
+        self._rows = pd.Index(self.customer_ids)
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    def rows(self, customer_ids) -> np.ndarray:
+        """Cube row of each customer ID (-1 when unknown)"""
+        return self._rows.get_indexer(np.atleast_1d(customer_ids))
+
+    def metric(self, name: str) -> np.ndarray:
+        """(customers, months) view of one metric"""
+        return self.values[:, :, self.metrics.index(name)]
+
+    def customer(self, customer_id: str) -> np.ndarray:
+        """(months, metrics) view of one customer"""
+        row = self.rows(customer_id)[0]
+        if row < 0:
+            raise KeyError(customer_id)
+        return self.values[row]
+
+    def months_of_data(self) -> np.ndarray:
+        """Number of billed months per customer"""
+        return (~np.isnan(self.metric("data_usage_gb"))).sum(axis=1)
+
+    def mean(self, name: str) -> np.ndarray:
+        """Per-customer mean of a metric over the months with usage"""
+        return _nanmean(self.metric(name))
+
+    def data_trend_3m(self) -> np.ndarray:
+        """Growing / Declining / Stable: last 3 months' data vs the 3 before (as sql/06)"""
+        data = self.metric("data_usage_gb")
+        months = data.shape[1]
+        recent = _nanmean(data[:, max(0, months - 3):])
+        prior = _nanmean(data[:, max(0, months - 6):max(0, months - 3)])
+        return np.select([recent > prior * 1.1, recent < prior * 0.9], ["Growing", "Declining"], "Stable")
+
+    def overage_frequency(self) -> np.ndarray:
+        """Percent of months with usage that carried overage charges (as sql/06)"""
+        overage = self.metric("overage_charges")
+        return np.round((overage > 0).sum(axis=1) * 100.0 / np.maximum(self.months_of_data(), 1), 1)
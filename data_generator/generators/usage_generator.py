@@ -1,173 +1,203 @@
 """
 Snowmobile Wireless - Usage Generator
 Generates monthly usage and billing data
+
+Each block of customers is laid out as a customers × months grid; months
+beyond a customer's tenure are masked out and every column is drawn for
+all remaining cells in one vectorized call.
 """
 
-import uuid
-from datetime import date, timedelta
 import numpy as np
 import pandas as pd
 from tqdm import tqdm
 
-import sys
-sys.path.append('..')
-from config import DATA_USAGE_BY_PLAN, VOICE_USAGE_BY_PLAN
+from config import DATA_USAGE_BY_PLAN, VOICE_USAGE_BY_PLAN, DAYS_TO_PAYMENT_BY_CREDIT_CLASS
+from .billing import PricingTable, compute_charges
+from .customer_view import CustomerView
+from .distributions import CompiledDistribution, PAYMENT_STATUS_BY_CREDIT
+from .ids import id_columns
+from .streams import BLOCK_SIZE, block_rng, block_ranges, month_period, resolve_seed
+from .time_axis import TimeAxis
+from .usage_cube import UsageCubeWriter
+
+
+# Month-over-month usage trend per customer (up / stable / down)
+TREND_MIX = CompiledDistribution({1.02: 0.3, 1.0: 0.5, 0.98: 0.2})
+
+
+def _plan_lookup(plan_name: np.ndarray, table: dict, field: str) -> np.ndarray:
+    """Per-customer plan parameter (unknown plans use Powder)"""
+    values = {plan: params[field] for plan, params in table.items()}
+    return pd.Series(plan_name).map(values).fillna(values["Powder"]).to_numpy(dtype=float)
+
+
+def usage_trend(n: int, rng: np.random.Generator) -> np.ndarray:
+    """Month-over-month usage trend per customer (the first draw of a usage block)"""
+    return TREND_MIX.sample(n, rng).astype(float)
+
+
+def _generate_usage_block(block: CustomerView, months: int, month_dates: np.ndarray,
+                          month_seasonal: np.ndarray, pricing: PricingTable,
+                          rng: np.random.Generator, trend_factor: np.ndarray = None,
+                          trend_offset: int = 0, cube: UsageCubeWriter = None,
+                          cube_row: int = 0) -> pd.DataFrame:
+    """Usage rows for one block of customers from its own random stream
+
+    `trend_factor` and `trend_offset` continue an earlier run's trend;
+    by default the trend is drawn first from `rng` and starts at month 0.
+    With a `cube`, the rows are also written to cube rows from `cube_row`.
+    """
+    n = len(block)
+    plan_name = block['plan_name']
+    tenure = block['tenure_months']
+    lines = block['lines_on_account']
+
+    # Usage parameters for plan
+    data_mean = _plan_lookup(plan_name, DATA_USAGE_BY_PLAN, "mean")
+    data_std = _plan_lookup(plan_name, DATA_USAGE_BY_PLAN, "std")
+    plan_limit = _plan_lookup(plan_name, DATA_USAGE_BY_PLAN, "max")
+    voice_mean = _plan_lookup(plan_name, VOICE_USAGE_BY_PLAN, "mean")
+    voice_std = _plan_lookup(plan_name, VOICE_USAGE_BY_PLAN, "std")
+
+    # Generate usage trend (some customers increase, some decrease)
+    if trend_factor is None:
+        trend_factor = usage_trend(n, rng)
+
+    # Customers × months grid, keeping each customer's first min(months, tenure) months
+    cust, month_offset = np.nonzero(np.arange(months) < np.minimum(months, tenure)[:, None])
+    r = len(cust)
+    seasonal = month_seasonal[month_offset]
+    month_trend = trend_factor[cust] ** (trend_offset + month_offset)
+    row_lines = lines[cust]
+    row_limit = plan_limit[cust]
+
+    # Data usage
+    base_data = np.maximum(0, rng.normal(data_mean[cust], data_std[cust]))
+    data_usage = np.round(np.minimum(base_data * seasonal * month_trend * row_lines, row_limit), 3)
+
+    # 5G percentage (only for 5G devices)
+    is_5g = block.get('is_5g_capable', False)[cust]
+    data_5g_pct = np.where(is_5g, np.round(np.clip(rng.normal(40, 15, r), 0, 80), 2), 0.0)
+    data_4g_pct = np.round(100 - data_5g_pct, 2)
+
+    # Throttled days (only for limited plans)
+    throttled = (data_usage > row_limit * 0.9) & (row_limit < 100)
+    throttled_days = np.where(throttled, rng.integers(0, 5, r), 0)
 
+    # Voice usage
+    voice_total = np.maximum(0, np.trunc(rng.normal(voice_mean[cust], voice_std[cust]) * row_lines)).astype(np.int64)
+    voice_onnet = (voice_total * rng.uniform(0.4, 0.6, r)).astype(np.int64)
+    voice_offnet = (voice_total * rng.uniform(0.3, 0.5, r)).astype(np.int64)
+    voice_intl = (voice_total * rng.uniform(0, 0.1, r)).astype(np.int64)
+    calls_count = (voice_total / rng.uniform(2, 5, r)).astype(np.int64)  # Avg call length 2-5 min
+    # At least one call for each kind of minutes used, so the month can be exploded into CDRs
+    calls_count = np.maximum(calls_count, (voice_onnet > 0).astype(np.int64) + (voice_offnet > 0) + (voice_intl > 0))
 
-def generate_monthly_usage(customers_df: pd.DataFrame, months: int = 12) -> pd.DataFrame:
-    """Generate monthly usage records for all customers"""
-    
-    n_customers = len(customers_df)
+    # Messaging
+    sms_sent = (rng.exponential(50, r) * row_lines).astype(np.int64)
+    mms_sent = (rng.exponential(5, r) * row_lines).astype(np.int64)
+
+    # Roaming (rare)
+    has_roaming = block.get('has_intl_roaming', False)[cust]
+    roaming = has_roaming & (rng.random(r) < 0.1)
+    roaming_days = np.where(roaming, rng.integers(1, 14, r), 0)
+    roaming_data = np.where(roaming, np.round(rng.uniform(0.5, 3, r), 3), 0.0)
+    roaming_voice = np.where(roaming, rng.integers(10, 100, r), 0)
+
+    # Billing
+    charges = compute_charges(
+        pricing, pricing.plan_codes(plan_name)[cust], data_usage, roaming_days, roaming_data,
+        block.get('has_device_protection', False)[cust],
+        block.get('has_streaming_bundle', False)[cust],
+        block.get('autopay_enrolled', False)[cust],
+        tenure[cust],
+    )
+
+    # Payment behavior by credit class
+    credit_class = block.get('credit_class', 'B')
+    credit_group = np.where(np.isin(credit_class, list(PAYMENT_STATUS_BY_CREDIT.tables)),
+                            credit_class, "Standard")[cust]
+    payment_status = PAYMENT_STATUS_BY_CREDIT.sample(credit_group, rng)
+    days_low = pd.Series(credit_group).map({k: v[0] for k, v in DAYS_TO_PAYMENT_BY_CREDIT_CLASS.items()}).to_numpy()
+    days_high = pd.Series(credit_group).map({k: v[1] for k, v in DAYS_TO_PAYMENT_BY_CREDIT_CLASS.items()}).to_numpy()
+    days_to_payment = days_low + (rng.random(r) * (days_high - days_low)).astype(np.int64)
+
+    usage = pd.DataFrame({
+        **id_columns(r, "usage", rng),
+        "customer_id": block['customer_id'][cust],
+        "billing_month": month_dates[month_offset],
+        "voice_minutes_onnet": voice_onnet,
+        "voice_minutes_offnet": voice_offnet,
+        "voice_minutes_intl": voice_intl,
+        "voice_calls_count": calls_count,
+        "data_usage_gb": data_usage,
+        "data_usage_4g_pct": data_4g_pct,
+        "data_usage_5g_pct": data_5g_pct,
+        "data_throttled_days": throttled_days,
+        "sms_sent": sms_sent,
+        "mms_sent": mms_sent,
+        "roaming_days": roaming_days,
+        "roaming_data_gb": roaming_data,
+        "roaming_voice_min": roaming_voice,
+        **charges,
+        "payment_status": payment_status,
+        "days_to_payment": days_to_payment,
+    })
+    if cube is not None:
+        cube.write_rows(cube_row, cust, month_offset, usage)
+    return usage
+
+
+def generate_monthly_usage(customers, months: int = 12,
+                           seed: int = None, first_block: int = 0,
+                           time_axis: TimeAxis = None,
+                           pricing: PricingTable = None,
+                           trend_offset: int = 0,
+                           cube: UsageCubeWriter = None) -> pd.DataFrame:
+    """Generate monthly usage records for all customers
+
+    Customers are processed in RNG blocks (see streams.py) so output depends
+    only on `seed` and row position; `first_block` is the global block index
+    of the first row of `customers` when it is a slice of the population.
+    `customers` is a CustomerView or a customer DataFrame.
+    Billing months are the `months` months up to `time_axis` (default: today);
+    bills use `pricing` (default: PLAN_CONFIG and BILLING_CONFIG).
+
+    A nonzero `trend_offset` (months of usage already generated) continues
+    an earlier run: each customer keeps the trend drawn by that run, and
+    the new months draw from per-month streams. With a `cube` writer the
+    usage is also written to the dense usage cube (see usage_cube.py).
+    """
+
+    customers = CustomerView.of(customers)
+    n_customers = len(customers)
     total_records = n_customers * months
-    
+
     print(f"  Generating {total_records:,} monthly usage records...")
     print(f"    ({n_customers:,} customers × {months} months)")
-    
-    records = []
-    
-    # Pre-compute customer data for faster access
-    customer_data = customers_df.set_index('customer_id').to_dict('index')
-    customer_ids = customers_df['customer_id'].tolist()
-    
-    for customer_id in tqdm(customer_ids, desc="  Usage"):
-        cust = customer_data[customer_id]
-        plan_name = cust['plan_name']
-        tenure = cust['tenure_months']
-        lines = cust['lines_on_account']
-        
-        # Get usage parameters for plan
-        data_params = DATA_USAGE_BY_PLAN.get(plan_name, DATA_USAGE_BY_PLAN["Powder"])
-        voice_params = VOICE_USAGE_BY_PLAN.get(plan_name, VOICE_USAGE_BY_PLAN["Powder"])
-        
-        # Generate usage trend (some customers increase, some decrease)
-        trend = np.random.choice(["up", "stable", "down"], p=[0.3, 0.5, 0.2])
-        trend_factor = {"up": 1.02, "stable": 1.0, "down": 0.98}[trend]
-        
-        # Seasonal factors (higher usage in summer, holidays)
-        seasonal_factors = {
-            1: 1.0, 2: 0.95, 3: 1.0, 4: 1.0, 5: 1.05, 6: 1.10,
-            7: 1.15, 8: 1.12, 9: 1.0, 10: 1.0, 11: 1.05, 12: 1.10
-        }
-        
-        for month_offset in range(min(months, tenure)):
-            usage_id = str(uuid.uuid4())
-            billing_month = date.today().replace(day=1) - timedelta(days=30 * (months - month_offset - 1))
-            billing_month = billing_month.replace(day=1)
-            
-            month_num = billing_month.month
-            seasonal = seasonal_factors[month_num]
-            month_trend = trend_factor ** month_offset
-            
-            # Data usage
-            base_data = max(0, np.random.normal(data_params["mean"], data_params["std"]))
-            data_usage = round(min(base_data * seasonal * month_trend * lines, 
-                                  data_params.get("max", 200)), 3)
-            
-            # 5G percentage (higher for newer customers with 5G devices)
-            if cust.get('is_5g_capable', False):
-                data_5g_pct = round(max(0, min(np.random.normal(40, 15), 80)), 2)
-                data_4g_pct = round(100 - data_5g_pct, 2)
-            else:
-                data_5g_pct = 0.0
-                data_4g_pct = 100.0
-            
-            # Throttled days (only for limited plans)
-            plan_limit = DATA_USAGE_BY_PLAN[plan_name].get("max", 999)
-            if data_usage > plan_limit * 0.9 and plan_limit < 100:
-                throttled_days = np.random.randint(0, 5)
-            else:
-                throttled_days = 0
-            
-            # Voice usage
-            voice_total = max(0, int(np.random.normal(voice_params["mean"], voice_params["std"]) * lines))
-            voice_onnet = int(voice_total * np.random.uniform(0.4, 0.6))
-            voice_offnet = int(voice_total * np.random.uniform(0.3, 0.5))
-            voice_intl = int(voice_total * np.random.uniform(0, 0.1))
-            calls_count = int(voice_total / np.random.uniform(2, 5))  # Avg call length 2-5 min
-            
-            # Messaging
-            sms_sent = int(np.random.exponential(50) * lines)
-            mms_sent = int(np.random.exponential(5) * lines)
-            
-            # Roaming (rare)
-            if cust.get('has_intl_roaming', False) and np.random.random() < 0.1:
-                roaming_days = np.random.randint(1, 14)
-                roaming_data = round(np.random.uniform(0.5, 3), 3)
-                roaming_voice = np.random.randint(10, 100)
-            else:
-                roaming_days = 0
-                roaming_data = 0
-                roaming_voice = 0
-            
-            # Billing
-            base_charge = cust['plan_price']
-            
-            # Overage charges (for limited plans)
-            if plan_name in ["Glacier", "Flurry", "Powder"] and data_usage > plan_limit:
-                overage = round((data_usage - plan_limit) * 10, 2)  # $10/GB overage
-            else:
-                overage = 0
-            
-            # Roaming charges
-            roaming_charges = round(roaming_days * 10 + roaming_data * 15, 2) if roaming_days > 0 else 0
-            
-            # Add-on charges
-            addon_charges = 0
-            if cust.get('has_device_protection', False):
-                addon_charges += 15
-            if cust.get('has_streaming_bundle', False):
-                addon_charges += 10
-            
-            # Discounts
-            discounts = 0
-            if cust.get('autopay_enrolled', False):
-                discounts += 5  # Autopay discount
-            if tenure > 24:
-                discounts += round(base_charge * 0.05, 2)  # Loyalty discount
-            
-            total_bill = round(max(0, base_charge + overage + roaming_charges + addon_charges - discounts), 2)
-            
-            # Payment behavior
-            if cust.get('credit_class', 'B') == 'A':
-                payment_status = np.random.choice(["Paid", "Paid", "Paid", "Late"], p=[0.95, 0.02, 0.02, 0.01])
-                days_to_payment = np.random.randint(1, 15)
-            elif cust.get('credit_class', 'B') == 'D':
-                payment_status = np.random.choice(["Paid", "Late", "Partial", "Unpaid"], p=[0.60, 0.25, 0.10, 0.05])
-                days_to_payment = np.random.randint(10, 45)
-            else:
-                payment_status = np.random.choice(["Paid", "Late", "Partial"], p=[0.85, 0.12, 0.03])
-                days_to_payment = np.random.randint(5, 25)
-            
-            record = {
-                "usage_id": usage_id,
-                "customer_id": customer_id,
-                "billing_month": billing_month,
-                "voice_minutes_onnet": voice_onnet,
-                "voice_minutes_offnet": voice_offnet,
-                "voice_minutes_intl": voice_intl,
-                "voice_calls_count": calls_count,
-                "data_usage_gb": data_usage,
-                "data_usage_4g_pct": data_4g_pct,
-                "data_usage_5g_pct": data_5g_pct,
-                "data_throttled_days": throttled_days,
-                "sms_sent": sms_sent,
-                "mms_sent": mms_sent,
-                "roaming_days": roaming_days,
-                "roaming_data_gb": roaming_data,
-                "roaming_voice_min": roaming_voice,
-                "base_charge": base_charge,
-                "overage_charges": overage,
-                "roaming_charges": roaming_charges,
-                "add_on_charges": addon_charges,
-                "discounts_applied": discounts,
-                "total_bill": total_bill,
-                "payment_status": payment_status,
-                "days_to_payment": days_to_payment,
-            }
-            records.append(record)
-    
-    df = pd.DataFrame(records)
-    print(f"  ✓ Generated {len(df):,} usage records")
-    return df
 
+    seed = resolve_seed(seed)
+    time_axis = time_axis or TimeAxis()
+    month_dates = time_axis.billing_months(months)
+    month_seasonal = time_axis.seasonal_factors(month_dates)
+    pricing = pricing or PricingTable()
+    frames = []
+    progress = tqdm(total=n_customers, desc="  Usage")
 
+    for block, first, stop in block_ranges(n_customers):
+        rng = block_rng(seed, "usage", first_block + block)
+        trend_factor = None
+        if trend_offset:
+            trend_factor = usage_trend(stop - first, rng)
+            rng = block_rng(seed, "usage", first_block + block, month_period(month_dates[0]))
+        frames.append(_generate_usage_block(customers.slice(first, stop), months, month_dates, month_seasonal,
+                                            pricing, rng, trend_factor, trend_offset,
+                                            cube, first_block * BLOCK_SIZE + first))
+        progress.update(stop - first)
+
+    progress.close()
+    if cube is not None:
+        cube.flush()
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    print(f"  ✓ Generated {len(df):,} usage records")
+    return df
@@ -0,0 +1,101 @@
+"""
+Snowmobile Wireless - Write-Behind Writer
+Serializes finished tables on a background thread while generation continues
+
+Generation hands each finished frame (a whole table, a shard's chunk or
+an appended month's partition) to the writer and moves on to the next
+one; a single background thread runs the write calls in submission
+order, so appended chunks and the files that depend on them (e.g. the
+run state) keep their order. The queue is bounded: when `max_pending`
+writes are waiting, `submit` blocks until the thread catches up, which
+caps how many finished frames are held in memory.
+
+The first exception raised by a write is re-raised in the generating
+thread by the next `submit`, `flush` or `close`; writes queued after it
+are skipped rather than written out of order.
+
+`wait_time` is the time generation spent blocked on a full queue and
+`drain_time` the time spent waiting for the last writes in `flush` and
+`close`, so callers can report writing apart from generation.
+"""
+
+import queue
+import threading
+import time
+
+
+_STOP = object()
+
+
+class WriteBehindWriter:
+    """Runs write calls on one background thread, with back-pressure
+
+    Use as a context manager: leaving the block waits for the queued
+    writes (and raises the first write error); leaving it on an exception
+    drops the writes still queued.
+    """
+
+    def __init__(self, max_pending: int = 4):
+        self._queue = queue.Queue(maxsize=max(1, max_pending))
+        self._error = None
+        self._cancelled = False
+        self.wait_time = 0.0
+        self.drain_time = 0.0
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                if self._error is None and not self._cancelled:
+                    func, args, kwargs = item
+                    func(*args, **kwargs)
+            except BaseException as e:
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise self._error
+
+    def submit(self, func, *args, **kwargs):
+        """Queue `func(*args, **kwargs)`; blocks while the queue is full"""
+        self._raise_error()
+        if not self._thread.is_alive():
+            raise RuntimeError("write-behind writer is closed")
+        start = time.time()
+        self._queue.put((func, args, kwargs))
+        self.wait_time += time.time() - start
+
+    def flush(self):
+        """Wait until every queued write has run"""
+        start = time.time()
+        self._queue.join()
+        self.drain_time += time.time() - start
+        self._raise_error()
+
+    def close(self):
+        """Run the queued writes and stop the background thread"""
+        if self._thread.is_alive():
+            start = time.time()
+            self._queue.put(_STOP)
+            self._thread.join()
+            self.drain_time += time.time() - start
+        self._raise_error()
+
+    def __enter__(self) -> "WriteBehindWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+            return
+        # Already failing: drop the queued writes and keep the original error
+        self._cancelled = True
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
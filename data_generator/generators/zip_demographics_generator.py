@@ -5,14 +5,11 @@ Generates synthetic census-based demographic data by ZIP code
 
 import numpy as np
 import pandas as pd
-from tqdm import tqdm
 
-import sys
-sys.path.append('..')
 from config import (
-    STATE_DISTRIBUTION, REGION_MAPPING, URBAN_RURAL_DISTRIBUTION,
-    INCOME_DISTRIBUTION, EDUCATION_DISTRIBUTION
+    STATE_DISTRIBUTION, REGION_MAPPING, INCOME_DISTRIBUTION, EDUCATION_DISTRIBUTION
 )
+from .distributions import URBAN_RURAL_MIX
 
 
 # Major DMAs (Designated Market Areas) in the US
@@ -98,213 +95,216 @@ STATE_TO_DMA = {
 }
 
 
-def generate_zip_demographics(n_zips: int = 42000) -> pd.DataFrame:
-    """Generate synthetic ZIP code demographic data"""
-    
-    print(f"  Generating {n_zips:,} ZIP demographic records...")
-    
-    records = []
-    
-    # Generate ZIP codes across all states
+# DMA name by code; DMAs missing from DMA_LIST are named "<state> Metro"
+DMA_NAMES = dict(DMA_LIST)
+
+# Population and land area (mean, std) by urban/rural class
+POPULATION_PARAMS = {
+    "Urban": (50000, 25000),
+    "Suburban": (20000, 15000),
+    "Rural": (3000, 2000),
+    "Remote": (500, 400),
+}
+LAND_AREA_PARAMS = {
+    "Urban": (5, 3),
+    "Suburban": (20, 15),
+    "Rural": (100, 80),
+    "Remote": (500, 400),
+}
+
+# Median income multipliers by urban/rural class and region
+INCOME_MULTIPLIER_BY_CLASS = {"Urban": 1.2, "Suburban": 1.1, "Remote": 0.75}
+INCOME_MULTIPLIER_BY_REGION = {"West": 1.1, "Northeast": 1.15, "Midwest": 0.95,
+                               "Southeast": 0.90, "Southwest": 1.0}
+
+
+def _state_zip_counts(n_zips: int) -> dict:
+    """Assign ZIPs to states proportionally; the last state takes the remainder"""
     states = list(STATE_DISTRIBUTION.keys())
-    state_weights = list(STATE_DISTRIBUTION.values())
-    
-    # Assign ZIPs to states proportionally
     state_zip_counts = {}
     remaining = n_zips
     for i, state in enumerate(states):
         if i == len(states) - 1:
             count = remaining
         else:
-            count = int(n_zips * state_weights[i])
+            count = int(n_zips * STATE_DISTRIBUTION[state])
         state_zip_counts[state] = count
         remaining -= count
+    return state_zip_counts
+
+
+def _by_class(table: dict, default, class_code: np.ndarray) -> np.ndarray:
+    """Per-ZIP value of a {urban/rural class: value} table"""
+    return np.array([table.get(label, default) for label in URBAN_RURAL_MIX.labels])[class_code]
+
+
+def generate_zip_demographics(n_zips: int = 42000, rng=np.random) -> pd.DataFrame:
+    """Generate synthetic ZIP code demographic data
+
+    Every column is computed for all ZIPs at once; per-state values (region,
+    DMA options) are looked up once per state and repeated.
+    """
     
-    zip_counter = 10001  # Start from 10001
+    print(f"  Generating {n_zips:,} ZIP demographic records...")
     
-    for state, count in tqdm(state_zip_counts.items(), desc="  ZIP Demographics"):
-        region = REGION_MAPPING.get(state, "Southeast")
-        
-        # Get DMAs for this state
-        state_dmas = STATE_TO_DMA.get(state, ["500"])
-        
-        for _ in range(count):
-            zip_code = str(zip_counter).zfill(5)
-            zip_counter += 1
-            
-            # DMA assignment
-            dma_code = np.random.choice(state_dmas) if state_dmas else "500"
-            dma_name = next((d[1] for d in DMA_LIST if d[0] == dma_code), f"{state} Metro")
-            
-            # Urban/Rural classification
-            urban_rural = np.random.choice(
-                list(URBAN_RURAL_DISTRIBUTION.keys()),
-                p=list(URBAN_RURAL_DISTRIBUTION.values())
-            )
-            
-            # Population based on urban/rural
-            pop_params = {
-                "Urban": (50000, 25000),
-                "Suburban": (20000, 15000),
-                "Rural": (3000, 2000),
-                "Remote": (500, 400)
-            }
-            pop_mean, pop_std = pop_params.get(urban_rural, (10000, 8000))
-            population = max(100, int(np.random.normal(pop_mean, pop_std)))
-            
-            # Land area and density
-            area_params = {
-                "Urban": (5, 3),
-                "Suburban": (20, 15),
-                "Rural": (100, 80),
-                "Remote": (500, 400)
-            }
-            area_mean, area_std = area_params.get(urban_rural, (50, 40))
-            land_area = max(0.5, np.random.normal(area_mean, area_std))
-            density = round(population / land_area, 2)
-            
-            # Age distribution
-            pct_18_24 = round(max(5, min(25, np.random.normal(12, 4))), 2)
-            pct_25_34 = round(max(8, min(25, np.random.normal(15, 4))), 2)
-            pct_35_44 = round(max(8, min(20, np.random.normal(14, 3))), 2)
-            pct_45_54 = round(max(8, min(20, np.random.normal(13, 3))), 2)
-            pct_55_64 = round(max(8, min(20, np.random.normal(13, 3))), 2)
-            total_under_65 = pct_18_24 + pct_25_34 + pct_35_44 + pct_45_54 + pct_55_64
-            pct_65_plus = round(max(5, 100 - total_under_65), 2)
-            
-            median_age = round(35 + (pct_65_plus - 15) * 0.5 + np.random.normal(0, 3), 1)
-            median_age = max(25, min(55, median_age))
-            
-            # Income (correlated with urban/rural and region)
-            income_base = INCOME_DISTRIBUTION["national_median"]
-            if urban_rural == "Urban":
-                income_mult = 1.2
-            elif urban_rural == "Suburban":
-                income_mult = 1.1
-            elif urban_rural == "Remote":
-                income_mult = 0.75
-            else:
-                income_mult = 0.85
-            
-            # Regional adjustment
-            region_mult = {"West": 1.1, "Northeast": 1.15, "Midwest": 0.95, 
-                          "Southeast": 0.90, "Southwest": 1.0}.get(region, 1.0)
-            
-            median_income = int(income_base * income_mult * region_mult * np.random.uniform(0.7, 1.5))
-            median_income = max(25000, min(300000, median_income))
-            mean_income = int(median_income * np.random.uniform(1.1, 1.4))
-            per_capita = int(median_income / np.random.uniform(2.0, 3.5))
-            
-            # Income brackets
-            pct_under_25k = round(max(5, min(40, 30 - (median_income - 50000) / 5000)), 2)
-            pct_25k_50k = round(max(10, min(35, 25 - (median_income - 75000) / 10000)), 2)
-            pct_50k_75k = round(max(10, min(25, 20)), 2)
-            pct_75k_100k = round(max(5, min(20, 15)), 2)
-            pct_100k_150k = round(max(5, min(20, (median_income - 60000) / 5000)), 2)
-            remaining_pct = 100 - (pct_under_25k + pct_25k_50k + pct_50k_75k + pct_75k_100k + pct_100k_150k)
-            pct_150k_plus = round(max(2, remaining_pct), 2)
-            
-            # Education (correlated with income)
-            edu_base = EDUCATION_DISTRIBUTION
-            income_factor = (median_income - 50000) / 100000
-            pct_hs = round(min(98, max(70, edu_base["pct_high_school"]["mean"] + income_factor * 5)), 2)
-            pct_college = round(min(80, max(30, edu_base["pct_some_college"]["mean"] + income_factor * 10)), 2)
-            pct_bach = round(min(70, max(10, edu_base["pct_bachelors"]["mean"] + income_factor * 20)), 2)
-            pct_grad = round(min(40, max(3, edu_base["pct_graduate"]["mean"] + income_factor * 15)), 2)
-            
-            # Housing
-            pct_owner = round(max(20, min(90, 65 + (urban_rural == "Suburban") * 15 - (urban_rural == "Urban") * 20)), 2)
-            pct_renter = round(100 - pct_owner, 2)
-            
-            home_value = int(median_income * np.random.uniform(3, 6))
-            median_rent = int(median_income * np.random.uniform(0.015, 0.025))
-            
-            # Household composition
-            avg_hh_size = round(np.random.uniform(2.0, 3.2), 1)
-            pct_family = round(max(40, min(80, 60 + (urban_rural == "Suburban") * 15)), 2)
-            pct_married = round(pct_family * np.random.uniform(0.6, 0.8), 2)
-            pct_single_parent = round(max(5, min(25, np.random.normal(12, 5))), 2)
-            pct_alone = round(max(15, min(45, 100 - pct_family - 10)), 2)
-            
-            # Employment
-            labor_force = round(max(50, min(80, np.random.normal(63, 8))), 2)
-            pct_white_collar = round(max(20, min(80, 45 + income_factor * 30)), 2)
-            pct_blue_collar = round(max(10, min(50, 100 - pct_white_collar - 25)), 2)
-            pct_service = round(100 - pct_white_collar - pct_blue_collar, 2)
-            
-            # Diversity (varies by region)
-            pct_white = round(max(20, min(95, np.random.normal(60, 20))), 2)
-            pct_black = round(max(1, min(50, np.random.exponential(13))), 2)
-            pct_hispanic = round(max(1, min(60, np.random.exponential(18))), 2)
-            pct_asian = round(max(0.5, min(40, np.random.exponential(6))), 2)
-            total_other = max(0, 100 - pct_white - pct_black - pct_hispanic - pct_asian)
-            pct_other = round(total_other, 2)
-            
-            # Normalize to 100%
-            race_total = pct_white + pct_black + pct_hispanic + pct_asian + pct_other
-            if race_total != 100:
-                factor = 100 / race_total
-                pct_white = round(pct_white * factor, 2)
-                pct_black = round(pct_black * factor, 2)
-                pct_hispanic = round(pct_hispanic * factor, 2)
-                pct_asian = round(pct_asian * factor, 2)
-                pct_other = round(100 - pct_white - pct_black - pct_hispanic - pct_asian, 2)
-            
-            record = {
-                "zip_code": zip_code,
-                "zip_name": f"{state} {zip_counter % 1000}",
-                "state_code": state,
-                "state_name": state,  # Would map to full name in production
-                "region": region,
-                "dma_code": dma_code,
-                "dma_name": dma_name,
-                "total_population": population,
-                "population_density": density,
-                "land_area_sq_miles": round(land_area, 2),
-                "urban_rural_class": urban_rural,
-                "pct_age_18_24": pct_18_24,
-                "pct_age_25_34": pct_25_34,
-                "pct_age_35_44": pct_35_44,
-                "pct_age_45_54": pct_45_54,
-                "pct_age_55_64": pct_55_64,
-                "pct_age_65_plus": pct_65_plus,
-                "median_age": median_age,
-                "median_household_income": median_income,
-                "mean_household_income": mean_income,
-                "per_capita_income": per_capita,
-                "pct_income_under_25k": pct_under_25k,
-                "pct_income_25k_50k": pct_25k_50k,
-                "pct_income_50k_75k": pct_50k_75k,
-                "pct_income_75k_100k": pct_75k_100k,
-                "pct_income_100k_150k": pct_100k_150k,
-                "pct_income_150k_plus": pct_150k_plus,
-                "pct_high_school": pct_hs,
-                "pct_some_college": pct_college,
-                "pct_bachelors": pct_bach,
-                "pct_graduate_degree": pct_grad,
-                "pct_owner_occupied": pct_owner,
-                "pct_renter_occupied": pct_renter,
-                "median_home_value": home_value,
-                "median_rent": median_rent,
-                "avg_household_size": avg_hh_size,
-                "pct_family_households": pct_family,
-                "pct_married_couples": pct_married,
-                "pct_single_parent": pct_single_parent,
-                "pct_living_alone": pct_alone,
-                "labor_force_participation": labor_force,
-                "pct_white_collar": pct_white_collar,
-                "pct_blue_collar": pct_blue_collar,
-                "pct_service_industry": pct_service,
-                "pct_white": pct_white,
-                "pct_black": pct_black,
-                "pct_hispanic": pct_hispanic,
-                "pct_asian": pct_asian,
-                "pct_other_race": pct_other,
-            }
-            records.append(record)
+    # ZIP codes across all states, numbered from 10001
+    state_zip_counts = _state_zip_counts(n_zips)
+    states = list(state_zip_counts)
+    counts = np.array(list(state_zip_counts.values()))
+    state_index = np.repeat(np.arange(len(states)), counts)
+    n = len(state_index)
+    state = np.array(states, dtype=object)[state_index]
+    zip_number = 10001 + np.arange(n)
+    state_region = [REGION_MAPPING.get(s, "Southeast") for s in states]
+    region = np.array(state_region, dtype=object)[state_index]
     
-    df = pd.DataFrame(records)
+    # DMA assignment: uniform over the state's DMAs, names from a
+    # (state, option) table built once
+    state_dmas = [STATE_TO_DMA.get(s) or ["500"] for s in states]
+    width = max(map(len, state_dmas))
+    dma_codes = np.array([dmas + [None] * (width - len(dmas)) for dmas in state_dmas], dtype=object)
+    dma_names = np.array([[DMA_NAMES.get(code, f"{s} Metro") for code in dmas] + [None] * (width - len(dmas))
+                          for s, dmas in zip(states, state_dmas)], dtype=object)
+    n_dmas = np.array([len(dmas) for dmas in state_dmas])[state_index]
+    pick = (rng.random(n) * n_dmas).astype(np.int64)
+    dma_code = dma_codes[state_index, pick]
+    dma_name = dma_names[state_index, pick]
+    
+    # Urban/Rural classification
+    class_code = URBAN_RURAL_MIX.sample_codes(n, rng)
+    urban_rural = URBAN_RURAL_MIX.labels[class_code]
+    is_urban = urban_rural == "Urban"
+    is_suburban = urban_rural == "Suburban"
+    
+    # Population based on urban/rural
+    pop_params = _by_class(POPULATION_PARAMS, (10000, 8000), class_code)
+    population = np.maximum(100, rng.normal(pop_params[:, 0], pop_params[:, 1]).astype(np.int64))
+    
+    # Land area and density
+    area_params = _by_class(LAND_AREA_PARAMS, (50, 40), class_code)
+    land_area = np.maximum(0.5, rng.normal(area_params[:, 0], area_params[:, 1]))
+    density = np.round(population / land_area, 2)
+    
+    # Age distribution
+    pct_18_24 = np.round(np.clip(rng.normal(12, 4, n), 5, 25), 2)
+    pct_25_34 = np.round(np.clip(rng.normal(15, 4, n), 8, 25), 2)
+    pct_35_44 = np.round(np.clip(rng.normal(14, 3, n), 8, 20), 2)
+    pct_45_54 = np.round(np.clip(rng.normal(13, 3, n), 8, 20), 2)
+    pct_55_64 = np.round(np.clip(rng.normal(13, 3, n), 8, 20), 2)
+    total_under_65 = pct_18_24 + pct_25_34 + pct_35_44 + pct_45_54 + pct_55_64
+    pct_65_plus = np.round(np.maximum(5, 100 - total_under_65), 2)
+    
+    median_age = np.round(35 + (pct_65_plus - 15) * 0.5 + rng.normal(0, 3, n), 1)
+    median_age = np.clip(median_age, 25, 55)
+    
+    # Income (correlated with urban/rural and region)
+    income_mult = _by_class(INCOME_MULTIPLIER_BY_CLASS, 0.85, class_code)
+    region_mult = np.array([INCOME_MULTIPLIER_BY_REGION.get(r, 1.0) for r in state_region])[state_index]
+    median_income = (INCOME_DISTRIBUTION["national_median"] * income_mult * region_mult
+                     * rng.uniform(0.7, 1.5, n)).astype(np.int64)
+    median_income = np.clip(median_income, 25000, 300000)
+    mean_income = (median_income * rng.uniform(1.1, 1.4, n)).astype(np.int64)
+    per_capita = (median_income / rng.uniform(2.0, 3.5, n)).astype(np.int64)
+    
+    # Income brackets
+    pct_under_25k = np.round(np.clip(30 - (median_income - 50000) / 5000, 5, 40), 2)
+    pct_25k_50k = np.round(np.clip(25 - (median_income - 75000) / 10000, 10, 35), 2)
+    pct_50k_75k = np.full(n, 20)
+    pct_75k_100k = np.full(n, 15)
+    pct_100k_150k = np.round(np.clip((median_income - 60000) / 5000, 5, 20), 2)
+    remaining_pct = 100 - (pct_under_25k + pct_25k_50k + pct_50k_75k + pct_75k_100k + pct_100k_150k)
+    pct_150k_plus = np.round(np.maximum(2, remaining_pct), 2)
+    
+    # Education (correlated with income)
+    edu_base = EDUCATION_DISTRIBUTION
+    income_factor = (median_income - 50000) / 100000
+    pct_hs = np.round(np.clip(edu_base["pct_high_school"]["mean"] + income_factor * 5, 70, 98), 2)
+    pct_college = np.round(np.clip(edu_base["pct_some_college"]["mean"] + income_factor * 10, 30, 80), 2)
+    pct_bach = np.round(np.clip(edu_base["pct_bachelors"]["mean"] + income_factor * 20, 10, 70), 2)
+    pct_grad = np.round(np.clip(edu_base["pct_graduate"]["mean"] + income_factor * 15, 3, 40), 2)
+    
+    # Housing
+    pct_owner = np.clip(65 + is_suburban * 15 - is_urban * 20, 20, 90)
+    pct_renter = 100 - pct_owner
+    
+    home_value = (median_income * rng.uniform(3, 6, n)).astype(np.int64)
+    median_rent = (median_income * rng.uniform(0.015, 0.025, n)).astype(np.int64)
+    
+    # Household composition
+    avg_hh_size = np.round(rng.uniform(2.0, 3.2, n), 1)
+    pct_family = np.clip(60 + is_suburban * 15, 40, 80)
+    pct_married = np.round(pct_family * rng.uniform(0.6, 0.8, n), 2)
+    pct_single_parent = np.round(np.clip(rng.normal(12, 5, n), 5, 25), 2)
+    pct_alone = np.clip(100 - pct_family - 10, 15, 45)
+    
+    # Employment
+    labor_force = np.round(np.clip(rng.normal(63, 8, n), 50, 80), 2)
+    pct_white_collar = np.round(np.clip(45 + income_factor * 30, 20, 80), 2)
+    pct_blue_collar = np.round(np.clip(100 - pct_white_collar - 25, 10, 50), 2)
+    pct_service = np.round(100 - pct_white_collar - pct_blue_collar, 2)
+    
+    # Diversity (varies by region), normalized to 100%
+    race = np.column_stack([
+        np.round(np.clip(rng.normal(60, 20, n), 20, 95), 2),
+        np.round(np.clip(rng.exponential(13, n), 1, 50), 2),
+        np.round(np.clip(rng.exponential(18, n), 1, 60), 2),
+        np.round(np.clip(rng.exponential(6, n), 0.5, 40), 2),
+    ])
+    race = np.column_stack([race, np.round(np.maximum(0, 100 - race.sum(axis=1)), 2)])
+    race_total = race.sum(axis=1, keepdims=True)
+    race[:, :4] = np.where(race_total != 100, np.round(race[:, :4] * 100 / race_total, 2), race[:, :4])
+    race[:, 4] = np.where(race_total[:, 0] != 100, np.round(100 - race[:, :4].sum(axis=1), 2), race[:, 4])
+    
+    df = pd.DataFrame({
+        "zip_code": zip_number.astype(str).astype(object),  # Five digits from 10001
+        "zip_name": state + " " + ((zip_number + 1) % 1000).astype(str).astype(object),
+        "state_code": state,
+        "state_name": state,  # Would map to full name in production
+        "region": region,
+        "dma_code": dma_code,
+        "dma_name": dma_name,
+        "total_population": population,
+        "population_density": density,
+        "land_area_sq_miles": np.round(land_area, 2),
+        "urban_rural_class": urban_rural,
+        "pct_age_18_24": pct_18_24,
+        "pct_age_25_34": pct_25_34,
+        "pct_age_35_44": pct_35_44,
+        "pct_age_45_54": pct_45_54,
+        "pct_age_55_64": pct_55_64,
+        "pct_age_65_plus": pct_65_plus,
+        "median_age": median_age,
+        "median_household_income": median_income,
+        "mean_household_income": mean_income,
+        "per_capita_income": per_capita,
+        "pct_income_under_25k": pct_under_25k,
+        "pct_income_25k_50k": pct_25k_50k,
+        "pct_income_50k_75k": pct_50k_75k,
+        "pct_income_75k_100k": pct_75k_100k,
+        "pct_income_100k_150k": pct_100k_150k,
+        "pct_income_150k_plus": pct_150k_plus,
+        "pct_high_school": pct_hs,
+        "pct_some_college": pct_college,
+        "pct_bachelors": pct_bach,
+        "pct_graduate_degree": pct_grad,
+        "pct_owner_occupied": pct_owner,
+        "pct_renter_occupied": pct_renter,
+        "median_home_value": home_value,
+        "median_rent": median_rent,
+        "avg_household_size": avg_hh_size,
+        "pct_family_households": pct_family,
+        "pct_married_couples": pct_married,
+        "pct_single_parent": pct_single_parent,
+        "pct_living_alone": pct_alone,
+        "labor_force_participation": labor_force,
+        "pct_white_collar": pct_white_collar,
+        "pct_blue_collar": pct_blue_collar,
+        "pct_service_industry": pct_service,
+        "pct_white": race[:, 0],
+        "pct_black": race[:, 1],
+        "pct_hispanic": race[:, 2],
+        "pct_asian": race[:, 3],
+        "pct_other_race": race[:, 4],
+    })
     print(f"  ✓ Generated {len(df):,} ZIP demographic records")
     return df
-
-
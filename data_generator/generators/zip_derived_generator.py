@@ -0,0 +1,23 @@
+"""
+Snowmobile Wireless - ZIP-Derived Tables Generator
+Generates economic indicators and lifestyle segments in one pass over the ZIP columns
+"""
+
+import numpy as np
+import pandas as pd
+
+from .economic_generator import generate_economic_indicators
+from .lifestyle_generator import generate_lifestyle_segments
+from .time_axis import TimeAxis
+from .zip_features import ZipFeatures
+
+
+def generate_zip_derived_tables(zip_df: pd.DataFrame, time_axis: TimeAxis = None,
+                                rng=np.random) -> tuple:
+    """Economic indicators and lifestyle segments from one extraction of the ZIP columns
+
+    Returns (economic_indicators, lifestyle_segments).
+    """
+    zips = ZipFeatures.of(zip_df)
+    return (generate_economic_indicators(zips, time_axis, rng),
+            generate_lifestyle_segments(zips, rng))
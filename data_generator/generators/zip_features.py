@@ -0,0 +1,38 @@
+"""
+Snowmobile Wireless - ZIP Features
+Column view of the ZIP demographics read by the ZIP-derived generators
+
+The economic indicator and lifestyle segment generators derive every
+column from the same handful of ZIP demographics columns. A ZipFeatures
+view extracts them once as typed arrays (see column_view.py), and both
+generators accept it in place of the DataFrame (see zip_derived_generator.py).
+"""
+
+import numpy as np
+import pandas as pd
+
+from .column_view import ColumnView
+
+
+# ZIP columns read by the derived generators, and defaults for the optional ones
+FEATURE_COLUMNS = {
+    "zip_code": object,
+    "urban_rural_class": object,
+    "region": object,
+    "median_household_income": np.float64,
+    "median_age": np.float64,
+    "pct_bachelors": np.float64,
+}
+FEATURE_DEFAULTS = {"pct_bachelors": 30}
+
+
+class ZipFeatures(ColumnView):
+    """Typed, column-per-array view of the ZIP demographics columns"""
+
+    COLUMNS = FEATURE_COLUMNS
+    DEFAULTS = FEATURE_DEFAULTS
+
+    def lookup(self, name: str, table: dict, default) -> np.ndarray:
+        """Per-ZIP value of a {column value: value} table (e.g. a regional offset)"""
+        return pd.Series(self.columns[name]).map(table).fillna(default).to_numpy(dtype=float)
+
@@ -0,0 +1,55 @@
+"""
+Snowmobile Wireless - Startup Time
+Measures the import / startup cost of the generator entry points
+
+Each target runs in a fresh interpreter; the median wall time over
+--runs repetitions is reported next to a bare `python -c pass` baseline.
+
+Usage:
+    python startup_time.py [--runs N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+TARGETS = {
+    "interpreter baseline": ["-c", "pass"],
+    "config": ["-c", "import config"],
+    "generators package": ["-c", "import generators"],
+    "churn model only": ["-c", "from generators import score_churn_risk"],
+    "customer generator": ["-c", "from generators import generate_customers"],
+    "all generators": ["-c", "import generators; [getattr(generators, n) for n in generators.__all__]"],
+    "generate_all_data.py --help": ["generate_all_data.py", "--help"],
+}
+
+
+def time_target(args: list, runs: int) -> float:
+    """Median wall time in milliseconds of `python <args>` over `runs` runs"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=HERE, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main(runs: int = 5):
+    print(f"Startup time (median of {runs} runs)")
+    print("-" * 50)
+    for name, args in TARGETS.items():
+        print(f"  {name:<32} {time_target(args, runs):8.0f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure generator startup time")
+    parser.add_argument("--runs", "-r", type=int, default=5, help="Runs per target (default: 5)")
+    args = parser.parse_args()
+    main(runs=args.runs)
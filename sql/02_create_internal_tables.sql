@@ -270,6 +270,8 @@ CREATE OR REPLACE TABLE RAW.CAMPAIGN_RESPONSES (
                             COMMENT 'Reference to customer',
     campaign_id             VARCHAR(36)
                             COMMENT 'Campaign identifier',
+    campaign_key            INTEGER
+                            COMMENT 'Reference to campaign catalog',
     
     -- Campaign Details
     campaign_name           VARCHAR(100)
@@ -315,6 +317,35 @@ CREATE OR REPLACE TABLE RAW.CAMPAIGN_RESPONSES (
 )
 COMMENT = 'Marketing campaign responses - 5M records';
 
+-- ============================================================================
+-- CAMPAIGN_CATALOG TABLE
+-- One row per campaign (template x channel x calendar month)
+-- ============================================================================
+
+CREATE OR REPLACE TABLE RAW.CAMPAIGN_CATALOG (
+    campaign_key            INTEGER NOT NULL PRIMARY KEY
+                            COMMENT 'Campaign key referenced by responses',
+    campaign_id             VARCHAR(36)
+                            COMMENT 'Campaign identifier',
+    campaign_name           VARCHAR(100)
+                            COMMENT 'Campaign name',
+    campaign_type           VARCHAR(30)
+                            COMMENT 'Campaign type (Retention/Upsell/Cross-sell/Win-back/Loyalty/Seasonal)',
+    offer_type              VARCHAR(50)
+                            COMMENT 'Offer presented',
+    offer_value             DECIMAL(10,2)
+                            COMMENT 'Monetary value of offer',
+    channel                 VARCHAR(20)
+                            COMMENT 'Delivery channel',
+    send_start              DATE
+                            COMMENT 'First day of the send window',
+    send_end                DATE
+                            COMMENT 'Last day of the send window',
+    audience_size           INTEGER
+                            COMMENT 'Number of responses sent'
+)
+COMMENT = 'Marketing campaign catalog';
+
 -- ============================================================================
 -- INDEXES (Clustering Keys for performance)
 -- ============================================================================
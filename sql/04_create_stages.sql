@@ -118,6 +118,7 @@ PUT file://./data/internal/customers.csv @RAW.DATA_STAGE/internal/ AUTO_COMPRESS
 PUT file://./data/internal/monthly_usage.csv @RAW.DATA_STAGE/internal/ AUTO_COMPRESS=TRUE OVERWRITE=TRUE;
 PUT file://./data/internal/support_interactions.csv @RAW.DATA_STAGE/internal/ AUTO_COMPRESS=TRUE OVERWRITE=TRUE;
 PUT file://./data/internal/campaign_responses.csv @RAW.DATA_STAGE/internal/ AUTO_COMPRESS=TRUE OVERWRITE=TRUE;
+PUT file://./data/internal/campaign_catalog.csv @RAW.DATA_STAGE/internal/ AUTO_COMPRESS=TRUE OVERWRITE=TRUE;
 PUT file://./data/external/zip_demographics.csv @RAW.DATA_STAGE/external/ AUTO_COMPRESS=TRUE OVERWRITE=TRUE;
 PUT file://./data/external/economic_indicators.csv @RAW.DATA_STAGE/external/ AUTO_COMPRESS=TRUE OVERWRITE=TRUE;
 PUT file://./data/external/competitive_landscape.csv @RAW.DATA_STAGE/external/ AUTO_COMPRESS=TRUE OVERWRITE=TRUE;
@@ -83,7 +83,7 @@ SELECT 'SUPPORT_INTERACTIONS' AS table_name, COUNT(*) AS records_loaded FROM RAW
 -- -----------------------------------------------------------------------------
 
 COPY INTO RAW.CAMPAIGN_RESPONSES (
-    response_id, customer_id, campaign_id,
+    response_id, customer_id, campaign_id, campaign_key,
     campaign_name, campaign_type, campaign_category, offer_type, offer_value,
     channel, sent_at, delivered,
     opened, clicked, responded, response_type, response_at,
@@ -95,6 +95,20 @@ ON_ERROR = 'CONTINUE';
 
 SELECT 'CAMPAIGN_RESPONSES' AS table_name, COUNT(*) AS records_loaded FROM RAW.CAMPAIGN_RESPONSES;
 
+-- -----------------------------------------------------------------------------
+-- Load Campaign Catalog
+-- -----------------------------------------------------------------------------
+
+COPY INTO RAW.CAMPAIGN_CATALOG (
+    campaign_key, campaign_id, campaign_name, campaign_type, offer_type, offer_value,
+    channel, send_start, send_end, audience_size
+)
+FROM @RAW.S3_DATA_STAGE/internal/campaign_catalog.csv
+FILE_FORMAT = (FORMAT_NAME = 'RAW.CSV_FORMAT')
+ON_ERROR = 'CONTINUE';
+
+SELECT 'CAMPAIGN_CATALOG' AS table_name, COUNT(*) AS records_loaded FROM RAW.CAMPAIGN_CATALOG;
+
 -- ============================================================================
 -- LOAD EXTERNAL DATA
 -- ============================================================================